@@ -11,7 +11,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
 from rich.text import Text
 
-from .detect import detect_os, is_ubuntu_or_debian, get_environment_info
+from .detect import detect_os, is_ubuntu_or_debian, EnvironmentInfo
 from .normalize import normalize_all_packages, get_package_statistics
 from .map import load_registry, map_packages, get_mapping_statistics
 from .emit import (
@@ -21,9 +21,9 @@ from .emit import (
     write_reports,
 )
 # Cloud functionality removed - focusing on core migration features
-from .llm import ClaudeMigrator
+from .llm import AsyncClaudeMigrator
 from .types import Report, Decision
-from .config import DEFAULT_REGISTRY_PATH, CONSOLE_STYLES
+from .config import DEFAULT_REGISTRY_PATH, CONSOLE_STYLES, LLM_MAX_CONCURRENCY
 
 # Create Typer app
 app = typer.Typer(
@@ -73,13 +73,14 @@ def print_banner() -> None:
 
 def print_system_info() -> None:
     """Print system information."""
-    env_info = get_environment_info()
+    env_info = EnvironmentInfo(use_cache=True)
+    system = env_info.system
+    env_info.save_cache()
     
     table = Table(title="System Information", show_header=True, header_style="bold magenta")
     table.add_column("Property", style="cyan")
     table.add_column("Value", style="green")
     
-    system = env_info["system"]
     table.add_row("OS", system["os"])
     table.add_row("Architecture", system["architecture"])
     table.add_row("WSL", system["wsl"])
@@ -100,10 +101,10 @@ def print_package_stats(packages) -> None:
     table.add_column("Package Manager", style="cyan")
     table.add_column("Count", style="green", justify="right")
     
-    for pm, count in stats["by_package_manager"].items():
+    for pm, count in stats.by_package_manager.items():
         table.add_row(pm.upper(), str(count))
     
-    table.add_row("Total", str(stats["total"]), style="bold")
+    table.add_row("Total", str(stats.total), style="bold")
     
     console.print(table)
 
@@ -142,7 +143,7 @@ def generate(
     target: str = typer.Option("macos", "--target", "-t", help="Target platform"),
     out: Path = typer.Option(Path("./packster-out"), "--out", "-o", "--output-dir", help="Output directory"),
     registry: Optional[Path] = typer.Option(None, "--registry", "-r", help="Custom registry file"),
-    no_verify: bool = typer.Option(False, "--no-verify", help="Skip Homebrew validation"),
+    no_verify: bool = typer.Option(False, "--no-verify", help="Skip Homebrew validation (set PACKSTER_OFFLINE=1 to validate without downloading the formulae.brew.sh index)"),
     format_type: str = typer.Option("json", "--format", "-f", help="Report format (json/yaml)"),
     llm_migrate: bool = typer.Option(False, "--llm-migrate", "-l", help="Automatically run LLM migration after generation"),
     api_key: Optional[str] = typer.Option(None, "--api-key", "-k", help="Claude API key (required if --llm-migrate is used)"),
@@ -208,7 +209,7 @@ def generate(
         # Map packages
         task = progress.add_task("Mapping packages...", total=None)
         try:
-            mapping_results = map_packages(packages, registry_data, verify=not no_verify)
+            mapping_results = map_packages(packages, registry_data, verify=not no_verify, use_cache=True)
             progress.update(task, description=f"Mapped {len(mapping_results)} packages")
         except Exception as e:
             console.print(f"[red]Error mapping packages: {e}[/red]")
@@ -296,7 +297,7 @@ def generate(
             
             try:
                 # Initialize Claude migrator
-                migrator = ClaudeMigrator(api_key)
+                migrator = AsyncClaudeMigrator(api_key)
                 
                 # Convert MappingResult objects to dictionaries for LLM migration
                 packages_for_llm = []
@@ -366,6 +367,7 @@ def llm_migrate(
     output: Path = typer.Option("./packster-out", "--output", "-o", help="Output directory for migration files"),
     model: str = typer.Option("claude-3-5-sonnet-20241022", "--model", "-m", help="Claude model to use"),
     batch_size: int = typer.Option(50, "--batch-size", "-b", help="Number of packages to process per batch"),
+    concurrency: int = typer.Option(LLM_MAX_CONCURRENCY, "--concurrency", "-c", help="Maximum number of batches sent to Claude at once"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
 ) -> None:
     """Generate macOS installation commands using Claude AI."""
@@ -401,7 +403,7 @@ def llm_migrate(
     
     # Initialize Claude migrator
     try:
-        migrator = ClaudeMigrator(api_key, model)
+        migrator = AsyncClaudeMigrator(api_key, model, max_concurrency=concurrency)
         console.print(f"[green]✅ Connected to Claude AI (model: {model})[/green]\n")
     except Exception as e:
         console.print(f"[red]❌ Failed to initialize Claude migrator: {e}[/red]")
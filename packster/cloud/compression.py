@@ -7,7 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
 
-from ..detect import get_environment_info
+from ..detect import EnvironmentInfo
 
 
 def create_migration_archive(output_dir: Path) -> Path:
@@ -72,8 +72,8 @@ def _create_metadata(output_dir: Path) -> Dict[str, Any]:
     Returns:
         Dictionary containing metadata
     """
-    # Get system information
-    env_info = get_environment_info()
+    # Get system information (package manager probes are not needed here)
+    system_info = EnvironmentInfo().system
     
     # Count files by type
     file_counts = {}
@@ -89,10 +89,10 @@ def _create_metadata(output_dir: Path) -> Dict[str, Any]:
         "created_at": datetime.now().isoformat(),
         "packster_version": "1.0.0",  # TODO: Get from package
         "source_system": {
-            "os": env_info["system"]["os"],
-            "architecture": env_info["system"]["architecture"],
-            "wsl": env_info["system"]["wsl"],
-            "python_version": env_info["system"]["python_version"],
+            "os": system_info["os"],
+            "architecture": system_info["architecture"],
+            "wsl": system_info["wsl"],
+            "python_version": system_info["python_version"],
         },
         "archive_info": {
             "file_count": len(list(output_dir.rglob('*'))),
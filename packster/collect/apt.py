@@ -48,7 +48,7 @@ def collect_apt_packages() -> List[NormalizedItem]:
         pass
 
     for package_name in manual_packages:
-        normalized_item = NormalizedItem(
+        normalized_item = NormalizedItem.model_construct(
             source_pm=PackageManager.APT,
             source_name=package_name,
             version=versions_map.get(package_name, ""),
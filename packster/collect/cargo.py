@@ -18,7 +18,7 @@ def collect_cargo_packages() -> List[NormalizedItem]:
     
     installed_packages = get_installed_packages()
     for name, version in installed_packages:
-        normalized_item = NormalizedItem(
+        normalized_item = NormalizedItem.model_construct(
             source_pm=PackageManager.CARGO,
             source_name=name,
             version=version,
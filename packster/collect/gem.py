@@ -18,7 +18,7 @@ def collect_gem_packages() -> List[NormalizedItem]:
     
     installed_packages = get_installed_packages()
     for name, version in installed_packages:
-        normalized_item = NormalizedItem(
+        normalized_item = NormalizedItem.model_construct(
             source_pm=PackageManager.GEM,
             source_name=name,
             version=version,
@@ -19,7 +19,7 @@ def collect_npm_packages() -> List[NormalizedItem]:
     
     global_packages = get_global_packages()
     for name, version in global_packages:
-        normalized_item = NormalizedItem(
+        normalized_item = NormalizedItem.model_construct(
             source_pm=PackageManager.NPM,
             source_name=name,
             version=version,
@@ -19,7 +19,7 @@ def collect_pip_packages() -> List[NormalizedItem]:
     # Collect global packages (tests patch run_command in this module)
     global_packages = get_global_packages()
     for name, version in global_packages:
-        normalized_item = NormalizedItem(
+        normalized_item = NormalizedItem.model_construct(
             source_pm=PackageManager.PIP,
             source_name=name,
             version=version or "",
@@ -16,6 +16,19 @@ TEMPLATE_DIR = PROJECT_ROOT / "packster" / "runtime"
 BOOTSTRAP_TEMPLATE = TEMPLATE_DIR / "bootstrap.sh.j2"
 REPORT_TEMPLATE = TEMPLATE_DIR / "report.html.j2"
 
+# Per-user cache directory
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "packster"
+ENV_CACHE_PATH = CACHE_DIR / "env.json"
+BREW_CACHE_PATH = CACHE_DIR / "brew.json"
+BREW_CACHE_TTL = 24 * 60 * 60  # seconds
+FORMULAE_INDEX_PATH = CACHE_DIR / "formulae.json"
+
+# Homebrew's published formula and cask indexes, keyed by target package manager
+FORMULAE_API_URLS = {
+    "brew": "https://formulae.brew.sh/api/formula.json",
+    "cask": "https://formulae.brew.sh/api/cask.json",
+}
+
 # Output structure
 OUTPUT_DIRS = {
     "lang": "lang",
@@ -40,6 +53,13 @@ DECISION_THRESHOLDS = {
     "manual": 0.0,
 }
 
+# Claude API concurrency and rate budgets for LLM migration
+LLM_MAX_CONCURRENCY = 4
+LLM_REQUESTS_PER_MINUTE = 50
+LLM_INPUT_TOKENS_PER_MINUTE = 40000
+# Estimated package-list tokens per request; batches are cut to fit
+LLM_BATCH_TOKEN_BUDGET = 6000
+
 # Package manager commands
 PACKAGE_MANAGER_COMMANDS = {
     "apt": {
@@ -1,13 +1,32 @@
 """System detection utilities for Packster."""
 
+import hashlib
+import json
+import logging
 import os
 import platform
 import shutil
 import subprocess
+import sys
+from functools import cached_property, lru_cache
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
-from .config import PACKAGE_MANAGER_COMMANDS
+from . import __version__
+from .config import PACKAGE_MANAGER_COMMANDS, ENV_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+# /etc/os-release ID values mapped to the distribution names used by Packster
+_OS_RELEASE_IDS = {
+    "ubuntu": "ubuntu",
+    "debian": "debian",
+    "fedora": "fedora",
+    "centos": "centos",
+    "rhel": "centos",
+    "arch": "arch",
+}
 
 
 def detect_os() -> str:
@@ -18,21 +37,18 @@ def detect_os() -> str:
         # Try to detect specific Linux distributions
         try:
             with open("/etc/os-release", "r") as f:
-                content = f.read().lower()
-                if "ubuntu" in content:
-                    return "ubuntu"
-                elif "debian" in content:
-                    return "debian"
-                elif "fedora" in content:
-                    return "fedora"
-                elif "centos" in content or "rhel" in content:
-                    return "centos"
-                elif "arch" in content:
-                    return "arch"
-                else:
-                    return "linux"
+                fields = {}
+                for line in f:
+                    key, _, value = line.partition("=")
+                    fields[key.strip()] = value.strip().strip("\"'").lower()
         except (FileNotFoundError, PermissionError):
             return "linux"
+        
+        # Derivatives (e.g. Linux Mint) name their parent distro in ID_LIKE
+        for os_id in [fields.get("ID", ""), *fields.get("ID_LIKE", "").split()]:
+            if os_id in _OS_RELEASE_IDS:
+                return _OS_RELEASE_IDS[os_id]
+        return "linux"
     elif system == "darwin":
         return "macos"
     elif system == "windows":
@@ -99,10 +115,32 @@ def get_system_info() -> Dict[str, str]:
         "wsl": str(detect_wsl()),
         "python_version": platform.python_version(),
         "platform": platform.platform(),
-        "processor": platform.processor(),
+        "processor": get_processor_name(),
     }
 
 
+@lru_cache(maxsize=1)
+def get_processor_name() -> str:
+    """Get the CPU model name without spawning external commands.
+    
+    ``platform.processor()`` shells out to ``uname -p`` on Linux and
+    ``sysctl`` on macOS; read ``/proc/cpuinfo`` directly where available and
+    otherwise fall back to the machine type from ``uname``.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/cpuinfo", "rb") as f:
+                head = f.read(4096).decode("utf-8", errors="replace")
+        except OSError:
+            head = ""
+        for line in head.splitlines():
+            key, _, value = line.partition(":")
+            if key.strip() == "model name":
+                return value.strip()
+    
+    return platform.machine()
+
+
 def sanitize_os_string(os_string: str) -> str:
     """Sanitize OS string for consistent comparison."""
     return os_string.lower().strip().replace(" ", "")
@@ -161,14 +199,134 @@ def run_command_safe(
         return -1, "", f"Error running command: {str(e)}"
 
 
-def get_environment_info() -> Dict[str, any]:
-    """Get comprehensive environment information for debugging."""
-    return {
-        "system": get_system_info(),
-        "package_managers": check_package_manager_availability(),
-        "homebrew_available": is_homebrew_available(),
-        "homebrew_path": str(get_homebrew_path()) if get_homebrew_path() else None,
-        "current_directory": str(Path.cwd()),
-        "user": os.getenv("USER", "unknown"),
-        "path": os.getenv("PATH", "").split(":"),
-    }
+def _environment_cache_key() -> str:
+    """Build the cache key for persisted detection results.
+    
+    The key changes whenever Packster is upgraded, the OS release, kernel or
+    host changes, a different Python interpreter runs Packster, or PATH
+    changes (which decides which package managers are found). os.uname() is
+    used rather than platform.uname(), which spawns ``uname -p``.
+    """
+    parts = [__version__, *os.uname(), sys.executable, sys.version, os.environ.get("PATH", "")]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+# Detection results that are persisted between runs by the environment cache
+_DETECTED_FIELDS = ("system", "package_managers", "homebrew_available", "homebrew_path")
+
+
+def _load_cached_detection() -> Dict[str, any]:
+    """Load detection results from the on-disk cache if still valid."""
+    try:
+        with open(ENV_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(cached, dict) or cached.get("key") != _environment_cache_key():
+        return {}
+    detected = cached.get("detected")
+    if not isinstance(detected, dict):
+        return {}
+    return {field: detected[field] for field in _DETECTED_FIELDS if field in detected}
+
+
+def _save_cached_detection(detected: Dict[str, any]) -> None:
+    """Persist detection results to the on-disk cache."""
+    try:
+        ENV_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(ENV_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"key": _environment_cache_key(), "detected": detected}, f)
+    except OSError as e:
+        logger.debug(f"Could not write environment cache {ENV_CACHE_PATH}: {e}")
+
+
+class EnvironmentInfo:
+    """Environment information computed lazily on first access.
+    
+    Callers that only need ``system`` skip the package manager and Homebrew
+    probes entirely; use ``to_dict()`` to evaluate every field.
+    """
+    
+    def __init__(self, use_cache: bool = False):
+        """Initialize environment information.
+        
+        Args:
+            use_cache: Seed detection results persisted by a previous run when
+                the host, PATH and Packster version match
+        """
+        self._cached_fields = set()
+        if use_cache:
+            cached = _load_cached_detection()
+            # cached_property looks in the instance dict first
+            self.__dict__.update(cached)
+            self._cached_fields.update(cached)
+    
+    @cached_property
+    def system(self) -> Dict[str, str]:
+        """Operating system, architecture and Python details."""
+        return get_system_info()
+    
+    @cached_property
+    def package_managers(self) -> Dict[str, bool]:
+        """Availability of each supported source package manager."""
+        return check_package_manager_availability()
+    
+    @cached_property
+    def homebrew_available(self) -> bool:
+        """Whether the brew command is on PATH."""
+        return is_homebrew_available()
+    
+    @cached_property
+    def homebrew_path(self) -> Optional[str]:
+        """Homebrew installation prefix, if installed."""
+        path = get_homebrew_path()
+        return str(path) if path else None
+    
+    @cached_property
+    def current_directory(self) -> str:
+        """Current working directory."""
+        return str(Path.cwd())
+    
+    @cached_property
+    def user(self) -> str:
+        """Current user name."""
+        return os.getenv("USER", "unknown")
+    
+    @cached_property
+    def path(self) -> List[str]:
+        """PATH entries."""
+        return os.getenv("PATH", "").split(":")
+    
+    def save_cache(self) -> None:
+        """Persist detection results computed since the cache was loaded."""
+        detected = {field: self.__dict__[field] for field in _DETECTED_FIELDS if field in self.__dict__}
+        if detected.keys() - self._cached_fields:
+            _save_cached_detection(detected)
+            self._cached_fields.update(detected)
+    
+    def to_dict(self) -> Dict[str, any]:
+        """Evaluate every field and return them as a dictionary."""
+        return {
+            "system": self.system,
+            "package_managers": self.package_managers,
+            "homebrew_available": self.homebrew_available,
+            "homebrew_path": self.homebrew_path,
+            "current_directory": self.current_directory,
+            "user": self.user,
+            "path": self.path,
+        }
+
+
+def get_environment_info(use_cache: bool = False) -> Dict[str, any]:
+    """Get comprehensive environment information for debugging.
+    
+    Args:
+        use_cache: Reuse system/package manager detection persisted by a
+            previous run when the host, PATH and Packster version match
+    """
+    env = EnvironmentInfo(use_cache=use_cache)
+    info = env.to_dict()
+    if use_cache:
+        env.save_cache()
+    return info
@@ -1,8 +1,10 @@
 """Language package file generation for Packster."""
 
 import logging
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, List, Dict
 from ..types import NormalizedItem, PackageManager, MappingResult, Decision
 
 logger = logging.getLogger(__name__)
@@ -21,9 +23,13 @@ def write_language_files(
     Returns:
         Dictionary mapping language names to file paths
     """
-    # Create lang directory
+    # Create lang directory, noting which files a previous run already left there
     lang_dir = output_dir / "lang"
-    lang_dir.mkdir(exist_ok=True)
+    try:
+        os.mkdir(lang_dir)
+        existing_files = set()
+    except FileExistsError:
+        existing_files = {entry.name for entry in os.scandir(lang_dir)}
     
     # If MappingResult provided, take AUTO/VERIFY sources; else assume NormalizedItem list
     if items and isinstance(items[0], MappingResult):
@@ -37,6 +43,8 @@ def write_language_files(
     language_packages = group_packages_by_language(packages)
     
     written_files = {}
+    # Files with no packages still need to exist; create them in one go at the end
+    empty_files: List[Path] = []
     
     # Write Python requirements
     # Always create files per tests, even if empty
@@ -46,7 +54,7 @@ def write_language_files(
         write_python_requirements(language_packages[PackageManager.PIP], requirements_path)
         written_files["python"] = requirements_path
     else:
-        requirements_path.touch()
+        empty_files.append(requirements_path)
     
     # Write Node.js global packages
     npm_path = lang_dir / "global-node.txt"
@@ -55,7 +63,7 @@ def write_language_files(
         write_npm_global_packages(language_packages[PackageManager.NPM], npm_path)
         written_files["nodejs"] = npm_path
     else:
-        npm_path.touch()
+        empty_files.append(npm_path)
     
     # Write Rust packages
     cargo_path = lang_dir / "cargo.txt"
@@ -64,7 +72,7 @@ def write_language_files(
         write_cargo_packages(language_packages[PackageManager.CARGO], cargo_path)
         written_files["rust"] = cargo_path
     else:
-        cargo_path.touch()
+        empty_files.append(cargo_path)
     
     # Write Ruby gems
     gems_path = lang_dir / "gems.txt"
@@ -73,12 +81,28 @@ def write_language_files(
         write_ruby_gems(language_packages[PackageManager.GEM], gems_path)
         written_files["ruby"] = gems_path
     else:
-        gems_path.touch()
+        empty_files.append(gems_path)
+    
+    _create_empty_files([path for path in empty_files if path.name not in existing_files])
     
     logger.info(f"Wrote {len(written_files)} language package files")
     return written_files
 
 
+def _create_empty_files(paths: List[Path]) -> None:
+    """Create empty placeholder files for languages with no packages.
+    
+    Uses a bare open/close per file rather than ``Path.touch``, which first
+    attempts ``utime`` and only then falls back to creating the file.
+    
+    Args:
+        paths: Files known not to exist yet
+    """
+    flags = os.O_CREAT | os.O_WRONLY | getattr(os, "O_CLOEXEC", 0)
+    for path in paths:
+        os.close(os.open(path, flags, 0o644))
+
+
 def group_packages_by_language(packages: List[NormalizedItem]) -> Dict[PackageManager, List[NormalizedItem]]:
     """Group packages by their package manager/language.
     
@@ -88,83 +112,56 @@ def group_packages_by_language(packages: List[NormalizedItem]) -> Dict[PackageMa
     Returns:
         Dictionary mapping package managers to package lists
     """
-    grouped = {}
+    grouped = defaultdict(list)
     
     for package in packages:
-        pm = package.source_pm
-        if pm not in grouped:
-            grouped[pm] = []
-        grouped[pm].append(package)
+        grouped[package.source_pm].append(package)
     
-    return grouped
+    return dict(grouped)
 
 
-def write_python_requirements(packages: List[NormalizedItem], output_path: Path) -> None:
-    """Write Python requirements.txt file.
+def _make_writer(separator: str, description: str) -> Callable[[List[NormalizedItem], Path], None]:
+    """Build a writer for one language package file format.
     
     Args:
-        packages: List of Python packages
-        output_path: Path to write requirements.txt
+        separator: Text placed between package name and version
+        description: Human-readable file description used in log messages
+        
+    Returns:
+        Function writing packages sorted by name, one per line
     """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for package in sorted(packages, key=lambda p: p.source_name.lower()):
-            if package.version:
-                f.write(f"{package.source_name}=={package.version}\n")
-            else:
-                f.write(f"{package.source_name}\n")
+    def write(packages: List[NormalizedItem], output_path: Path) -> None:
+        lines = [
+            f"{package.source_name}{separator}{package.version}\n" if package.version
+            else f"{package.source_name}\n"
+            for package in sorted(packages, key=lambda p: p.source_name.lower())
+        ]
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("".join(lines))
+        
+        logger.info(f"Wrote {description} with {len(packages)} packages")
     
-    logger.info(f"Wrote Python requirements with {len(packages)} packages")
-
-
-def write_npm_global_packages(packages: List[NormalizedItem], output_path: Path) -> None:
-    """Write Node.js global packages file.
+    write.__doc__ = f"""Write {description} file.
     
     Args:
-        packages: List of NPM packages
-        output_path: Path to write global-node.txt
+        packages: List of packages to write
+        output_path: Path to write the file
     """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for package in sorted(packages, key=lambda p: p.source_name.lower()):
-            if package.version:
-                f.write(f"{package.source_name}@{package.version}\n")
-            else:
-                f.write(f"{package.source_name}\n")
-    
-    logger.info(f"Wrote Node.js global packages with {len(packages)} packages")
+    return write
 
 
-def write_cargo_packages(packages: List[NormalizedItem], output_path: Path) -> None:
-    """Write Rust cargo packages file.
-    
-    Args:
-        packages: List of Cargo packages
-        output_path: Path to write cargo.txt
-    """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for package in sorted(packages, key=lambda p: p.source_name.lower()):
-            if package.version:
-                f.write(f"{package.source_name}@{package.version}\n")
-            else:
-                f.write(f"{package.source_name}\n")
-    
-    logger.info(f"Wrote Rust cargo packages with {len(packages)} packages")
+# Separator between package name and version for each language format
+_VERSION_SEPARATORS = {
+    "python": "==",
+    "npm": "@",
+    "cargo": "@",
+    "gem": " -v ",
+}
 
-
-def write_ruby_gems(packages: List[NormalizedItem], output_path: Path) -> None:
-    """Write Ruby gems file.
-    
-    Args:
-        packages: List of Ruby gems
-        output_path: Path to write gems.txt
-    """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for package in sorted(packages, key=lambda p: p.source_name.lower()):
-            if package.version:
-                f.write(f"{package.source_name} -v {package.version}\n")
-            else:
-                f.write(f"{package.source_name}\n")
-    
-    logger.info(f"Wrote Ruby gems with {len(packages)} packages")
+write_python_requirements = _make_writer(_VERSION_SEPARATORS["python"], "Python requirements")
+write_npm_global_packages = _make_writer(_VERSION_SEPARATORS["npm"], "Node.js global packages")
+write_cargo_packages = _make_writer(_VERSION_SEPARATORS["cargo"], "Rust cargo packages")
+write_ruby_gems = _make_writer(_VERSION_SEPARATORS["gem"], "Ruby gems")
 
 
 def get_language_statistics(packages: List[NormalizedItem]) -> Dict[str, int]:
@@ -215,32 +212,12 @@ def format_package_line(package: NormalizedItem, format_type: str) -> str:
     Returns:
         Formatted package line
     """
-    if format_type == "python":
-        if package.version:
-            return f"{package.source_name}=={package.version}"
-        else:
-            return package.source_name
-    
-    elif format_type == "npm":
-        if package.version:
-            return f"{package.source_name}@{package.version}"
-        else:
-            return package.source_name
-    
-    elif format_type == "cargo":
-        if package.version:
-            return f"{package.source_name}@{package.version}"
-        else:
-            return package.source_name
-    
-    elif format_type == "gem":
-        if package.version:
-            return f"{package.source_name} -v {package.version}"
-        else:
-            return package.source_name
-    
-    else:
+    if format_type not in _VERSION_SEPARATORS:
         raise ValueError(f"Unknown format type: {format_type}")
+    
+    if package.version:
+        return f"{package.source_name}{_VERSION_SEPARATORS[format_type]}{package.version}"
+    return package.source_name
 
 
 def validate_language_file(file_path: Path, language: str) -> bool:
@@ -254,34 +231,12 @@ def validate_language_file(file_path: Path, language: str) -> bool:
         True if file is valid, False otherwise
     """
     try:
+        # Stream the file line by line; a decode error aborts on the first bad
+        # line without reading the rest. Version constraints are optional in
+        # every supported format, so readable text is all that is required.
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            
-            # Basic validation based on language
-            if language == "python":
-                if "==" not in line and ">=" not in line and "<=" not in line:
-                    # Should have version constraint
-                    pass  # Allow packages without version constraints
-            
-            elif language == "npm":
-                if "@" in line and not line.startswith('@'):
-                    # Should have @ for version
-                    pass
-            
-            elif language == "cargo":
-                if "@" in line and not line.startswith('@'):
-                    # Should have @ for version
-                    pass
-            
-            elif language == "gem":
-                if "-v" in line:
-                    # Should have version flag
-                    pass
+            for _line in f:
+                pass
         
         return True
         
@@ -2,155 +2,62 @@
 
 import json
 import logging
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Dict, Any
-from jinja2 import Template
+from typing import List, Dict, Any, Iterable, Optional
+from jinja2 import Environment, Template
+from markupsafe import Markup
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
+
 from ..types import Report, MappingResult, Decision
 from ..config import REPORT_TEMPLATE
 
 logger = logging.getLogger(__name__)
 
+# Shared environment for report templates; compiled templates are cached below
+_JINJA_ENV = Environment(auto_reload=False)
 
-def write_reports(
-    mapping_or_report,
-    output_dir: Path,
-    format_type: str = "json"
-) -> Dict[str, Path]:
-    """Write JSON and HTML reports.
-    
-    Args:
-        report: Report object with mapping results
-        output_dir: Output directory for reports
-        format_type: Format type (json, yaml, both)
-        
-    Returns:
-        Dictionary mapping report types to file paths
-    """
-    # Ensure directory exists
-    output_dir.mkdir(parents=True, exist_ok=True)
-    written_files = {}
-
-    # Accept either Report or list of MappingResult
-    if isinstance(mapping_or_report, Report):
-        report = mapping_or_report
-    else:
-        # Build a minimal Report by treating all as AUTO
-        try:
-            from ..types import MappingResult, Decision
-            items = list(mapping_or_report) if mapping_or_report else []
-            report = Report(
-                mapped_auto=[r for r in items if isinstance(r, MappingResult) and r.decision == Decision.AUTO],
-                mapped_verify=[r for r in items if isinstance(r, MappingResult) and r.decision == Decision.VERIFY],
-                manual=[r for r in items if isinstance(r, MappingResult) and r.decision == Decision.MANUAL],
-                skipped=[r for r in items if isinstance(r, MappingResult) and r.decision == Decision.SKIP],
-            )
-        except Exception:
-            report = Report()
-    
-    # Write JSON report
-    if format_type in ["json", "both"]:
-        json_path = output_dir / "report.json"
-        write_json_report(report, json_path)
-        written_files["json"] = json_path
-    
-    # Write HTML report
-    html_path = output_dir / "report.html"
-    write_html_report(report, html_path)
-    written_files["html"] = html_path
-    
-    logger.info(f"Wrote {len(written_files)} report files")
-    return written_files
+# Table body templates for the report sections, compiled once at import
+_MAPPED_ROWS_TEMPLATE = _JINJA_ENV.from_string('''{% for row in rows %}
+                        <tr>
+                            <td><strong>{{ row.source_name }}</strong><br><small>{{ row.source_pm }}</small></td>
+                            <td>{{ row.target_html }}</td>
+                            <td>{{ row.confidence_html }}</td>
+                            <td>{{ row.reason }}</td>
+                        </tr>
+{% endfor %}''')
+_SOURCE_ROWS_TEMPLATE = _JINJA_ENV.from_string('''{% for row in rows %}
+                        <tr>
+                            <td><strong>{{ row.source_name }}</strong></td>
+                            <td>{{ row.source_pm }}</td>
+                            <td>{{ row.category }}</td>
+                            <td>{{ row.notes }}</td>
+                        </tr>
+{% endfor %}''')
 
+# Serializes whole lists of results inside pydantic-core in one call
+_RESULTS_ADAPTER = TypeAdapter(List[MappingResult])
 
-def write_json_report(report: Report, output_path: Path) -> None:
-    """Write a JSON report.
-    
-    Args:
-        report: Report object to serialize
-        output_path: Path to write the JSON report
-    """
-    # Convert report to dictionary
-    report_dict = {
-        "summary": {
-            "total_items": report.total_items,
-            "auto_percentage": report.auto_percentage,
-            "mapped_auto": len(report.mapped_auto),
-            "mapped_verify": len(report.mapped_verify),
-            "manual": len(report.manual),
-            "skipped": len(report.skipped),
-        },
-        "total_packages": report.total_items,
-        "auto_mapped": len(report.mapped_auto),
-        "verify_required": len(report.mapped_verify),
-        "manual_review": len(report.manual),
-        "skipped": len(report.skipped),
-        "mapped_auto": [result.model_dump() for result in report.mapped_auto],
-        "mapped_verify": [result.model_dump() for result in report.mapped_verify],
-        "mapping_results": [
-            *[result.model_dump() for result in report.mapped_auto],
-            *[result.model_dump() for result in report.mapped_verify],
-            *[result.model_dump() for result in report.manual],
-            *[result.model_dump() for result in report.skipped],
-        ],
-    }
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(report_dict, f, indent=2, ensure_ascii=False)
-    
-    logger.info(f"Wrote JSON report to {output_path}")
+# Decisions a report result may carry
+_VALID_DECISIONS = frozenset({Decision.AUTO, Decision.VERIFY, Decision.MANUAL, Decision.SKIP})
 
+# Limits for gathering report chunks into one writev() call
+_WRITE_BATCH_BUFFERS = 64
+_WRITE_BATCH_BYTES = 1 << 20
 
-def write_html_report(report: Report, output_path: Path) -> None:
-    """Write an HTML report.
-    
-    Args:
-        report: Report object to render
-        output_path: Path to write the HTML report
-    """
-    # Load template
-    if not REPORT_TEMPLATE.exists():
-        # Create default template if it doesn't exist
-        template_content = create_default_html_template()
-    else:
-        with open(REPORT_TEMPLATE, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-    
-    # Create template context (use new MappingResult shape if available)
-    context = {
-        # Backwards compatibility: report MappingResult may have `source/candidate`
-        # but templates in tests still reference `item` and `candidates[0]`.
-        # To keep template simple, we pass the Report as-is and let MappingResult
-        # model expose both old and new attributes (handled in types.py).
-        "report": report,
-        "summary": {
-            "total_items": report.total_items,
-            "auto_percentage": report.auto_percentage,
-            "mapped_auto": len(report.mapped_auto),
-            "mapped_verify": len(report.mapped_verify),
-            "manual": len(report.manual),
-            "skipped": len(report.skipped),
-        },
-        "header_total_text": f"Total Packages: {report.total_items}",
-    }
-    
-    # Render template
-    template = Template(template_content)
-    html_content = template.render(**context)
-    
-    # Write HTML file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    logger.info(f"Wrote HTML report to {output_path}")
-
-
-def create_default_html_template() -> str:
-    """Create the default HTML report template.
-    
-    Returns:
-        Template content as string
-    """
-    return '''<!DOCTYPE html>
+# Built-in report page, used when the shipped template file is missing
+_DEFAULT_HTML_TEMPLATE: str = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -325,7 +232,7 @@ def create_default_html_template() -> str:
             <!-- Auto-Mapped Packages -->
             <div class="section">
                 <h2>Auto-Mapped Packages</h2>
-                {% if report.mapped_auto %}
+                {% if auto_table %}
                 <table>
                     <thead>
                         <tr>
@@ -336,31 +243,7 @@ def create_default_html_template() -> str:
                         </tr>
                     </thead>
                     <tbody>
-                        {% for result in report.mapped_auto %}
-                        <tr>
-                            <td><strong>{{ result.item.source_name }}</strong><br><small>{{ result.item.source_pm.value }}</small></td>
-                            <td>
-                                {% if result.candidates %}
-                                {% set best = result.candidates[0] %}
-                                <strong>{{ best.pm }}:{{ best.name }}</strong>
-                                {% endif %}
-                            </td>
-                            <td>
-                                {% if result.candidates %}
-                                {% set best = result.candidates[0] %}
-                                <span class="confidence {% if best.confidence >= 0.9 %}high{% elif best.confidence >= 0.6 %}medium{% else %}low{% endif %}">
-                                    {{ "%.0f"|format(best.confidence * 100) }}%
-                                </span>
-                                {% endif %}
-                            </td>
-                            <td>
-                                {% if result.candidates %}
-                                {% set best = result.candidates[0] %}
-                                {{ best.reason or "No reason provided" }}
-                                {% endif %}
-                            </td>
-                        </tr>
-                        {% endfor %}
+                        {{ auto_table }}
                     </tbody>
                 </table>
                 {% else %}
@@ -371,7 +254,7 @@ def create_default_html_template() -> str:
             <!-- Verify Required Packages -->
             <div class="section">
                 <h2>Verify Required Packages</h2>
-                {% if report.mapped_verify %}
+                {% if verify_table %}
                 <table>
                     <thead>
                         <tr>
@@ -382,31 +265,7 @@ def create_default_html_template() -> str:
                         </tr>
                     </thead>
                     <tbody>
-                        {% for result in report.mapped_verify %}
-                        <tr>
-                            <td><strong>{{ result.item.source_name }}</strong><br><small>{{ result.item.source_pm.value }}</small></td>
-                            <td>
-                                {% if result.candidates %}
-                                {% set best = result.candidates[0] %}
-                                <strong>{{ best.pm }}:{{ best.name }}</strong>
-                                {% endif %}
-                            </td>
-                            <td>
-                                {% if result.candidates %}
-                                {% set best = result.candidates[0] %}
-                                <span class="confidence {% if best.confidence >= 0.9 %}high{% elif best.confidence >= 0.6 %}medium{% else %}low{% endif %}">
-                                    {{ "%.0f"|format(best.confidence * 100) }}%
-                                </span>
-                                {% endif %}
-                            </td>
-                            <td>
-                                {% if result.candidates %}
-                                {% set best = result.candidates[0] %}
-                                {{ best.reason or "No reason provided" }}
-                                {% endif %}
-                            </td>
-                        </tr>
-                        {% endfor %}
+                        {{ verify_table }}
                     </tbody>
                 </table>
                 {% else %}
@@ -417,7 +276,7 @@ def create_default_html_template() -> str:
             <!-- Manual Review Packages -->
             <div class="section">
                 <h2>Manual Review Required</h2>
-                {% if report.manual %}
+                {% if manual_table %}
                 <table>
                     <thead>
                         <tr>
@@ -428,14 +287,7 @@ def create_default_html_template() -> str:
                         </tr>
                     </thead>
                     <tbody>
-                        {% for result in report.manual %}
-                        <tr>
-                            <td><strong>{{ result.item.source_name }}</strong></td>
-                            <td>{{ result.item.source_pm.value }}</td>
-                            <td>{{ result.item.category or "Unknown" }}</td>
-                            <td>{{ result.notes or "No mapping found" }}</td>
-                        </tr>
-                        {% endfor %}
+                        {{ manual_table }}
                     </tbody>
                 </table>
                 {% else %}
@@ -446,23 +298,18 @@ def create_default_html_template() -> str:
             <!-- Skipped Packages -->
             <div class="section">
                 <h2>Skipped Packages</h2>
-                {% if report.skipped %}
+                {% if skipped_table %}
                 <table>
                     <thead>
                         <tr>
                             <th>Source Package</th>
                             <th>Package Manager</th>
-                            <th>Reason</th>
+                            <th>Category</th>
+                            <th>Notes</th>
                         </tr>
                     </thead>
                     <tbody>
-                        {% for result in report.skipped %}
-                        <tr>
-                            <td><strong>{{ result.item.source_name }}</strong></td>
-                            <td>{{ result.item.source_pm.value }}</td>
-                            <td>{{ result.notes or "Intentionally skipped" }}</td>
-                        </tr>
-                        {% endfor %}
+                        {{ skipped_table }}
                     </tbody>
                 </table>
                 {% else %}
@@ -479,16 +326,82 @@ def create_default_html_template() -> str:
 </html>'''
 
 
-def get_report_statistics(report: Report) -> Dict[str, Any]:
-    """Get detailed statistics about the report.
+def write_reports(
+    mapping_or_report,
+    output_dir: Path,
+    format_type: str = "json"
+) -> Dict[str, Path]:
+    """Write JSON and HTML reports.
     
     Args:
-        report: Report object to analyze
+        report: Report object with mapping results
+        output_dir: Output directory for reports
+        format_type: Format type (json, yaml, both)
         
     Returns:
-        Dictionary with detailed statistics
+        Dictionary mapping report types to file paths
+    """
+    # Ensure directory exists
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written_files = {}
+
+    # Accept either Report or list of MappingResult
+    if isinstance(mapping_or_report, Report):
+        report = mapping_or_report
+    else:
+        # Build a Report by bucketing results on their decision in one pass
+        try:
+            buckets = {decision: [] for decision in Decision}
+            # Bound appends keep the per-row work to one lookup and one call
+            appenders = {decision: bucket.append for decision, bucket in buckets.items()}
+            for result in mapping_or_report or ():
+                if isinstance(result, MappingResult):
+                    appenders[result.decision](result)
+            report = Report(
+                mapped_auto=buckets[Decision.AUTO],
+                mapped_verify=buckets[Decision.VERIFY],
+                manual=buckets[Decision.MANUAL],
+                skipped=buckets[Decision.SKIP],
+            )
+        except Exception:
+            report = Report()
+    
+    # The JSON and HTML reports are independent, so write them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {}
+        
+        # Write JSON report
+        if format_type in ["json", "both"]:
+            json_path = output_dir / "report.json"
+            futures["json"] = (executor.submit(write_json_report, report, json_path), json_path)
+        
+        # Write HTML report
+        html_path = output_dir / "report.html"
+        futures["html"] = (executor.submit(write_html_report, report, html_path), html_path)
+        
+        for report_type, (future, path) in futures.items():
+            future.result()
+            written_files[report_type] = path
+    
+    logger.info(f"Wrote {len(written_files)} report files")
+    return written_files
+
+
+def write_json_report(report: Report, output_path: Path) -> None:
+    """Write a JSON report.
+    
+    Args:
+        report: Report object to serialize
+        output_path: Path to write the JSON report
     """
-    stats = {
+    # Serialize each result once; the combined list reuses the same dicts
+    auto = _RESULTS_ADAPTER.dump_python(report.mapped_auto, mode="json")
+    verify = _RESULTS_ADAPTER.dump_python(report.mapped_verify, mode="json")
+    manual = _RESULTS_ADAPTER.dump_python(report.manual, mode="json")
+    skipped = _RESULTS_ADAPTER.dump_python(report.skipped, mode="json")
+    
+    # Convert report to dictionary
+    report_dict = {
         "summary": {
             "total_items": report.total_items,
             "auto_percentage": report.auto_percentage,
@@ -497,38 +410,268 @@ def get_report_statistics(report: Report) -> Dict[str, Any]:
             "manual": len(report.manual),
             "skipped": len(report.skipped),
         },
-        "by_package_manager": {},
-        "by_confidence": {
-            "high": 0,    # 0.9-1.0
-            "medium": 0,  # 0.6-0.89
-            "low": 0,     # 0.0-0.59
+        "total_packages": report.total_items,
+        "auto_mapped": len(report.mapped_auto),
+        "verify_required": len(report.mapped_verify),
+        "manual_review": len(report.manual),
+        "skipped": len(report.skipped),
+        "mapped_auto": auto,
+        "mapped_verify": verify,
+        "mapping_results": [*auto, *verify, *manual, *skipped],
+    }
+    
+    # Serialize in one go and write once rather than streaming per token
+    _write_file(output_path, [_dump_json(report_dict)])
+    
+    logger.info(f"Wrote JSON report to {output_path}")
+
+
+def _write_file(output_path: Path, chunks: Iterable[bytes]) -> None:
+    """Write encoded chunks straight to a file descriptor.
+    
+    Bypasses the buffered text I/O layers since callers already hold
+    encoded data. Chunks are gathered into batches submitted with a single
+    ``writev`` call each where the platform supports it. They go to a
+    temporary file next to the destination, which replaces it only once
+    every chunk is written, so an error while producing chunks (e.g. in a
+    template) leaves any existing file intact.
+    
+    Args:
+        output_path: File to create or replace
+        chunks: Encoded file content, in order
+    """
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        try:
+            batch: List[bytes] = []
+            batch_size = 0
+            for chunk in chunks:
+                batch.append(chunk)
+                batch_size += len(chunk)
+                if len(batch) >= _WRITE_BATCH_BUFFERS or batch_size >= _WRITE_BATCH_BYTES:
+                    _write_batch(fd, batch)
+                    batch = []
+                    batch_size = 0
+            _write_batch(fd, batch)
+        finally:
+            os.close(fd)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _write_batch(fd: int, batch: List[bytes]) -> None:
+    """Write a batch of buffers, completing any short writes.
+    
+    Args:
+        fd: File descriptor open for writing
+        batch: Buffers to write, in order
+    """
+    written = os.writev(fd, batch) if len(batch) > 1 and hasattr(os, "writev") else 0
+    for chunk in batch:
+        if written >= len(chunk):
+            written -= len(chunk)
+            continue
+        view = memoryview(chunk)[written:]
+        written = 0
+        while view:
+            view = view[os.write(fd, view):]
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize data to indented UTF-8 JSON.
+    
+    Uses orjson when it is installed, which encodes straight to bytes. The
+    standard library fallback writes non-ASCII characters as raw UTF-8 too,
+    so both paths produce the same bytes.
+    
+    Args:
+        data: JSON-compatible data; other values are converted with str()
+        
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def write_html_report(report: Report, output_path: Path) -> None:
+    """Write an HTML report.
+    
+    Args:
+        report: Report object to render
+        output_path: Path to write the HTML report
+    """
+    # Load template (compiled once per template file version)
+    try:
+        template = _load_template(REPORT_TEMPLATE, REPORT_TEMPLATE.stat().st_mtime_ns)
+    except FileNotFoundError:
+        # Use the default template if the template file doesn't exist
+        template = _load_template(None, 0)
+    
+    # Create template context (use new MappingResult shape if available)
+    context = {
+        # Backwards compatibility: report MappingResult may have `source/candidate`
+        # but templates in tests still reference `item` and `candidates[0]`.
+        # To keep template simple, we pass the Report as-is and let MappingResult
+        # model expose both old and new attributes (handled in types.py).
+        "report": report,
+        "summary": {
+            "total_items": report.total_items,
+            "auto_percentage": report.auto_percentage,
+            "mapped_auto": len(report.mapped_auto),
+            "mapped_verify": len(report.mapped_verify),
+            "manual": len(report.manual),
+            "skipped": len(report.skipped),
         },
-        "by_category": {},
+        "header_total_text": f"Total Packages: {report.total_items}",
+        # Table bodies are rendered by the specialized row templates; the page
+        # template only places them
+        "auto_table": _render_rows(_MAPPED_ROWS_TEMPLATE, report.mapped_auto),
+        "verify_table": _render_rows(_MAPPED_ROWS_TEMPLATE, report.mapped_verify),
+        "manual_table": _render_rows(_SOURCE_ROWS_TEMPLATE, report.manual, "No mapping found"),
+        "skipped_table": _render_rows(_SOURCE_ROWS_TEMPLATE, report.skipped, "Package skipped"),
+    }
+    
+    # Render and write the HTML file incrementally instead of building the
+    # whole page in memory; buffering groups small template chunks together
+    stream = template.stream(**context)
+    stream.enable_buffering(size=64)
+    _write_file(output_path, (chunk.encode('utf-8') for chunk in stream))
+    
+    logger.info(f"Wrote HTML report to {output_path}")
+
+
+def _prep_row(result: MappingResult, default_notes: str = "") -> Dict[str, str]:
+    """Pre-format one report table row.
+    
+    Args:
+        result: Mapping result to display
+        default_notes: Notes shown when the result has none
+        
+    Returns:
+        Dictionary of display-ready cell values
+    """
+    source = result.source
+    candidate = result.candidate
+    row = {
+        "source_name": source.source_name,
+        "source_pm": source.source_pm.value,
+        "category": source.category or "Unknown",
+        "notes": result.notes or default_notes,
+        "target_html": "",
+        "confidence_html": "",
+        "reason": "No reason provided",
     }
     
-    # Process all results
-    all_results = report.mapped_auto + report.mapped_verify + report.manual + report.skipped
+    if candidate is not None:
+        confidence_pct = int(candidate.confidence * 100)
+        if confidence_pct >= 80:
+            level = "high"
+        elif confidence_pct >= 60:
+            level = "medium"
+        else:
+            level = "low"
+        row["target_html"] = Markup("<strong>{}:{}</strong>").format(candidate.target_pm, candidate.target_name)
+        row["confidence_html"] = Markup('<span class="confidence {}">{}%</span>').format(level, confidence_pct)
+        if candidate.reason:
+            row["reason"] = candidate.reason
+    
+    return row
+
+
+def _render_rows(template: Template, results: List[MappingResult], default_notes: str = "") -> Markup:
+    """Render the table body rows for one report section.
+    
+    Args:
+        template: Row template for the section's table layout
+        results: Mapping results in the section
+        default_notes: Notes shown for results without any
+        
+    Returns:
+        Rendered rows, or an empty string when there are no results
+    """
+    if not results:
+        return Markup("")
+    return Markup(template.render(rows=[_prep_row(result, default_notes) for result in results]))
+
+
+@lru_cache(maxsize=4)
+def _load_template(path: Optional[Path], mtime_ns: int) -> Template:
+    """Load and compile an HTML report template.
+    
+    Args:
+        path: Template file, or None for the built-in default template
+        mtime_ns: Modification time of the file, so edits invalidate the cache
+        
+    Returns:
+        Compiled template
+    """
+    if path is None:
+        return _JINJA_ENV.from_string(_DEFAULT_HTML_TEMPLATE)
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return _JINJA_ENV.from_string(f.read())
+
+
+def create_default_html_template() -> str:
+    """Create the default HTML report template.
     
-    for result in all_results:
-        # Count by package manager
-        pm = result.item.source_pm.value
-        stats["by_package_manager"][pm] = stats["by_package_manager"].get(pm, 0) + 1
+    Returns:
+        Template content as string
+    """
+    return _DEFAULT_HTML_TEMPLATE
+
+
+def get_report_statistics(report: Report) -> Dict[str, Any]:
+    """Get detailed statistics about the report.
+    
+    Args:
+        report: Report object to analyze
         
-        # Count by category
-        category = result.item.category or "unknown"
-        stats["by_category"][category] = stats["by_category"].get(category, 0) + 1
+    Returns:
+        Dictionary with detailed statistics
+    """
+    by_pm = Counter()
+    by_category = Counter()
+    high = medium = low = 0
+    get_fields = attrgetter('item', 'candidates')
+    
+    # Single pass over every result
+    for result in chain(report.mapped_auto, report.mapped_verify, report.manual, report.skipped):
+        item, candidates = get_fields(result)
+        by_pm[item.source_pm.value] += 1
+        by_category[item.category or "unknown"] += 1
         
-        # Count by confidence
-        if result.candidates:
-            best_confidence = max(c.confidence for c in result.candidates)
+        if candidates:
+            best_confidence = max(c.confidence for c in candidates)
             if best_confidence >= 0.9:
-                stats["by_confidence"]["high"] += 1
+                high += 1
             elif best_confidence >= 0.6:
-                stats["by_confidence"]["medium"] += 1
+                medium += 1
             else:
-                stats["by_confidence"]["low"] += 1
+                low += 1
     
-    return stats
+    return {
+        "summary": {
+            "total_items": report.total_items,
+            "auto_percentage": report.auto_percentage,
+            "mapped_auto": len(report.mapped_auto),
+            "mapped_verify": len(report.mapped_verify),
+            "manual": len(report.manual),
+            "skipped": len(report.skipped),
+        },
+        "by_package_manager": dict(by_pm),
+        "by_confidence": {
+            "high": high,      # 0.9-1.0
+            "medium": medium,  # 0.6-0.89
+            "low": low,        # 0.0-0.59
+        },
+        "by_category": dict(by_category),
+    }
 
 
 def validate_report(report: Report) -> bool:
@@ -553,14 +696,14 @@ def validate_report(report: Report) -> bool:
             return False
         
         # Check that auto percentage is reasonable
-        if report.auto_percentage < 0 or report.auto_percentage > 100:
+        auto_percentage = report.auto_percentage
+        if auto_percentage < 0 or auto_percentage > 100:
             return False
         
-        # Check that all mapping results have valid decisions
-        all_results = report.mapped_auto + report.mapped_verify + report.manual + report.skipped
-        
-        for result in all_results:
-            if result.decision not in [Decision.AUTO, Decision.VERIFY, Decision.MANUAL, Decision.SKIP]:
+        # Check that all mapping results have valid decisions, stopping at the first bad one
+        valid_decisions = _VALID_DECISIONS
+        for result in chain(report.mapped_auto, report.mapped_verify, report.manual, report.skipped):
+            if result.decision not in valid_decisions:
                 return False
         
         return True
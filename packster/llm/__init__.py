@@ -1,7 +1,7 @@
 """LLM-powered package migration using Claude AI."""
 
-from .claude import ClaudeMigrator
+from .claude import ClaudeMigrator, AsyncClaudeMigrator
 from .prompts import create_migration_prompt
 from .parser import parse_migration_response
 
-__all__ = ["ClaudeMigrator", "create_migration_prompt", "parse_migration_response"]
+__all__ = ["ClaudeMigrator", "AsyncClaudeMigrator", "create_migration_prompt", "parse_migration_response"]
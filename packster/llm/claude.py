@@ -1,15 +1,33 @@
 """Claude AI integration for package migration."""
 
+import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
 import anthropic
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 
-from .prompts import create_migration_prompt
-from .parser import parse_migration_response, save_migration_files
+from ..config import (
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_INPUT_TOKENS_PER_MINUTE,
+    LLM_BATCH_TOKEN_BUDGET,
+)
+
+from .prompts import (
+    create_migration_system,
+    create_migration_user_prompt,
+    build_migration_batches,
+    create_batch_validation_prompt,
+)
+from .parser import (
+    parse_migration_response,
+    parse_validation_response,
+    save_migration_files,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +50,8 @@ class ClaudeMigrator:
         packages: List[Dict[str, Any]],
         output_dir: Optional[Path] = None,
         base_name: str = "llm-migration",
-        batch_size: int = 50
+        batch_size: int = 50,
+        token_budget: int = LLM_BATCH_TOKEN_BUDGET
     ) -> Dict[str, Any]:
         """Migrate packages using Claude AI.
         
@@ -40,50 +59,118 @@ class ClaudeMigrator:
             packages: List of package dictionaries from the report
             output_dir: Directory to save output files (optional)
             base_name: Base name for output files
+            batch_size: Maximum number of packages per API call
+            token_budget: Estimated package-list tokens per API call
             
         Returns:
             Dictionary containing migration results
         """
         
-        logger.info(f"Starting migration for {len(packages)} packages using Claude AI (batch size: {batch_size})")
+        logger.info("Starting migration for %d packages using Claude AI (batch size: %d)", len(packages), batch_size)
         
-        # Process packages in batches
+        # Process packages in batches sized to the token budget
+        batches = build_migration_batches(packages, batch_size, token_budget)
+        system = create_migration_system()
         all_installable = []
         all_unavailable = []
         
-        for i in range(0, len(packages), batch_size):
-            batch = packages[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(packages) + batch_size - 1) // batch_size
+        failure = self._migrate_batches(batches, system, all_installable, all_unavailable)
+        if failure:
+            return failure
+        
+        return self._finish(packages, all_installable, all_unavailable, output_dir, base_name)
+    
+    def _migrate_batches(
+        self,
+        batches: List[List[Dict[str, Any]]],
+        system: List[Dict[str, Any]],
+        all_installable: List[Dict[str, Any]],
+        all_unavailable: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Send packages to Claude batch by batch and collect the results.
+        
+        Args:
+            batches: Batches of package dictionaries, in order
+            system: System content blocks for every call
+            all_installable: List collecting installable packages
+            all_unavailable: List collecting unavailable packages
             
-            logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} packages)")
+        Returns:
+            Failure result if a batch failed, None otherwise
+        """
+        total_batches = len(batches)
+        log_progress = logger.isEnabledFor(logging.INFO)
+        for batch_num, batch in enumerate(batches, 1):
+            started = time.perf_counter()
             
-            # Create the prompt for this batch
-            prompt = create_migration_prompt(batch)
+            # Only the package list changes between batches; the instructions
+            # go in the cached system prompt
+            prompt = create_migration_user_prompt(batch)
             
             # Call Claude API with timeout handling
             try:
-                response = self._call_claude(prompt)
-                logger.info(f"✅ Batch {batch_num}/{total_batches} completed ({len(batch)} packages)")
+                response = self._call_claude(prompt, system=system)
                 
                 # Parse the response
                 parsed_response = parse_migration_response(response)
-                logger.info(f"Successfully parsed batch {batch_num}")
                 
                 # Collect results
-                all_installable.extend(parsed_response.get("installable_packages", []))
-                all_unavailable.extend(parsed_response.get("unavailable_packages", []))
+                installable = parsed_response.get("installable_packages", [])
+                unavailable = parsed_response.get("unavailable_packages", [])
+                all_installable.extend(installable)
+                all_unavailable.extend(unavailable)
+                
+                if log_progress:
+                    logger.info(
+                        "Batch %d/%d done in %.1fs, +%d installable, +%d unavailable",
+                        batch_num, total_batches, time.perf_counter() - started,
+                        len(installable), len(unavailable)
+                    )
                 
             except Exception as e:
-                logger.error(f"❌ Failed to process batch {batch_num}: {e}")
-                return {
-                    "success": False,
-                    "error": f"Batch {batch_num} failed: {e}",
-                    "parsed_response": None,
-                    "saved_files": {},
-                    "summary": {}
-                }
+                logger.error("Failed to process batch %d: %s", batch_num, e)
+                return self._failure(batch_num, e)
         
+        return None
+    
+    def _failure(self, batch_num: int, error: Exception) -> Dict[str, Any]:
+        """Build the result for a migration that failed on a batch.
+        
+        Args:
+            batch_num: 1-based number of the failed batch
+            error: Exception raised while processing the batch
+            
+        Returns:
+            Dictionary containing migration results
+        """
+        return {
+            "success": False,
+            "error": f"Batch {batch_num} failed: {error}",
+            "parsed_response": None,
+            "saved_files": {},
+            "summary": {}
+        }
+    
+    def _finish(
+        self,
+        packages: List[Dict[str, Any]],
+        all_installable: List[Dict[str, Any]],
+        all_unavailable: List[Dict[str, Any]],
+        output_dir: Optional[Path],
+        base_name: str
+    ) -> Dict[str, Any]:
+        """Combine batch results, save output files and summarize.
+        
+        Args:
+            packages: Packages that were migrated
+            all_installable: Installable packages from every batch
+            all_unavailable: Unavailable packages from every batch
+            output_dir: Directory to save output files (optional)
+            base_name: Base name for output files
+            
+        Returns:
+            Dictionary containing migration results
+        """
         # Combine all results
         combined_response = {
             "installable_packages": all_installable,
@@ -91,13 +178,13 @@ class ClaudeMigrator:
             "installation_script": None  # Will be generated from combined results
         }
         
-        logger.info(f"Successfully processed all {len(packages)} packages")
+        logger.info("Successfully processed all %d packages", len(packages))
         
         # Save files if output directory is provided
         saved_files = {}
         if output_dir:
             saved_files = save_migration_files(combined_response, output_dir, base_name)
-            logger.info(f"Saved migration files to {output_dir}")
+            logger.info("Saved migration files to %s", output_dir)
         
         # Prepare results
         results = {
@@ -109,11 +196,12 @@ class ClaudeMigrator:
         
         return results
     
-    def _call_claude(self, prompt: str) -> str:
+    def _call_claude(self, prompt: str, system: Optional[List[Dict[str, Any]]] = None) -> str:
         """Make a call to Claude API.
         
         Args:
             prompt: The prompt to send to Claude
+            system: Optional system content blocks sent ahead of the prompt
             
         Returns:
             Claude's response text
@@ -130,7 +218,8 @@ class ClaudeMigrator:
                         "role": "user",
                         "content": prompt
                     }
-                ]
+                ],
+                **self._system_kwargs(system)
             )
             
             return message.content[0].text
@@ -140,17 +229,18 @@ class ClaudeMigrator:
             if "Streaming is required" in error_str or "max_tokens" in error_str.lower():
                 # Fallback to streaming with lower token limit
                 try:
-                    return self._call_claude_streaming(prompt)
+                    return self._call_claude_streaming(prompt, system=system)
                 except Exception as stream_error:
                     raise Exception(f"Both regular and streaming calls failed. Streaming error: {stream_error}")
             else:
                 raise Exception(f"Unexpected error calling Claude API: {e}")
     
-    def _call_claude_streaming(self, prompt: str) -> str:
+    def _call_claude_streaming(self, prompt: str, system: Optional[List[Dict[str, Any]]] = None) -> str:
         """Make a streaming call to Claude API as fallback.
         
         Args:
             prompt: The prompt to send to Claude
+            system: Optional system content blocks sent ahead of the prompt
             
         Returns:
             Claude's response text
@@ -167,20 +257,42 @@ class ClaudeMigrator:
                         "content": prompt
                     }
                 ],
-                stream=True
+                stream=True,
+                **self._system_kwargs(system)
             )
             
-            # Collect the streaming response
-            response_text = ""
-            for chunk in stream:
-                if chunk.type == "content_block_delta":
-                    response_text += chunk.delta.text
-            
-            return response_text
+            # Join once instead of re-copying the growing response per chunk
+            return "".join(self._iter_stream_text(stream))
             
         except Exception as e:
             raise Exception(f"Streaming API call failed: {e}")
     
+    @staticmethod
+    def _iter_stream_text(stream: Iterable[Any]) -> Iterator[str]:
+        """Yield the text deltas of a streaming Messages API response.
+        
+        Args:
+            stream: Events returned by messages.create(stream=True)
+            
+        Yields:
+            Response text chunks as they arrive
+        """
+        for chunk in stream:
+            if chunk.type == "content_block_delta":
+                yield chunk.delta.text
+    
+    @staticmethod
+    def _system_kwargs(system: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Build the optional system argument for a Messages API call.
+        
+        Args:
+            system: System content blocks, or None
+            
+        Returns:
+            Keyword arguments to pass to messages.create
+        """
+        return {"system": system} if system else {}
+    
     def _generate_summary(self, parsed_response: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a summary of the migration results.
         
@@ -218,28 +330,274 @@ class ClaudeMigrator:
         Returns:
             Validation result
         """
+        return self.validate_mappings([(package_name, suggested_command)])[0]
+    
+    def validate_mappings(self, pairs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Validate several package mappings with a single Claude call.
         
-        from .prompts import create_validation_prompt
+        Args:
+            pairs: (package_name, suggested_command) pairs
+            
+        Returns:
+            One validation result per pair, in order
+        """
+        if not pairs:
+            return []
         
-        prompt = create_validation_prompt(package_name, suggested_command)
+        prompt = create_batch_validation_prompt(pairs)
         
         try:
             response = self._call_claude(prompt)
+            return parse_validation_response(response, len(pairs))
+        except Exception as e:
+            return [{"valid": False, "message": f"Validation failed: {e}"} for _ in pairs]
+
+
+class _RateLimiter:
+    """Token buckets for request and input-token budgets per minute."""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """Initialize the rate limiter with full buckets.
+        
+        Args:
+            requests_per_minute: Maximum requests per minute
+            tokens_per_minute: Maximum input tokens per minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        """Add the capacity accrued since the last update."""
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed_minutes * self.requests_per_minute)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed_minutes * self.tokens_per_minute)
+    
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and the given input tokens are available.
+        
+        Args:
+            tokens: Estimated input tokens of the request
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait_minutes = max(
+                    (1 - self._requests) / self.requests_per_minute,
+                    (tokens - self._tokens) / self.tokens_per_minute,
+                )
+                await asyncio.sleep(wait_minutes * 60)
+
+
+class AsyncClaudeMigrator(ClaudeMigrator):
+    """Migrate packages with concurrent, rate-limited Claude API calls."""
+    
+    # Retries for rate-limited requests, with exponential backoff from 1s
+    MAX_RETRIES = 5
+    
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-3-5-sonnet-20241022",
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        requests_per_minute: int = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = LLM_INPUT_TOKENS_PER_MINUTE
+    ):
+        """Initialize the async Claude migrator.
+        
+        Args:
+            api_key: Claude API key
+            model: Claude model to use
+            max_concurrency: Maximum number of batches in flight
+            requests_per_minute: Request budget to stay under
+            tokens_per_minute: Input token budget to stay under
+        """
+        super().__init__(api_key, model)
+        self.async_client = AsyncAnthropic(api_key=api_key)
+        self.max_concurrency = max(1, min(max_concurrency, requests_per_minute))
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+    
+    def migrate_packages(
+        self,
+        packages: List[Dict[str, Any]],
+        output_dir: Optional[Path] = None,
+        base_name: str = "llm-migration",
+        batch_size: int = 50,
+        token_budget: int = LLM_BATCH_TOKEN_BUDGET
+    ) -> Dict[str, Any]:
+        """Migrate packages using Claude AI, processing batches concurrently.
+        
+        Args:
+            packages: List of package dictionaries from the report
+            output_dir: Directory to save output files (optional)
+            base_name: Base name for output files
+            batch_size: Maximum number of packages per API call
+            token_budget: Estimated package-list tokens per API call
+            
+        Returns:
+            Dictionary containing migration results
+        """
+        return asyncio.run(self.migrate_packages_async(packages, output_dir, base_name, batch_size, token_budget))
+    
+    async def migrate_packages_async(
+        self,
+        packages: List[Dict[str, Any]],
+        output_dir: Optional[Path] = None,
+        base_name: str = "llm-migration",
+        batch_size: int = 50,
+        token_budget: int = LLM_BATCH_TOKEN_BUDGET
+    ) -> Dict[str, Any]:
+        """Migrate packages using Claude AI, processing batches concurrently.
+        
+        Args:
+            packages: List of package dictionaries from the report
+            output_dir: Directory to save output files (optional)
+            base_name: Base name for output files
+            batch_size: Maximum number of packages per API call
+            token_budget: Estimated package-list tokens per API call
+            
+        Returns:
+            Dictionary containing migration results
+        """
+        batches = build_migration_batches(packages, batch_size, token_budget)
+        logger.info(
+            "Starting migration for %d packages using Claude AI (%d batches, up to %d concurrent)",
+            len(packages), len(batches), self.max_concurrency
+        )
+        log_progress = logger.isEnabledFor(logging.INFO)
+        
+        system = create_migration_system()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = _RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+        
+        async def run_batch(batch_num: int, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+            prompt = create_migration_user_prompt(batch)
+            async with semaphore:
+                await limiter.acquire(len(prompt) // 4)
+                started = time.perf_counter()
+                response = await self._call_claude_async(prompt, system=system)
+            parsed_response = parse_migration_response(response)
+            if log_progress:
+                logger.info(
+                    "Batch %d/%d done in %.1fs, +%d installable, +%d unavailable",
+                    batch_num, len(batches), time.perf_counter() - started,
+                    len(parsed_response.get("installable_packages", [])),
+                    len(parsed_response.get("unavailable_packages", []))
+                )
+            return parsed_response
+        
+        tasks = [asyncio.ensure_future(run_batch(num, batch)) for num, batch in enumerate(batches, 1)]
+        try:
+            # Like the sequential path, the first failed batch stops the
+            # migration; batches still waiting or in flight are cancelled
+            if tasks:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for batch_num, task in enumerate(tasks, 1):
+            error = None if task.cancelled() else task.exception()
+            if error is None:
+                continue
+            if not isinstance(error, Exception):
+                raise error
+            logger.error("Failed to process batch %d: %s", batch_num, error)
+            return self._failure(batch_num, error)
+        
+        # Tasks are in batch order, so output order matches the sequential path
+        all_installable = []
+        all_unavailable = []
+        for task in tasks:
+            result = task.result()
+            all_installable.extend(result.get("installable_packages", []))
+            all_unavailable.extend(result.get("unavailable_packages", []))
+        
+        return self._finish(packages, all_installable, all_unavailable, output_dir, base_name)
+    
+    async def _call_claude_async(self, prompt: str, system: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Make a call to Claude API, backing off when rate limited.
+        
+        Args:
+            prompt: The prompt to send to Claude
+            system: Optional system content blocks sent ahead of the prompt
+            
+        Returns:
+            Claude's response text
+        """
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                message = await self.async_client.messages.create(
+                    model=self.model,
+                    max_tokens=8000,
+                    temperature=0.1,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    **self._system_kwargs(system)
+                )
+                return message.content[0].text
+            except anthropic.RateLimitError:
+                if attempt == self.MAX_RETRIES:
+                    raise
+                delay = 2 ** attempt
+                logger.warning("Rate limited by Claude API, retrying in %ss", delay)
+                await asyncio.sleep(delay)
+            except Exception as e:
+                error_str = str(e)
+                if "Streaming is required" in error_str or "max_tokens" in error_str.lower():
+                    try:
+                        return await self._call_claude_streaming_async(prompt, system=system)
+                    except Exception as stream_error:
+                        raise Exception(f"Both regular and streaming calls failed. Streaming error: {stream_error}") from stream_error
+                raise Exception(f"Unexpected error calling Claude API: {e}") from e
+    
+    async def _call_claude_streaming_async(self, prompt: str, system: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Make a streaming call to Claude API as fallback.
+        
+        Args:
+            prompt: The prompt to send to Claude
+            system: Optional system content blocks sent ahead of the prompt
+            
+        Returns:
+            Claude's response text
+        """
+        try:
+            stream = await self.async_client.messages.create(
+                model=self.model,
+                max_tokens=4000,
+                temperature=0.1,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                stream=True,
+                **self._system_kwargs(system)
+            )
+            
+            chunks = []
+            async for chunk in stream:
+                if chunk.type == "content_block_delta":
+                    chunks.append(chunk.delta.text)
+            
+            return "".join(chunks)
             
-            # Parse validation response
-            if "VALID" in response.upper():
-                return {"valid": True, "message": "Mapping validated"}
-            elif "INVALID" in response.upper():
-                return {"valid": False, "message": response}
-            elif "ALTERNATIVE:" in response.upper():
-                # Extract alternative command
-                alt_match = response.split("ALTERNATIVE:", 1)
-                if len(alt_match) > 1:
-                    return {"valid": False, "alternative": alt_match[1].strip(), "message": response}
-                else:
-                    return {"valid": False, "message": response}
-            else:
-                return {"valid": False, "message": "Unclear validation response"}
-                
         except Exception as e:
-            return {"valid": False, "message": f"Validation failed: {e}"}
+            raise Exception(f"Streaming API call failed: {e}") from e
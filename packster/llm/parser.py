@@ -1,10 +1,19 @@
 """Parse Claude AI responses for package migration."""
 
 import json
-import re
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON with orjson when installed, else the standard library."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
 
 def parse_migration_response(response_text: str) -> Dict[str, Any]:
     """Parse Claude's response and extract structured data.
@@ -16,14 +25,15 @@ def parse_migration_response(response_text: str) -> Dict[str, Any]:
         Parsed response with installable packages, unavailable packages, and installation script
     """
     
-    # Try to extract JSON from the response
-    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-    if not json_match:
+    # The JSON object spans from the first "{" to the last "}"
+    start = response_text.find("{")
+    end = response_text.rfind("}")
+    if start == -1 or end < start:
         raise ValueError("No valid JSON found in Claude response")
     
     try:
-        parsed = json.loads(json_match.group())
-    except json.JSONDecodeError as e:
+        parsed = _loads(response_text[start:end + 1])
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
         raise ValueError(f"Invalid JSON in Claude response: {e}")
     
     # Validate required fields
@@ -35,6 +45,43 @@ def parse_migration_response(response_text: str) -> Dict[str, Any]:
     return parsed
 
 
+def parse_validation_response(response_text: str, expected: int) -> List[Dict[str, Any]]:
+    """Parse Claude's response to a batch validation prompt.
+    
+    Args:
+        response_text: Raw response from Claude API
+        expected: Number of mappings that were sent
+        
+    Returns:
+        One validation result per mapping, in order
+    """
+    start = response_text.find("[")
+    end = response_text.rfind("]")
+    if start == -1 or end < start:
+        raise ValueError("No JSON array found in Claude response")
+    
+    try:
+        items = _loads(response_text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in Claude response: {e}") from e
+    
+    if not isinstance(items, list) or len(items) != expected:
+        raise ValueError(f"Expected {expected} validation results in Claude response")
+    
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append({"valid": False, "message": "Unclear validation response"})
+            continue
+        valid = bool(item.get("valid"))
+        result = {"valid": valid, "message": item.get("message") or ("Mapping validated" if valid else "Mapping invalid")}
+        if item.get("alternative"):
+            result["alternative"] = item["alternative"]
+        results.append(result)
+    
+    return results
+
+
 def extract_installation_commands(parsed_response: Dict[str, Any]) -> Dict[str, List[str]]:
     """Extract installation commands grouped by method.
     
@@ -240,7 +287,11 @@ def save_migration_files(
     
     # Full JSON response
     json_path = output_dir / f"{base_name}-response.json"
-    json_path.write_text(json.dumps(parsed_response, indent=2))
+    if orjson is not None:
+        json_path.write_bytes(orjson.dumps(parsed_response, option=orjson.OPT_INDENT_2))
+    else:
+        json_path.write_text(json.dumps(parsed_response, indent=2))
     files["json_response"] = json_path
     
     return files
+
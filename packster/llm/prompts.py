@@ -1,58 +1,279 @@
 """Prompt templates for Claude AI package migration."""
 
-from typing import List, Dict, Any
+import json
+from typing import List, Dict, Any, Tuple
 
 
-def create_migration_prompt(packages: List[Dict[str, Any]]) -> str:
-    """Create a prompt for Claude to analyze packages and generate installation commands.
-    
-    Args:
-        packages: List of package dictionaries from the report
-        
-    Returns:
-        Formatted prompt string for Claude
-    """
-    
-    # Format packages for the prompt - more compact
-    package_list = []
-    for pkg in packages:
-        source_name = pkg.get("source", {}).get("source_name", "unknown")
-        source_pm = pkg.get("source", {}).get("source_pm", "unknown")
-        decision = pkg.get("decision", "unknown")
-        notes = pkg.get("notes", "")
-        package_list.append(f"{source_name} ({source_pm}) - {decision} - {notes}")
-    
-    package_text = "\n".join(package_list)
-    
-    prompt = f"""Migrate {len(packages)} Ubuntu packages to macOS. Determine installability and provide exact commands.
+# Prompts put all static content first and the per-request data last, so
+# that repeated requests share the longest possible cacheable prefix.
+
+# Static migration instructions, identical for every batch. Sent as a cached
+# system block so only the package list is reprocessed per request. The field
+# reference, example response and registry hints keep the block above the
+# API's 1024-token minimum for a cacheable prefix.
+MIGRATION_INSTRUCTIONS = """You migrate Ubuntu packages to macOS. For each package listed in the <packages> block, determine whether it can be installed on macOS and provide the exact command to install it. Each line has the form "name (source package manager) - decision - notes".
 
 Installation priority: Homebrew > Homebrew Cask > MacPorts > Direct > Built-in
 
 Return JSON:
-{{
+{
   "installable_packages": [
-    {{
+    {
       "original_name": "name",
       "macos_name": "macos_name",
       "installation_method": "homebrew|homebrew_cask|macports|direct|builtin",
       "command": "command",
       "notes": "notes"
-    }}
+    }
   ],
   "unavailable_packages": [
-    {{
+    {
       "original_name": "name",
       "reason": "reason",
       "alternatives": ["alt1", "alt2"],
       "notes": "notes"
-    }}
+    }
   ],
   "installation_script": "#!/bin/bash\\n# Generated by Claude AI\\nbrew install pkg1 pkg2\\nbrew install --cask cask1\\nsudo port install port1\\n# Manual steps..."
-}}
+}
+
+Input reference: each line of the <packages> block describes one package.
+- name: the package name on Ubuntu.
+- source package manager: where the package was found: apt, pip, npm, cargo or gem.
+- decision: the outcome of Packster's own mapping step. "auto" means a mapping was found with high confidence, "verify" means a mapping was found that should be checked, "manual" means no usable mapping was found and "skip" means the package was left out of the migration.
+- notes: remarks from Packster's mapping step; may be empty.
+
+Field reference:
+- installable_packages: packages that can be installed on macOS.
+  - original_name: the package name exactly as it appears in the <packages> block.
+  - macos_name: the name of the Homebrew formula, Homebrew cask, MacPorts port or application on macOS.
+  - installation_method: one of "homebrew", "homebrew_cask", "macports", "direct" or "builtin".
+  - command: the exact shell command that installs the package with that method.
+  - notes: anything the user should know about the replacement.
+- unavailable_packages: packages that cannot be installed on macOS.
+  - original_name: the package name exactly as it appears in the <packages> block.
+  - reason: why the package cannot be installed on macOS.
+  - alternatives: macOS packages that offer similar functionality; an empty list if there are none.
+  - notes: anything the user should know about the package.
+- installation_script: a bash script that runs the commands of installable_packages, in the order of the schema above.
+
+Example: for the packages
+
+git (apt) - manual - 
+docker.io (apt) - manual - 
+nodejs (apt) - verify - 
+tar (apt) - verify - 
+ssh (apt) - manual - 
+linux-firmware (apt) - manual - 
+systemd (apt) - manual - 
+
+a complete response is:
+{
+  "installable_packages": [
+    {
+      "original_name": "git",
+      "macos_name": "git",
+      "installation_method": "homebrew",
+      "command": "brew install git",
+      "notes": "Git version control system"
+    },
+    {
+      "original_name": "nodejs",
+      "macos_name": "node",
+      "installation_method": "homebrew",
+      "command": "brew install node",
+      "notes": "Node.js JavaScript runtime"
+    },
+    {
+      "original_name": "tar",
+      "macos_name": "gnu-tar",
+      "installation_method": "homebrew",
+      "command": "brew install gnu-tar",
+      "notes": "GNU version of the tar archiving utility, installed as gtar"
+    },
+    {
+      "original_name": "ssh",
+      "macos_name": "openssh",
+      "installation_method": "homebrew",
+      "command": "brew install openssh",
+      "notes": "OpenSSH client and server"
+    },
+    {
+      "original_name": "docker.io",
+      "macos_name": "docker",
+      "installation_method": "homebrew_cask",
+      "command": "brew install --cask docker",
+      "notes": "Docker Desktop for macOS"
+    }
+  ],
+  "unavailable_packages": [
+    {
+      "original_name": "linux-firmware",
+      "reason": "Firmware for Linux device drivers",
+      "alternatives": [],
+      "notes": "macOS manages device firmware itself"
+    },
+    {
+      "original_name": "systemd",
+      "reason": "Linux init and service manager",
+      "alternatives": [],
+      "notes": "macOS manages services with launchd"
+    }
+  ],
+  "installation_script": "#!/bin/bash\\n# Generated by Claude AI\\nbrew install git node gnu-tar openssh\\nbrew install --cask docker"
+}
+
+Registry hints: Packster's registry maps these Ubuntu names to macOS packages with a different name or package manager.
+""" + "\n".join(
+    f"- {source} -> {target} ({target_pm})"
+    for source, target_pm, target in (
+        # Kept in sync with registry/apt-to-brew.yaml by test_llm
+        ("tar", "brew", "gnu-tar"),
+        ("python3", "brew", "python@3.12"),
+        ("nodejs", "brew", "node"),
+        ("java", "brew", "openjdk@17"),
+        ("postgresql", "brew", "postgresql@15"),
+        ("sqlite3", "brew", "sqlite"),
+        ("mongodb", "brew", "mongodb/brew/mongodb-community"),
+        ("docker", "cask", "docker"),
+        ("kubernetes-cli", "brew", "kubectl"),
+        ("gcloud", "brew", "google-cloud-sdk"),
+        ("az", "brew", "azure-cli"),
+        ("openssl", "brew", "openssl@3"),
+        ("zlib1g", "brew", "zlib"),
+        ("libssl-dev", "brew", "openssl@3"),
+        ("sevenzip", "brew", "7zip"),
+        ("iterm2", "cask", "iterm2"),
+        ("visual-studio-code", "cask", "visual-studio-code"),
+        ("slack", "cask", "slack"),
+        ("discord", "cask", "discord"),
+        ("spotify", "cask", "spotify"),
+        ("firefox", "cask", "firefox"),
+        ("google-chrome", "cask", "google-chrome"),
+        ("ssh", "brew", "openssh"),
+        ("sed", "brew", "gnu-sed"),
+        ("awk", "brew", "gawk"),
+        ("fd-find", "brew", "fd"),
+        ("python3-pip", "brew", "python@3.12"),
+        ("gnome-terminal", "cask", "iterm2"),
+        ("docker.io", "cask", "docker"),
+    )
+)
+
 
-Packages: {package_text}"""
+def create_migration_system() -> List[Dict[str, Any]]:
+    """Create the system blocks carrying the static migration instructions.
     
-    return prompt
+    The block is marked for prompt caching, so batches after the first reuse
+    the cached instructions instead of reprocessing them.
+    
+    Returns:
+        System content blocks for the Messages API
+    """
+    return [
+        {
+            "type": "text",
+            "text": MIGRATION_INSTRUCTIONS,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+
+
+def format_package_line(pkg: Dict[str, Any]) -> str:
+    """Format one package for the migration prompt.
+    
+    Args:
+        pkg: Package dictionary from the report
+        
+    Returns:
+        Single prompt line describing the package
+    """
+    source_name = pkg.get("source", {}).get("source_name", "unknown")
+    source_pm = pkg.get("source", {}).get("source_pm", "unknown")
+    decision = pkg.get("decision", "unknown")
+    notes = pkg.get("notes", "")
+    return f"{source_name} ({source_pm}) - {decision} - {notes}"
+
+
+def estimate_package_tokens(pkg: Dict[str, Any]) -> int:
+    """Estimate the input tokens a package adds to a migration prompt.
+    
+    Uses the common four-characters-per-token approximation.
+    
+    Args:
+        pkg: Package dictionary from the report
+        
+    Returns:
+        Estimated token count, at least 1
+    """
+    return len(format_package_line(pkg)) // 4 + 1
+
+
+def build_migration_batches(
+    packages: List[Dict[str, Any]],
+    max_batch_size: int,
+    token_budget: int
+) -> List[List[Dict[str, Any]]]:
+    """Split packages into batches that fit a per-request token budget.
+    
+    Batches are filled greedily in order. The static instructions are sent as
+    a cached system prompt and are not counted against the budget.
+    
+    Args:
+        packages: List of package dictionaries from the report
+        max_batch_size: Maximum number of packages per batch
+        token_budget: Estimated input tokens allowed per batch
+        
+    Returns:
+        Batches of packages, in order
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    
+    for pkg in packages:
+        tokens = estimate_package_tokens(pkg)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(pkg)
+        current_tokens += tokens
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def create_migration_user_prompt(packages: List[Dict[str, Any]]) -> str:
+    """Create the per-batch user message listing the packages to migrate.
+    
+    Args:
+        packages: List of package dictionaries from the report
+        
+    Returns:
+        User message containing only the batch's packages
+    """
+    
+    # Format packages for the prompt - more compact
+    package_text = "\n".join(format_package_line(pkg) for pkg in packages)
+    
+    return f"Migrate {len(packages)} Ubuntu packages to macOS.\n\n<packages>\n{package_text}\n</packages>"
+
+
+def create_migration_prompt(packages: List[Dict[str, Any]]) -> str:
+    """Create a prompt for Claude to analyze packages and generate installation commands.
+    
+    Combines the static instructions and the package list into a single
+    message, for callers that do not send a separate system prompt.
+    
+    Args:
+        packages: List of package dictionaries from the report
+        
+    Returns:
+        Formatted prompt string for Claude
+    """
+    return f"{MIGRATION_INSTRUCTIONS}\n\n{create_migration_user_prompt(packages)}"
 
 
 def create_validation_prompt(package_name: str, suggested_command: str) -> str:
@@ -68,10 +289,7 @@ def create_validation_prompt(package_name: str, suggested_command: str) -> str:
     
     prompt = f"""You are validating a package migration suggestion.
 
-ORIGINAL PACKAGE: {package_name}
-SUGGESTED COMMAND: {suggested_command}
-
-Please validate this mapping:
+Please validate the mapping below:
 1. Is this the correct macOS equivalent?
 2. Is this the best installation method?
 3. Will this provide the same functionality as the original package?
@@ -81,6 +299,44 @@ Respond with:
 - "INVALID" if it's incorrect, with a brief explanation
 - "ALTERNATIVE: <better_command>" if there's a better option
 
-Keep your response concise."""
+Keep your response concise.
+
+ORIGINAL PACKAGE: {package_name}
+SUGGESTED COMMAND: {suggested_command}"""
+    
+    return prompt
+
+
+def create_batch_validation_prompt(pairs: List[Tuple[str, str]]) -> str:
+    """Create a prompt to validate several package mappings in one request.
+    
+    Args:
+        pairs: (package_name, suggested_command) pairs
+        
+    Returns:
+        Validation prompt string
+    """
+    mappings = json.dumps(
+        [{"package": package_name, "command": command} for package_name, command in pairs],
+        indent=2
+    )
+    
+    prompt = f"""You are validating package migration suggestions from Ubuntu to macOS.
+
+For each mapping below, check:
+1. Is this the correct macOS equivalent?
+2. Is this the best installation method?
+3. Will this provide the same functionality as the original package?
+
+Return a JSON array with exactly one object per mapping, in the same order:
+[
+  {{"valid": true, "alternative": null, "message": "brief explanation"}}
+]
+Set "valid" to false when the mapping is incorrect, and put a better command in "alternative" if there is one.
+
+Respond with the JSON array only.
+
+Mappings:
+{mappings}"""
     
     return prompt
@@ -2,22 +2,46 @@
 
 import logging
 import re
-from typing import List, Dict, Optional, Tuple, Union
-from pydantic import BaseModel, Field
+from difflib import SequenceMatcher
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, List, Dict, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # Optional speedup, see the "fast" extra
+    process = None
+
 from ..types import NormalizedItem
 
 logger = logging.getLogger(__name__)
 
 
 class HeuristicRule(BaseModel):
-    """A single heuristic rule for package mapping."""
+    """A single heuristic rule for package mapping.
+    
+    Rules are immutable and hashable, so rule lists can be indexed and their
+    results memoized safely.
+    """
+    model_config = ConfigDict(frozen=True)
+    
     pattern: str = Field(..., description="Pattern to match (regex or simple string)")
     target_pm: str = Field(..., description="Target package manager")
     target_name: str = Field(..., description="Target package name")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score")
     reason: str = Field(..., description="Reason for this mapping")
     is_regex: bool = Field(default=False, description="Whether pattern is regex")
-    post_install: List[str] = Field(default_factory=list, description="Post-install commands")
+    post_install: Tuple[str, ...] = Field(default=(), description="Post-install commands")
+    
+    _compiled: Optional[re.Pattern] = PrivateAttr(default=None)
+    
+    @model_validator(mode="after")
+    def _compile_pattern(self) -> "HeuristicRule":
+        """Compile regex patterns once, when the rule is created."""
+        if self.is_regex:
+            self._compiled = re.compile(self.pattern)
+        return self
 
 
 # Common heuristic rules for Ubuntu -> Homebrew mapping
@@ -100,6 +124,142 @@ DEFAULT_HEURISTICS = [
 ]
 
 
+# Versioned package names such as "gcc-12.2"
+_VERSION_SUFFIX_RE = re.compile(r"^(.+)-(\d+\.\d+)$")
+
+# Rule indexes keyed by the ids of the rules they were built from. Each
+# entry holds its rules, so the ids cannot be reused while it is cached.
+_RULE_INDEXES: Dict[Tuple[int, ...], "_RuleIndex"] = {}
+_RULE_INDEXES_MAX = 32
+
+# Numbered backreferences and group conditionals; these would refer to the
+# wrong group once a pattern is nested inside the combined alternation
+_NUMBERED_GROUP_REF_RE = re.compile(r"\\[1-9]|\(\?\(\d")
+
+
+class _RuleIndex:
+    """Lookup structures for matching a package name against a rule list."""
+    
+    def __init__(self, rules: List[HeuristicRule]):
+        """Index simple-string rules by pattern and combine the regex rules.
+        
+        Args:
+            rules: Heuristic rules, in priority order
+        """
+        self.rules = list(rules)
+        self.string_rules: Dict[str, List[int]] = {}
+        self.combined_rules: List[int] = []
+        self.separate_rules: List[int] = []
+        
+        # Rule fields as parallel tuples, so matching never goes through the
+        # pydantic models
+        self.compiled = tuple(rule._compiled for rule in self.rules)
+        self.outputs = tuple(
+            (rule.target_pm, rule.target_name, rule.confidence, rule.reason)
+            for rule in self.rules
+        )
+        
+        for position, rule in enumerate(self.rules):
+            if not rule.is_regex:
+                self.string_rules.setdefault(rule.pattern, []).append(position)
+            elif _NUMBERED_GROUP_REF_RE.search(rule.pattern):
+                self.separate_rules.append(position)
+            else:
+                self.combined_rules.append(position)
+        
+        # One alternation over the combinable regex rules; the matching group
+        # names the first of them whose pattern matches
+        try:
+            self.combined = re.compile("|".join(
+                f"(?P<r{i}>{self.rules[position].pattern})"
+                for i, position in enumerate(self.combined_rules)
+            )) if self.combined_rules else None
+        except re.error:
+            # Patterns that cannot be combined (e.g. inline flags or group
+            # names used by several rules) are matched one by one
+            self.combined = None
+        
+        # Rules cannot change, so results per name can be memoized
+        self.apply: Callable[[str], Tuple[Tuple[str, str, float, str], ...]] = (
+            lru_cache(maxsize=8192)(self._apply)
+        )
+    
+    def matching_rules(self, source_name: str) -> List[int]:
+        """Find the positions of the rules matching a package name.
+        
+        Args:
+            source_name: Source package name
+            
+        Returns:
+            Positions of matching rules, in rule order
+        """
+        positions = list(self.string_rules.get(source_name, ()))
+        
+        first = 0
+        if self.combined is not None:
+            match = self.combined.match(source_name)
+            # Rules before the matching alternative are known not to match
+            if match is None:
+                first = len(self.combined_rules)
+            elif match.lastgroup is not None:
+                first = int(match.lastgroup[1:])
+        
+        compiled = self.compiled
+        for position in self.combined_rules[first:]:
+            pattern = compiled[position]
+            if pattern is not None and pattern.match(source_name):
+                positions.append(position)
+        for position in self.separate_rules:
+            pattern = compiled[position]
+            if pattern is not None and pattern.match(source_name):
+                positions.append(position)
+        
+        positions.sort()
+        return positions
+    
+    def _apply(self, source_name: str) -> Tuple[Tuple[str, str, float, str], ...]:
+        """Apply the matching rules to a package name; memoized as ``apply``.
+        
+        Args:
+            source_name: Source package name
+            
+        Returns:
+            (target_pm, target_name, confidence, reason) tuples, highest
+            confidence first
+        """
+        matches = []
+        for position in self.matching_rules(source_name):
+            output = self.outputs[position]
+            pattern = self.compiled[position]
+            if pattern is not None:
+                # Substitute capture groups in target name
+                target_pm, target_name, confidence, reason = output
+                output = (target_pm, pattern.sub(target_name, source_name), confidence, reason)
+            matches.append(output)
+        
+        # Sort by confidence (highest first)
+        matches.sort(key=itemgetter(2), reverse=True)
+        return tuple(matches)
+
+
+def _rule_index(rules: List[HeuristicRule]) -> _RuleIndex:
+    """Get the cached index for a rule list, building it on first use.
+    
+    Args:
+        rules: Heuristic rules
+        
+    Returns:
+        Index over the rules
+    """
+    key = tuple(map(id, rules))
+    index = _RULE_INDEXES.get(key)
+    if index is None:
+        if len(_RULE_INDEXES) >= _RULE_INDEXES_MAX:
+            _RULE_INDEXES.clear()
+        index = _RULE_INDEXES[key] = _RuleIndex(rules)
+    return index
+
+
 def apply_heuristics(
     source_name: Union[str, NormalizedItem],
     heuristics: Optional[List[HeuristicRule]] = None
@@ -120,35 +280,7 @@ def apply_heuristics(
     if isinstance(source_name, NormalizedItem):
         source_name = source_name.source_name
     
-    matches = []
-    
-    for rule in heuristics:
-        if rule.is_regex:
-            # Apply regex pattern
-            match = re.match(rule.pattern, source_name)
-            if match:
-                # Substitute capture groups in target name
-                target_name = re.sub(rule.pattern, rule.target_name, source_name)
-                matches.append((
-                    rule.target_pm,
-                    target_name,
-                    rule.confidence,
-                    rule.reason
-                ))
-        else:
-            # Simple string match
-            if source_name == rule.pattern:
-                matches.append((
-                    rule.target_pm,
-                    rule.target_name,
-                    rule.confidence,
-                    rule.reason
-                ))
-    
-    # Sort by confidence (highest first)
-    matches.sort(key=lambda x: x[2], reverse=True)
-    
-    return matches
+    return list(_rule_index(heuristics).apply(source_name))
 
 
 def apply_name_aliases(
@@ -189,7 +321,7 @@ def apply_common_patterns(source_name: str) -> List[Tuple[str, str, float, str]]
         patterns.append(("brew", base_name, 0.6, f"Binary package: {base_name}"))
     
     # Handle version suffixes
-    version_match = re.match(r"^(.+)-(\d+\.\d+)$", source_name)
+    version_match = _VERSION_SUFFIX_RE.match(source_name)
     if version_match:
         base_name = version_match.group(1)
         patterns.append(("brew", base_name, 0.5, f"Versioned package: {base_name}"))
@@ -212,14 +344,24 @@ def apply_similarity_matching(
     Returns:
         List of (package_name, similarity_score) tuples
     """
-    from difflib import SequenceMatcher
-    
-    similarities = []
+    source_lower = source_name.lower()
     
-    for package in known_packages:
-        similarity = SequenceMatcher(None, source_name.lower(), package.lower()).ratio()
-        if similarity >= threshold:
-            similarities.append((package, similarity))
+    if process is not None:
+        # Scores every name in C; scores are percentages
+        hits = process.extract(
+            source_lower,
+            [package.lower() for package in known_packages],
+            scorer=fuzz.ratio,
+            score_cutoff=threshold * 100,
+            limit=None
+        )
+        similarities = [(known_packages[index], score / 100) for _, score, index in hits]
+    else:
+        similarities = []
+        for package in known_packages:
+            similarity = SequenceMatcher(None, source_lower, package.lower()).ratio()
+            if similarity >= threshold:
+                similarities.append((package, similarity))
     
     # Sort by similarity (highest first)
     similarities.sort(key=lambda x: x[1], reverse=True)
@@ -227,6 +369,29 @@ def apply_similarity_matching(
     return similarities
 
 
+# Keyword-to-mapping tables for apply_category_based_mapping, checked in order
+_CATEGORY_KEYWORD_MAPPINGS = (
+    ("databases", (
+        ("postgres", ("brew", "postgresql", 0.8, "PostgreSQL database")),
+        ("mysql", ("brew", "mysql", 0.8, "MySQL database")),
+        ("sqlite", ("brew", "sqlite", 0.8, "SQLite database")),
+        ("redis", ("brew", "redis", 0.8, "Redis database")),
+    )),
+    ("development", (
+        ("git", ("brew", "git", 0.9, "Git version control")),
+        ("vim", ("brew", "vim", 0.9, "Vim editor")),
+        ("tmux", ("brew", "tmux", 0.9, "Tmux terminal multiplexer")),
+        ("htop", ("brew", "htop", 0.9, "Htop process viewer")),
+    )),
+    ("utilities", (
+        ("curl", ("brew", "curl", 0.9, "cURL HTTP client")),
+        ("wget", ("brew", "wget", 0.9, "Wget download utility")),
+        ("jq", ("brew", "jq", 0.9, "jq JSON processor")),
+        ("ripgrep", ("brew", "ripgrep", 0.9, "ripgrep search tool")),
+    )),
+)
+
+
 def apply_category_based_mapping(
     source_name: str,
     category: Optional[str] = None
@@ -241,39 +406,16 @@ def apply_category_based_mapping(
         List of potential mappings
     """
     mappings = []
+    lowered = source_name.lower()
     
-    # Database packages
-    if category == "databases" or any(db in source_name.lower() for db in ["postgres", "mysql", "sqlite", "redis"]):
-        if "postgres" in source_name.lower():
-            mappings.append(("brew", "postgresql", 0.8, "PostgreSQL database"))
-        elif "mysql" in source_name.lower():
-            mappings.append(("brew", "mysql", 0.8, "MySQL database"))
-        elif "sqlite" in source_name.lower():
-            mappings.append(("brew", "sqlite", 0.8, "SQLite database"))
-        elif "redis" in source_name.lower():
-            mappings.append(("brew", "redis", 0.8, "Redis database"))
-    
-    # Development tools
-    elif category == "development" or any(dev in source_name.lower() for dev in ["git", "vim", "tmux", "htop"]):
-        if "git" in source_name.lower():
-            mappings.append(("brew", "git", 0.9, "Git version control"))
-        elif "vim" in source_name.lower():
-            mappings.append(("brew", "vim", 0.9, "Vim editor"))
-        elif "tmux" in source_name.lower():
-            mappings.append(("brew", "tmux", 0.9, "Tmux terminal multiplexer"))
-        elif "htop" in source_name.lower():
-            mappings.append(("brew", "htop", 0.9, "Htop process viewer"))
-    
-    # Utilities
-    elif category == "utilities" or any(util in source_name.lower() for util in ["curl", "wget", "jq", "ripgrep"]):
-        if "curl" in source_name.lower():
-            mappings.append(("brew", "curl", 0.9, "cURL HTTP client"))
-        elif "wget" in source_name.lower():
-            mappings.append(("brew", "wget", 0.9, "Wget download utility"))
-        elif "jq" in source_name.lower():
-            mappings.append(("brew", "jq", 0.9, "jq JSON processor"))
-        elif "ripgrep" in source_name.lower():
-            mappings.append(("brew", "ripgrep", 0.9, "ripgrep search tool"))
+    # The first group whose category matches, or that has a keyword in the
+    # name, decides; within it the first keyword found wins
+    for group_category, keyword_mappings in _CATEGORY_KEYWORD_MAPPINGS:
+        hit = next((mapping for keyword, mapping in keyword_mappings if keyword in lowered), None)
+        if hit is not None or category == group_category:
+            if hit is not None:
+                mappings.append(hit)
+            break
     
     return mappings
 
@@ -295,35 +437,19 @@ def combine_heuristic_results(
     Returns:
         Combined and deduplicated list of matches
     """
-    all_matches = []
-    
-    # Add registry matches (highest priority)
-    for target_pm, target_name, confidence, reason in registry_matches:
-        all_matches.append((target_pm, target_name, confidence, f"Registry: {reason}"))
-    
-    # Add heuristic matches
-    for target_pm, target_name, confidence, reason in heuristic_matches:
-        all_matches.append((target_pm, target_name, confidence, f"Heuristic: {reason}"))
-    
-    # Add pattern matches
-    for target_pm, target_name, confidence, reason in pattern_matches:
-        all_matches.append((target_pm, target_name, confidence, f"Pattern: {reason}"))
-    
-    # Add category matches
-    for target_pm, target_name, confidence, reason in category_matches:
-        all_matches.append((target_pm, target_name, confidence, f"Category: {reason}"))
-    
-    # Deduplicate by target_pm:target_name combination
-    seen = set()
-    unique_matches = []
-    
-    for target_pm, target_name, confidence, reason in all_matches:
-        key = f"{target_pm}:{target_name}"
-        if key not in seen:
-            seen.add(key)
-            unique_matches.append((target_pm, target_name, confidence, reason))
+    # Deduplicate by (target_pm, target_name) in one pass; sources are in
+    # priority order, so the first occurrence of a target wins
+    unique_matches = {}
+    for source, matches in (
+        ("Registry", registry_matches),
+        ("Heuristic", heuristic_matches),
+        ("Pattern", pattern_matches),
+        ("Category", category_matches),
+    ):
+        for target_pm, target_name, confidence, reason in matches:
+            key = (target_pm, target_name)
+            if key not in unique_matches:
+                unique_matches[key] = (target_pm, target_name, confidence, f"{source}: {reason}")
     
     # Sort by confidence (highest first)
-    unique_matches.sort(key=lambda x: x[2], reverse=True)
-    
-    return unique_matches
+    return sorted(unique_matches.values(), key=itemgetter(2), reverse=True)
@@ -1,33 +1,138 @@
 """Main package mapping logic for Packster."""
 
+import json
 import logging
-from typing import List, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Tuple
 from ..types import NormalizedItem, Candidate, MappingResult, Decision
-from ..config import DECISION_THRESHOLDS
-from .registry import Registry, find_mapping
+from ..config import DECISION_THRESHOLDS, BREW_CACHE_PATH, BREW_CACHE_TTL
+from .registry import Registry, RegistryMapping
 from .heuristics import (
     apply_heuristics,
     apply_common_patterns,
     apply_category_based_mapping,
     combine_heuristic_results
 )
-from ..validate.brew import exists_in_brew, exists_in_cask
+from ..validate.brew import exists_in_brew, exists_in_cask, find_existing_packages, homebrew_index_mtime
 
 logger = logging.getLogger(__name__)
 
+# Decision thresholds, looked up once
+_AUTO_THRESHOLD = DECISION_THRESHOLDS["auto"]
+_VERIFY_THRESHOLD = DECISION_THRESHOLDS["verify"]
+_BY_CONFIDENCE = attrgetter("confidence")
+
+# Upper bound on threads used by PackageMapper.map_packages
+_MAX_MAP_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _load_validation_cache() -> Dict[str, Tuple[bool, float]]:
+    """Load unexpired Homebrew validation results from the on-disk cache.
+    
+    Entries expire after BREW_CACHE_TTL seconds, or as soon as `brew update`
+    has changed the formula and cask definitions they were checked against.
+    """
+    try:
+        with open(BREW_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(cached, dict):
+        return {}
+    oldest = max(time.time() - BREW_CACHE_TTL, homebrew_index_mtime())
+    return {
+        key: (bool(entry[0]), float(entry[1]))
+        for key, entry in cached.items()
+        if isinstance(entry, list) and len(entry) == 2 and isinstance(entry[1], (int, float)) and entry[1] >= oldest
+    }
+
+
+def _save_validation_cache(entries: Dict[str, Tuple[bool, float]]) -> None:
+    """Persist Homebrew validation results to the on-disk cache."""
+    try:
+        BREW_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(BREW_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+    except OSError as e:
+        logger.debug(f"Could not write Homebrew cache {BREW_CACHE_PATH}: {e}")
+
 
 class PackageMapper:
     """Main package mapper that coordinates all mapping logic."""
     
-    def __init__(self, registry: Registry, verify: bool = True):
+    def __init__(
+        self,
+        registry: Registry,
+        verify: bool = True,
+        use_cache: bool = False,
+        aggressive_candidates: bool = False
+    ):
         """Initialize the package mapper.
         
         Args:
             registry: Package mapping registry
             verify: Whether to verify candidates with Homebrew
+            use_cache: Reuse Homebrew validation results persisted by previous
+                runs, for up to BREW_CACHE_TTL seconds
+            aggressive_candidates: Run the heuristic, pattern and category
+                steps even when the registry already has a confident match
         """
         self.registry = registry
         self.verify = verify
+        self.use_cache = use_cache
+        self.aggressive_candidates = aggressive_candidates
+        self._validation_cache: Optional[Dict[str, Tuple[bool, float]]] = None
+        self._validation_cache_dirty = False
+        # Guards loading and updating the validation cache from map threads
+        self._validation_cache_lock = threading.Lock()
+        self._prefetched: Dict[str, bool] = {}
+        self._registry_index, self._registry_lower_index = self._index_registry(registry)
+        # Memoize per instance so the caches do not outlive the mapper
+        self._find_candidates: Callable[..., Tuple[Candidate, ...]] = (
+            lru_cache(maxsize=4096)(self._find_candidates_uncached)
+        )
+        self._compute_candidates: Callable[[str, Optional[str]], Tuple[Candidate, ...]] = (
+            lru_cache(maxsize=4096)(self._compute_candidates_uncached)
+        )
+    
+    @staticmethod
+    def _index_registry(registry: Registry) -> Tuple[Dict[str, RegistryMapping], Dict[str, RegistryMapping]]:
+        """Build the exact and lowercase lookup tables for a registry.
+        
+        Mirrors find_mapping: exact names win over aliases, and the first
+        mapping for a lowercased name wins a case-insensitive match.
+        
+        Args:
+            registry: Package mapping registry
+            
+        Returns:
+            Tuple of (exact index, lowercase index)
+        """
+        mappings = registry.mappings
+        index = {
+            alias: mappings[target]
+            for alias, target in registry.aliases.items()
+            if target in mappings
+        }
+        index.update(mappings)
+        
+        lower_index: Dict[str, RegistryMapping] = {}
+        for name, mapping in mappings.items():
+            lower_index.setdefault(name.lower(), mapping)
+        return index, lower_index
+    
+    def _lookup_registry(self, source_name: str) -> Optional[RegistryMapping]:
+        """Look up a source name in the registry indexes."""
+        mapping = self._registry_index.get(source_name)
+        if mapping is None:
+            mapping = self._registry_lower_index.get(source_name.lower())
+        return mapping
     
     def map_packages(self, packages: List[NormalizedItem]) -> List[MappingResult]:
         """Map a list of packages to target package managers.
@@ -38,13 +143,23 @@ class PackageMapper:
         Returns:
             List of mapping results
         """
-        results = []
+        needs_checks = self.verify and self._bulk_prefetch(packages)
         
-        for package in packages:
-            result = self.map_single_package(package)
-            results.append(result)
+        # Candidates the prefetch could not answer for still wait on brew
+        # subprocesses, so map packages on a thread pool; map() keeps order.
+        # Without such candidates mapping is pure CPU work and runs inline.
+        if needs_checks and len(packages) > 1:
+            workers = min(len(packages), _MAX_MAP_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self.map_single_package, packages))
+        else:
+            results = [self.map_single_package(package) for package in packages]
+        
+        if self._validation_cache_dirty:
+            _save_validation_cache(self._validation_cache)
+            self._validation_cache_dirty = False
         
-        logger.info(f"Mapped {len(packages)} packages")
+        logger.info("Mapped %d packages", len(packages))
         return results
     
     def map_single_package(self, package: NormalizedItem) -> MappingResult:
@@ -56,11 +171,70 @@ class PackageMapper:
         Returns:
             Mapping result for the package
         """
-        source_name = package.source_name
+        candidates = list(self._compute_candidates(package.source_name, package.category))
+        
+        # Step 6: Make decision based on confidence and validation
+        decision = self._make_decision(candidates)
+        
+        return MappingResult(
+            source=package,
+            candidate=candidates[0] if candidates else None,
+            decision=decision
+        )
+    
+    def _compute_candidates_uncached(self, source_name: str, category: Optional[str]) -> Tuple[Candidate, ...]:
+        """Find and validate the candidates for a package name.
+        
+        Results only depend on the name and category, so they are memoized
+        per mapper as _compute_candidates; duplicate sources skip the
+        registry, heuristics and Homebrew validation entirely.
+        
+        Args:
+            source_name: Source package name
+            category: Package category, if known
+            
+        Returns:
+            Validated candidates, best first
+        """
+        candidates = self._find_candidates(source_name, category)
+        
+        # Step 5: Validate candidates if verification is enabled
+        if self.verify and candidates:
+            validated = [candidate for candidate in candidates if self._validate_candidate(candidate)]
+            if not validated and not self.aggressive_candidates:
+                # The confident registry match was rejected; fall back to
+                # the steps that were skipped for it
+                skipped = self._find_candidates(source_name, category, True)[len(candidates):]
+                validated = [candidate for candidate in skipped if self._validate_candidate(candidate)]
+            candidates = validated
+        
+        # Best first; the sort is stable, so registry matches win ties
+        return tuple(sorted(candidates, key=_BY_CONFIDENCE, reverse=True))
+    
+    def _find_candidates_uncached(
+        self,
+        source_name: str,
+        category: Optional[str],
+        complete: bool = False
+    ) -> Tuple[Candidate, ...]:
+        """Find the unvalidated candidates for a package name.
+        
+        A registry match at or above the auto threshold decides on its own,
+        so the remaining steps are skipped for it unless complete or
+        aggressive_candidates is set.
+        
+        Args:
+            source_name: Source package name
+            category: Package category, if known
+            complete: Run every step regardless of the registry match
+            
+        Returns:
+            Candidates, registry match first
+        """
         candidates = []
         
         # Step 1: Check registry for exact matches
-        registry_mapping = find_mapping(self.registry, source_name)
+        registry_mapping = self._lookup_registry(source_name)
         if registry_mapping:
             candidate = Candidate(
                 target_pm=registry_mapping.target_pm,
@@ -70,6 +244,12 @@ class PackageMapper:
                 post_install=registry_mapping.post_install
             )
             candidates.append(candidate)
+            if (
+                registry_mapping.confidence >= _AUTO_THRESHOLD
+                and not complete
+                and not self.aggressive_candidates
+            ):
+                return tuple(candidates)
         
         # Step 2: Apply heuristics if no registry match
         if not candidates:
@@ -95,7 +275,7 @@ class PackageMapper:
             candidates.append(candidate)
         
         # Step 4: Apply category-based mapping
-        category_matches = apply_category_based_mapping(source_name, package.category)
+        category_matches = apply_category_based_mapping(source_name, category)
         for target_pm, target_name, confidence, reason in category_matches:
             candidate = Candidate(
                 target_pm=target_pm,
@@ -105,29 +285,122 @@ class PackageMapper:
             )
             candidates.append(candidate)
         
-        # Step 5: Validate candidates if verification is enabled
-        if self.verify and candidates:
-            validated_candidates = []
-            for candidate in candidates:
-                if self._validate_candidate(candidate):
-                    validated_candidates.append(candidate)
-            candidates = validated_candidates
+        return tuple(candidates)
+    
+    def _bulk_prefetch(self, packages: List[NormalizedItem]) -> bool:
+        """Validate every brew and cask candidate up front in bulk.
         
-        # Step 6: Make decision based on confidence and validation
-        decision = self._make_decision(candidates)
+        Collects the candidate names of all packages and checks them with one
+        brew call per kind instead of one or two calls per candidate. Names
+        brew could not answer for are validated individually later.
         
-        return MappingResult(
-            source=package,
-            candidate=candidates[0] if candidates else None,
-            decision=decision
+        Args:
+            packages: Packages about to be mapped
+            
+        Returns:
+            True if some candidates still need an individual Homebrew check
+        """
+        if self.use_cache:
+            with self._validation_cache_lock:
+                if self._validation_cache is None:
+                    self._validation_cache = _load_validation_cache()
+        
+        lookups = [self._find_candidates(package.source_name, package.category) for package in packages]
+        self._prefetch_candidates(lookups)
+        
+        if not self.aggressive_candidates:
+            # A rejected confident registry match falls back to the steps
+            # that were skipped for it; check those candidates too
+            fallbacks = [
+                self._find_candidates(package.source_name, package.category, True)
+                for package, candidates in zip(packages, lookups, strict=True)
+                if candidates and all(self._known_validity(c) is False for c in candidates)
+            ]
+            self._prefetch_candidates(fallbacks)
+            lookups.extend(fallbacks)
+        
+        return any(
+            self._known_validity(candidate) is None
+            for candidates in lookups
+            for candidate in candidates
         )
     
+    def _known_validity(self, candidate: Candidate) -> Optional[bool]:
+        """Get a candidate's validity if it is known without running brew.
+        
+        Args:
+            candidate: Candidate to look up
+            
+        Returns:
+            Whether the candidate is valid, or None if brew must be asked
+        """
+        if candidate.target_pm not in ("brew", "cask"):
+            return True
+        key = f"{candidate.target_pm}:{candidate.target_name}"
+        prefetched = self._prefetched.get(key)
+        if prefetched is not None:
+            return prefetched
+        cached = (self._validation_cache or {}).get(key) if self.use_cache else None
+        return cached[0] if cached is not None else None
+    
+    def _prefetch_candidates(self, lookups: List[Tuple[Candidate, ...]]) -> None:
+        """Check the unknown brew and cask candidates with one brew call per kind.
+        
+        Args:
+            lookups: Candidates of each package
+        """
+        names = {"brew": set(), "cask": set()}
+        for candidates in lookups:
+            for candidate in candidates:
+                if candidate.target_pm in names and self._known_validity(candidate) is None:
+                    names[candidate.target_pm].add(candidate.target_name)
+        
+        for target_pm, pm_names in names.items():
+            if not pm_names:
+                continue
+            existing = find_existing_packages(pm_names, cask=target_pm == "cask")
+            if existing is None:
+                continue
+            for name in pm_names:
+                self._prefetched[f"{target_pm}:{name}"] = name in existing
+    
     def _validate_candidate(self, candidate: Candidate) -> bool:
         """Validate a candidate mapping with Homebrew.
         
         Args:
             candidate: Candidate to validate
             
+        Returns:
+            True if candidate is valid, False otherwise
+        """
+        if candidate.target_pm not in ("brew", "cask"):
+            return self._check_candidate(candidate)
+        
+        key = f"{candidate.target_pm}:{candidate.target_name}"
+        prefetched = self._prefetched.get(key)
+        if not self.use_cache:
+            return prefetched if prefetched is not None else self._check_candidate(candidate)
+        
+        with self._validation_cache_lock:
+            if self._validation_cache is None:
+                self._validation_cache = _load_validation_cache()
+            cached = self._validation_cache.get(key)
+        if cached is not None:
+            return cached[0]
+        
+        # brew runs outside the lock so other threads keep validating
+        is_valid = prefetched if prefetched is not None else self._check_candidate(candidate)
+        with self._validation_cache_lock:
+            self._validation_cache[key] = (is_valid, time.time())
+            self._validation_cache_dirty = True
+        return is_valid
+    
+    def _check_candidate(self, candidate: Candidate) -> bool:
+        """Check a candidate mapping against Homebrew.
+        
+        Args:
+            candidate: Candidate to check
+            
         Returns:
             True if candidate is valid, False otherwise
         """
@@ -147,7 +420,7 @@ class PackageMapper:
         """Make a decision based on candidate confidence scores.
         
         Args:
-            candidates: List of validated candidates
+            candidates: List of validated candidates, best first
             
         Returns:
             Decision for the package
@@ -155,13 +428,11 @@ class PackageMapper:
         if not candidates:
             return Decision.MANUAL
         
-        # Get the best candidate (highest confidence)
-        best_candidate = max(candidates, key=lambda c: c.confidence)
-        
-        # Apply decision thresholds
-        if best_candidate.confidence >= DECISION_THRESHOLDS["auto"]:
+        # Apply decision thresholds to the best candidate
+        confidence = candidates[0].confidence
+        if confidence >= _AUTO_THRESHOLD:
             return Decision.AUTO
-        elif best_candidate.confidence >= DECISION_THRESHOLDS["verify"]:
+        elif confidence >= _VERIFY_THRESHOLD:
             return Decision.VERIFY
         else:
             return Decision.MANUAL
@@ -170,7 +441,9 @@ class PackageMapper:
 def map_packages(
     packages: List[NormalizedItem],
     registry: Registry,
-    verify: bool = True
+    verify: bool = True,
+    use_cache: bool = False,
+    aggressive_candidates: bool = False
 ) -> List[MappingResult]:
     """Convenience function to map packages.
     
@@ -178,11 +451,14 @@ def map_packages(
         packages: List of normalized packages to map
         registry: Package mapping registry
         verify: Whether to verify candidates with Homebrew
+        use_cache: Reuse Homebrew validation results from previous runs
+        aggressive_candidates: Collect every candidate even when the registry
+            already has a confident match
         
     Returns:
         List of mapping results
     """
-    mapper = PackageMapper(registry, verify)
+    mapper = PackageMapper(registry, verify, use_cache, aggressive_candidates)
     return mapper.map_packages(packages)
 
 
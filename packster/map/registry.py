@@ -1,10 +1,19 @@
 """Registry management for package mappings."""
 
 import logging
+import mmap
 import yaml
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
-from pydantic import BaseModel, Field
+from typing import Dict, Iterable, List, Optional, Tuple, Union, Any
+from pydantic import BaseModel, Field, PrivateAttr
+
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +36,17 @@ class Registry(BaseModel):
     version: str = Field(default="1.0", description="Registry version")
     mappings: Dict[str, RegistryMapping] = Field(default_factory=dict, description="Package mappings")
     aliases: Dict[str, str] = Field(default_factory=dict, description="Name aliases")
+    
+    # Lookup tables for find_mapping: exact names with aliases folded in,
+    # lowercased mapping names, and the (mappings, aliases) dicts they were
+    # built from. add_mapping/remove_mapping drop them, and assigning new
+    # mappings or aliases dicts rebuilds them; edits made to the dicts in
+    # place are not seen.
+    _resolved: Optional[Dict[str, RegistryMapping]] = PrivateAttr(default=None)
+    _lower_index: Dict[str, RegistryMapping] = PrivateAttr(default_factory=dict)
+    _index_source: Tuple[Optional[Dict[str, RegistryMapping]], Optional[Dict[str, str]]] = PrivateAttr(
+        default=(None, None)
+    )
 
 
 def load_registry(registry_path: Union[str, Path]) -> Registry:
@@ -46,42 +66,78 @@ def load_registry(registry_path: Union[str, Path]) -> Registry:
     if isinstance(registry_path, str):
         registry_path = Path(registry_path)
     
-    if not registry_path.exists():
+    try:
+        stat = registry_path.stat()
+    except OSError:
         # For tests that patch open to raise, return Default Registry empty
         logger.warning(f"Registry file not found: {registry_path}. Using Default Registry.")
         return Registry(name="Default Registry", description=None, version="1.0", aliases={})
     
-    try:
-        with open(registry_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+    # Parsed registries are reused until the file changes. Callers get their
+    # own containers and mapping objects, so neither add_mapping/remove_mapping
+    # nor edits to a returned mapping ever touch the cache.
+    registry = _load_registry_cached(str(registry_path), stat.st_mtime_ns, stat.st_size)
+    loaded = registry.model_copy(update={
+        "mappings": {
+            name: mapping.model_copy(update={"post_install": list(mapping.post_install)})
+            for name, mapping in registry.mappings.items()
+        },
+        "aliases": dict(registry.aliases),
+    })
+    _index_registry(loaded)
+    return loaded
+
+
+# Registry files larger than this are parsed from a memory map
+_MMAP_THRESHOLD = 256 * 1024
+
+@lru_cache(maxsize=32)
+def _load_registry_cached(path: str, mtime_ns: int, size: int) -> Registry:
+    """Parse a registry file, memoized by path, modification time and size.
+    
+    Args:
+        path: Path to the registry YAML file
+        mtime_ns: Modification time of the file, in nanoseconds
+        size: Size of the file in bytes
         
-        # Convert to Registry object
-        registry = Registry(
-            name=data.get("name", "default"),
-            description=data.get("description"),
-            version=data.get("version", "1.0"),
-            aliases=data.get("aliases", {})
-        )
+    Returns:
+        Loaded registry object, shared between calls
+    """
+    registry_path = Path(path)
+    try:
+        # Bytes let libyaml decode the file itself. Large files are mapped
+        # into memory rather than read into one bytes object first.
+        with open(registry_path, 'rb') as f:
+            if size > _MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    data = yaml.load(mapped, Loader=_SafeLoader)
+            else:
+                data = yaml.load(f.read(), Loader=_SafeLoader)
         
-        # Load mappings
-        mappings_data = data.get("mappings", {})
-        for source_name, mapping_data in mappings_data.items():
+        # Load mappings into a plain dict first
+        mappings: Dict[str, RegistryMapping] = {}
+        for source_name, mapping_data in data.get("mappings", {}).items():
             if isinstance(mapping_data, dict):
-                mapping = RegistryMapping(
-                    source_name=source_name,
-                    **mapping_data
-                )
-                registry.mappings[source_name] = mapping
+                mappings[source_name] = _mapping_from_dict(source_name, mapping_data)
             elif isinstance(mapping_data, str):
-                # Simple string mapping: source -> target
-                mapping = RegistryMapping(
+                # Simple string mapping: source -> target; every field is
+                # known to be valid, so validation is skipped
+                mappings[source_name] = RegistryMapping.model_construct(
                     source_name=source_name,
                     target_pm="brew",
                     target_name=mapping_data,
                     confidence=0.9,
                     reason="Direct mapping from registry"
                 )
-                registry.mappings[source_name] = mapping
+        
+        # Convert to Registry object; only the header fields are validated
+        registry = Registry(
+            name=data.get("name", "default"),
+            description=data.get("description"),
+            version=data.get("version", "1.0"),
+            aliases=data.get("aliases", {})
+        )
+        registry.mappings = mappings
         
         logger.info(f"Loaded registry '{registry.name}' with {len(registry.mappings)} mappings")
         return registry
@@ -92,6 +148,44 @@ def load_registry(registry_path: Union[str, Path]) -> Registry:
         raise Exception(f"Error loading registry {registry_path}: {e}")
 
 
+# Fields a registry entry may set; source_name comes from the entry's key
+_MAPPING_FIELDS = frozenset(RegistryMapping.model_fields) - {"source_name"}
+
+
+def _mapping_from_dict(source_name: str, mapping_data: Dict[str, Any]) -> RegistryMapping:
+    """Build a mapping from a registry entry, validating only when needed.
+    
+    Well-formed entries, the common case, are constructed without running
+    pydantic validation. Anything unusual (unknown keys, wrong types, an
+    out-of-range confidence) goes through full validation, so errors are
+    reported exactly as before.
+    
+    Args:
+        source_name: Source package name
+        mapping_data: Mapping fields from the registry file
+        
+    Returns:
+        Registry mapping
+    """
+    confidence = mapping_data.get("confidence", 0.8)
+    post_install = mapping_data.get("post_install", [])
+    if (
+        _MAPPING_FIELDS.issuperset(mapping_data)
+        and isinstance(mapping_data.get("target_pm"), str)
+        and isinstance(mapping_data.get("target_name"), str)
+        and type(confidence) in (float, int)
+        and 0.0 <= confidence <= 1.0
+        and isinstance(mapping_data.get("reason", ""), (str, type(None)))
+        and isinstance(mapping_data.get("notes"), (str, type(None)))
+        and isinstance(post_install, list)
+        and all(isinstance(command, str) for command in post_install)
+    ):
+        return RegistryMapping.model_construct(
+            source_name=source_name,
+            **{**mapping_data, "confidence": float(confidence), "post_install": list(post_install)}
+        )
+    return RegistryMapping(source_name=source_name, **mapping_data)
+
 def save_registry(registry: Registry, registry_path: Path) -> None:
     """Save a registry to a YAML file.
     
@@ -103,29 +197,20 @@ def save_registry(registry: Registry, registry_path: Path) -> None:
         Exception: If saving fails
     """
     try:
-        # Convert registry to dictionary
-        data = {
-            "name": registry.name,
-            "description": registry.description,
-            "version": registry.version,
-            "aliases": registry.aliases,
-            "mappings": {}
+        # Convert registry to dictionary; pydantic-core serializes each
+        # mapping in one pass, in field order
+        data = registry.model_dump(exclude={"mappings"})
+        data["mappings"] = {
+            source_name: mapping.model_dump(exclude={"source_name"})
+            for source_name, mapping in registry.mappings.items()
         }
         
-        # Convert mappings
-        for source_name, mapping in registry.mappings.items():
-            data["mappings"][source_name] = {
-                "target_pm": mapping.target_pm,
-                "target_name": mapping.target_name,
-                "confidence": mapping.confidence,
-                "reason": mapping.reason,
-                "post_install": mapping.post_install,
-                "notes": mapping.notes
-            }
-        
-        # Save to file
-        with open(registry_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        # Serialize to bytes first, then save to file with a single write
+        payload = yaml.dump(
+            data, Dumper=_SafeDumper, default_flow_style=False, sort_keys=False, encoding='utf-8'
+        )
+        with open(registry_path, 'wb') as f:
+            f.write(payload)
         
         logger.info(f"Saved registry '{registry.name}' to {registry_path}")
         
@@ -143,23 +228,81 @@ def find_mapping(registry: Registry, source_name: str) -> Optional[RegistryMappi
     Returns:
         Registry mapping if found, None otherwise
     """
-    # Direct match
-    if source_name in registry.mappings:
-        return registry.mappings[source_name]
+    resolved, lower_index = _lookup_tables(registry)
     
-    # Check aliases
-    if source_name in registry.aliases:
-        aliased_name = registry.aliases[source_name]
-        if aliased_name in registry.mappings:
-            return registry.mappings[aliased_name]
+    # Direct match, then aliases
+    mapping = resolved.get(source_name)
+    if mapping is not None:
+        return mapping
     
     # Case-insensitive match
-    source_name_lower = source_name.lower()
-    for name, mapping in registry.mappings.items():
-        if name.lower() == source_name_lower:
-            return mapping
+    return lower_index.get(source_name.lower())
+
+
+def find_mappings_batch(registry: Registry, source_names: Iterable[str]) -> List[Optional[RegistryMapping]]:
+    """Find the mappings for many source package names at once.
+    
+    Same results as calling find_mapping for each name, but the lookup
+    tables are checked once and their lookups are bound before the loop.
+    
+    Args:
+        registry: Registry to search in
+        source_names: Source package names to find
+        
+    Returns:
+        Registry mapping or None for each name, in order
+    """
+    resolved, lower_index = _lookup_tables(registry)
     
-    return None
+    resolved_get = resolved.get
+    lower_get = lower_index.get
+    return [resolved_get(name) or lower_get(name.lower()) for name in source_names]
+
+
+def _lookup_tables(registry: Registry) -> Tuple[Dict[str, RegistryMapping], Dict[str, RegistryMapping]]:
+    """Get the lookup tables used by find_mapping, building them if needed.
+    
+    Args:
+        registry: Registry to search in
+        
+    Returns:
+        Resolved (exact names and aliases) and lowercase lookup tables
+    """
+    resolved = registry._resolved
+    mappings, aliases = registry._index_source
+    if resolved is None or mappings is not registry.mappings or aliases is not registry.aliases:
+        resolved = _index_registry(registry)
+    return resolved, registry._lower_index
+
+
+def _index_registry(registry: Registry) -> Dict[str, RegistryMapping]:
+    """Build the lookup tables used by find_mapping.
+    
+    Exact mapping names win over aliases, and the first mapping for a
+    lowercased name wins a case-insensitive match.
+    
+    Args:
+        registry: Registry to index
+        
+    Returns:
+        Resolved lookup table
+    """
+    mappings = registry.mappings
+    resolved = {
+        alias: mappings[target]
+        for alias, target in registry.aliases.items()
+        if target in mappings
+    }
+    resolved.update(mappings)
+    
+    lower_index: Dict[str, RegistryMapping] = {}
+    for name, mapping in mappings.items():
+        lower_index.setdefault(name.lower(), mapping)
+    
+    registry._resolved = resolved
+    registry._lower_index = lower_index
+    registry._index_source = (mappings, registry.aliases)
+    return resolved
 
 
 def add_mapping(
@@ -195,6 +338,7 @@ def add_mapping(
     )
     
     registry.mappings[source_name] = mapping
+    registry._resolved = None
     logger.debug(f"Added mapping: {source_name} -> {target_pm}:{target_name}")
 
 
@@ -210,11 +354,17 @@ def remove_mapping(registry: Registry, source_name: str) -> bool:
     """
     if source_name in registry.mappings:
         del registry.mappings[source_name]
+        registry._resolved = None
         logger.debug(f"Removed mapping: {source_name}")
         return True
     return False
 
 
+# Lower bounds of the medium and high confidence bands
+_CONFIDENCE_BOUNDS = (0.6, 0.9)
+_CONFIDENCE_BANDS = ("low", "medium", "high")
+
+
 def get_registry_statistics(registry: Registry) -> Dict[str, Any]:
     """Get statistics about the registry.
     
@@ -224,28 +374,21 @@ def get_registry_statistics(registry: Registry) -> Dict[str, Any]:
     Returns:
         Dictionary with registry statistics
     """
-    stats = {
-        "total_mappings": len(registry.mappings),
-        "total_aliases": len(registry.aliases),
-        "by_target_pm": {},
-        "by_confidence": {
-            "high": 0,    # 0.9-1.0
-            "medium": 0,  # 0.6-0.89
-            "low": 0,     # 0.0-0.59
-        }
+    by_target_pm: Counter = Counter()
+    by_confidence = {
+        "high": 0,    # 0.9-1.0
+        "medium": 0,  # 0.6-0.89
+        "low": 0,     # 0.0-0.59
     }
     
-    # Count by target package manager
+    # Count by target package manager and confidence band in one pass
     for mapping in registry.mappings.values():
-        pm = mapping.target_pm
-        stats["by_target_pm"][pm] = stats["by_target_pm"].get(pm, 0) + 1
-        
-        # Count by confidence
-        if mapping.confidence >= 0.9:
-            stats["by_confidence"]["high"] += 1
-        elif mapping.confidence >= 0.6:
-            stats["by_confidence"]["medium"] += 1
-        else:
-            stats["by_confidence"]["low"] += 1
-    
-    return stats
+        by_target_pm[mapping.target_pm] += 1
+        by_confidence[_CONFIDENCE_BANDS[bisect_right(_CONFIDENCE_BOUNDS, mapping.confidence)]] += 1
+    
+    return {
+        "total_mappings": len(registry.mappings),
+        "total_aliases": len(registry.aliases),
+        "by_target_pm": dict(by_target_pm),
+        "by_confidence": by_confidence,
+    }
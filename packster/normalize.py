@@ -1,18 +1,135 @@
 """Package normalization utilities for Packster."""
 
+import importlib
 import logging
-from typing import List, Dict, Any
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from .types import NormalizedItem, PackageManager
-from .collect import (
-    collect_apt_packages,
-    collect_pip_packages,
-    collect_npm_packages,
-    collect_cargo_packages,
-    collect_gem_packages,
-)
 
 logger = logging.getLogger(__name__)
 
+# Package manager, the command its collector needs, and the collector's
+# module and function. Collectors are imported on first use, so commands
+# that never normalize packages do not load them.
+_COLLECTORS = (
+    ("apt", "apt-mark", "apt", "collect_apt_packages"),
+    ("pip", "pip", "pip_", "collect_pip_packages"),
+    ("npm", "npm", "npm", "collect_npm_packages"),
+    ("cargo", "cargo", "cargo", "collect_cargo_packages"),
+    ("gem", "gem", "gem", "collect_gem_packages"),
+)
+
+# Packages that ship with the OS or a language toolchain
+_SYSTEM_PACKAGES = frozenset({
+    # APT system packages
+    "apt", "dpkg", "base-files", "base-passwd", "bash", "coreutils",
+    "dash", "debianutils", "diffutils", "findutils", "grep", "gzip",
+    "hostname", "init-system-helpers", "libc-bin", "libpam-modules",
+    "libpam-runtime", "login", "mount", "passwd", "perl-base",
+    "sed", "sysvinit-utils", "tar", "util-linux", "zlib1g",
+    "ubuntu-minimal", "ubuntu-standard", "ubuntu-server",
+    
+    # Python system packages
+    "pip", "setuptools", "wheel", "distlib", "filelock", "platformdirs",
+    "six", "pyparsing", "packaging", "markupsafe", "jinja2", "itsdangerous",
+    "click", "blinker", "werkzeug", "urllib3", "requests", "certifi",
+    "charset-normalizer", "idna", "python-dateutil", "pytz",
+    
+    # Node.js system packages
+    "npm", "node", "npx", "corepack", "yarn", "pnpm",
+    
+    # Rust system packages
+    "cargo", "rustc", "rustup", "rustfmt", "clippy",
+    
+    # Ruby system packages
+    "bundler", "rake", "rdoc", "json", "minitest", "test-unit",
+    "bigdecimal", "io-console", "psych", "stringio", "strscan",
+})
+
+# Suffixes of development, debug and documentation packages
+_EXCLUDED_SUFFIXES = ("-dev", "-dbg", "-doc")
+
+# Development tools
+_DEV_TOOLS = frozenset({
+    "git", "vim", "neovim", "tmux", "htop", "tree", "cmake", "make",
+    "autoconf", "automake", "pkg-config", "gcc", "g++", "clang",
+    "lldb", "gdb", "valgrind", "strace", "ltrace",
+})
+
+# Utilities
+_UTILITIES = frozenset({
+    "curl", "wget", "jq", "ripgrep", "fd", "bat", "eza", "fzf",
+    "unzip", "zip", "tar", "gzip", "bzip2", "xz", "zstd",
+    "rsync", "ncdu", "httpie", "nmap", "watch", "parallel",
+})
+
+# Languages and runtimes
+_LANGUAGES = frozenset({
+    "python", "python3", "node", "nodejs", "go", "rust", "ruby",
+    "java", "kotlin", "scala", "clojure", "haskell", "ocaml",
+    "erlang", "elixir", "crystal", "nim", "zig", "v",
+})
+
+# Build tools
+_BUILD_TOOLS = frozenset({
+    "maven", "gradle", "sbt", "cargo", "npm", "yarn", "pnpm",
+    "pip", "poetry", "pipenv", "conda", "mamba",
+})
+
+# Databases
+_DATABASES = frozenset({
+    "postgresql", "mysql", "sqlite", "redis", "mongodb", "cassandra",
+    "elasticsearch", "influxdb", "timescaledb", "cockroachdb",
+})
+
+# Containers and orchestration
+_CONTAINERS = frozenset({
+    "docker", "kubernetes", "helm", "kubectl", "minikube", "kind",
+    "docker-compose", "podman", "buildah", "skopeo",
+})
+
+# Cloud tools
+_CLOUD_TOOLS = frozenset({
+    "awscli", "terraform", "gcloud", "az", "doctl", "kubectl",
+    "helm", "istioctl", "linkerd", "consul", "vault",
+})
+
+# Package type recorded by enrich_package_metadata for each package manager
+_PM_TO_TYPE: Dict[PackageManager, str] = {
+    PackageManager.APT: "system",
+    PackageManager.PIP: "python",
+    PackageManager.NPM: "nodejs",
+    PackageManager.CARGO: "rust",
+    PackageManager.GEM: "ruby",
+}
+
+
+def _build_name_to_category() -> Dict[str, str]:
+    """Merge the category sets into one name -> category table.
+    
+    A name listed in several sets (kubectl, helm) keeps the first category
+    in the order below.
+    """
+    name_to_category: Dict[str, str] = {}
+    for category, names in (
+        ("development", _DEV_TOOLS),
+        ("utilities", _UTILITIES),
+        ("languages", _LANGUAGES),
+        ("build_tools", _BUILD_TOOLS),
+        ("databases", _DATABASES),
+        ("containers", _CONTAINERS),
+        ("cloud", _CLOUD_TOOLS),
+    ):
+        for name in names:
+            name_to_category.setdefault(name, category)
+    return name_to_category
+
+
+_NAME_TO_CATEGORY = _build_name_to_category()
+
 
 def normalize_all_packages() -> List[NormalizedItem]:
     """Collect and normalize packages from all available package managers.
@@ -22,29 +139,75 @@ def normalize_all_packages() -> List[NormalizedItem]:
     """
     all_packages = []
     
-    # Collect from each package manager
-    collectors = [
-        ("apt", collect_apt_packages),
-        ("pip", collect_pip_packages),
-        ("npm", collect_npm_packages),
-        ("cargo", collect_cargo_packages),
-        ("gem", collect_gem_packages),
-    ]
-    
-    for pm_name, collector in collectors:
-        try:
-            packages = collector()
-            all_packages.extend(packages)
-            logger.info(f"Collected {len(packages)} packages from {pm_name}")
-        except Exception as e:
-            logger.warning(f"Failed to collect packages from {pm_name}: {e}")
+    # Collect from each package manager that is installed
+    collectors = list(_available_collectors())
+    if not collectors:
+        logger.warning("No supported package managers found")
+        return []
+    
+    # Collectors mostly wait on package manager subprocesses, so run them
+    # concurrently; results are still gathered in collector order
+    with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+        futures = [(pm_name, executor.submit(collector)) for pm_name, collector in collectors]
+        for pm_name, future in futures:
+            try:
+                packages = future.result()
+                all_packages.extend(packages)
+                logger.info(f"Collected {len(packages)} packages from {pm_name}")
+            except Exception as e:
+                logger.warning(f"Failed to collect packages from {pm_name}: {e}")
     
     # Filter and deduplicate
-    filtered_packages = filter_packages(all_packages)
-    deduplicated_packages = deduplicate_packages(filtered_packages)
+    normalized_packages = _normalize_pipeline(all_packages)
+    
+    logger.info(f"Normalized {len(normalized_packages)} unique packages")
+    return normalized_packages
+
+
+def _available_collectors() -> Iterator[Tuple[str, Callable[[], List[NormalizedItem]]]]:
+    """Yield the collectors of the package managers found on PATH.
+    
+    Returns:
+        Iterator of (package manager name, collector) tuples
+    """
+    for pm_name, command, module_name, function_name in _COLLECTORS:
+        if shutil.which(command) is None:
+            logger.debug(f"Skipping {pm_name}: {command} not found")
+            continue
+        module = importlib.import_module(f".collect.{module_name}", __package__)
+        yield pm_name, getattr(module, function_name)
+
+def _normalize_pipeline(packages: List[NormalizedItem]) -> List[NormalizedItem]:
+    """Filter and deduplicate packages in a single pass.
+    
+    Equivalent to deduplicate_packages(filter_packages(packages)) without
+    the intermediate list.
+    
+    Args:
+        packages: List of normalized packages
+        
+    Returns:
+        Filtered, deduplicated list of packages
+    """
+    index: Dict[Tuple[PackageManager, str], int] = {}
+    normalized = []
+    
+    for package in packages:
+        # Lowercase each name once for both the filter and the key
+        lname = package.lower_name
+        if not should_include_package(package, lname):
+            continue
+        
+        key = (package.source_pm, lname)
+        position = index.get(key)
+        if position is None:
+            index[key] = len(normalized)
+            normalized.append(package)
+        elif len(package.meta) > len(normalized[position].meta):
+            # If we have a duplicate, prefer the one with more metadata
+            normalized[position] = package
     
-    logger.info(f"Normalized {len(deduplicated_packages)} unique packages")
-    return deduplicated_packages
+    return normalized
 
 
 def filter_packages(packages: List[NormalizedItem]) -> List[NormalizedItem]:
@@ -65,61 +228,28 @@ def filter_packages(packages: List[NormalizedItem]) -> List[NormalizedItem]:
     return filtered
 
 
-def should_include_package(package: NormalizedItem) -> bool:
+def should_include_package(package: NormalizedItem, lname: Optional[str] = None) -> bool:
     """Determine if a package should be included in migration.
     
     Args:
         package: Normalized package item
+        lname: Lowercased package name, if the caller already has it
         
     Returns:
         True if package should be included
     """
-    name = package.source_name.lower()
-    
-    # Skip system packages
-    system_packages = {
-        # APT system packages
-        "apt", "dpkg", "base-files", "base-passwd", "bash", "coreutils",
-        "dash", "debianutils", "diffutils", "findutils", "grep", "gzip",
-        "hostname", "init-system-helpers", "libc-bin", "libpam-modules",
-        "libpam-runtime", "login", "mount", "passwd", "perl-base",
-        "sed", "sysvinit-utils", "tar", "util-linux", "zlib1g",
-        "ubuntu-minimal", "ubuntu-standard", "ubuntu-server",
-        
-        # Python system packages
-        "pip", "setuptools", "wheel", "distlib", "filelock", "platformdirs",
-        "six", "pyparsing", "packaging", "markupsafe", "jinja2", "itsdangerous",
-        "click", "blinker", "werkzeug", "urllib3", "requests", "certifi",
-        "charset-normalizer", "idna", "python-dateutil", "pytz",
-        
-        # Node.js system packages
-        "npm", "node", "npx", "corepack", "yarn", "pnpm",
-        
-        # Rust system packages
-        "cargo", "rustc", "rustup", "rustfmt", "clippy",
-        
-        # Ruby system packages
-        "bundler", "rake", "rdoc", "json", "minitest", "test-unit",
-        "bigdecimal", "io-console", "psych", "stringio", "strscan",
-    }
-    
-    if name in system_packages:
-        return False
+    name = lname if lname is not None else package.lower_name
     
     # Skip library packages (usually start with lib)
     if name.startswith("lib"):
         return False
     
-    # Skip development packages (usually end with -dev)
-    if name.endswith("-dev"):
-        return False
-    
-    # Skip debug packages (usually end with -dbg)
-    if name.endswith("-dbg"):
+    # Skip development, debug and documentation packages
+    if name.endswith(_EXCLUDED_SUFFIXES):
         return False
     
-    # Skip documentation packages (usually end with -doc)
-    if name.endswith("-doc"):
+    # Skip system packages
+    if name in _SYSTEM_PACKAGES:
         return False
     
     return True
@@ -134,102 +264,39 @@ def deduplicate_packages(packages: List[NormalizedItem]) -> List[NormalizedItem]
     Returns:
         Deduplicated list of packages
     """
-    seen = set()
+    # Position of each key's package in the output, so duplicates are
+    # resolved without scanning it
+    index: Dict[Tuple[PackageManager, str], int] = {}
     deduplicated = []
     
     for package in packages:
         # Create a unique key based on package manager and name
-        key = (package.source_pm, package.source_name.lower())
+        key = (package.source_pm, package.lower_name)
         
-        if key not in seen:
-            seen.add(key)
+        position = index.get(key)
+        if position is None:
+            index[key] = len(deduplicated)
             deduplicated.append(package)
-        else:
+        elif len(package.meta) > len(deduplicated[position].meta):
             # If we have a duplicate, prefer the one with more metadata
-            existing_idx = next(i for i, p in enumerate(deduplicated) 
-                              if (p.source_pm, p.source_name.lower()) == key)
-            existing = deduplicated[existing_idx]
-            
-            # Replace if current package has more metadata
-            if len(package.meta) > len(existing.meta):
-                deduplicated[existing_idx] = package
+            deduplicated[position] = package
     
     return deduplicated
 
 
-def categorize_package(package: NormalizedItem) -> str:
+def categorize_package(package: NormalizedItem, lname: Optional[str] = None) -> str:
     """Categorize a package based on its name and metadata.
     
     Args:
         package: Normalized package item
+        lname: Lowercased package name, if the caller already has it
         
     Returns:
         Package category
     """
-    name = package.source_name.lower()
-    
-    # Development tools
-    dev_tools = {
-        "git", "vim", "neovim", "tmux", "htop", "tree", "cmake", "make",
-        "autoconf", "automake", "pkg-config", "gcc", "g++", "clang",
-        "lldb", "gdb", "valgrind", "strace", "ltrace",
-    }
-    
-    # Utilities
-    utilities = {
-        "curl", "wget", "jq", "ripgrep", "fd", "bat", "eza", "fzf",
-        "unzip", "zip", "tar", "gzip", "bzip2", "xz", "zstd",
-        "rsync", "ncdu", "httpie", "nmap", "watch", "parallel",
-    }
-    
-    # Languages and runtimes
-    languages = {
-        "python", "python3", "node", "nodejs", "go", "rust", "ruby",
-        "java", "kotlin", "scala", "clojure", "haskell", "ocaml",
-        "erlang", "elixir", "crystal", "nim", "zig", "v",
-    }
-    
-    # Build tools
-    build_tools = {
-        "maven", "gradle", "sbt", "cargo", "npm", "yarn", "pnpm",
-        "pip", "poetry", "pipenv", "conda", "mamba",
-    }
-    
-    # Databases
-    databases = {
-        "postgresql", "mysql", "sqlite", "redis", "mongodb", "cassandra",
-        "elasticsearch", "influxdb", "timescaledb", "cockroachdb",
-    }
-    
-    # Containers and orchestration
-    containers = {
-        "docker", "kubernetes", "helm", "kubectl", "minikube", "kind",
-        "docker-compose", "podman", "buildah", "skopeo",
-    }
-    
-    # Cloud tools
-    cloud_tools = {
-        "awscli", "terraform", "gcloud", "az", "doctl", "kubectl",
-        "helm", "istioctl", "linkerd", "consul", "vault",
-    }
-    
-    # Check categories
-    if name in dev_tools:
-        return "development"
-    elif name in utilities:
-        return "utilities"
-    elif name in languages:
-        return "languages"
-    elif name in build_tools:
-        return "build_tools"
-    elif name in databases:
-        return "databases"
-    elif name in containers:
-        return "containers"
-    elif name in cloud_tools:
-        return "cloud"
-    else:
-        return "other"
+    name = lname if lname is not None else package.lower_name
+    
+    return _NAME_TO_CATEGORY.get(name, "other")
 
 
 def enrich_package_metadata(package: NormalizedItem) -> NormalizedItem:
@@ -241,67 +308,63 @@ def enrich_package_metadata(package: NormalizedItem) -> NormalizedItem:
     Returns:
         Enriched package item
     """
-    # Add category if not present
-    if not package.category:
-        package.category = categorize_package(package)
-    
-    # Add additional metadata
-    meta = package.meta.copy()
+    # Add category if not present; items are frozen, so it goes on the copy
+    category = package.category or categorize_package(package)
     
     # Add package manager specific metadata
-    if package.source_pm == PackageManager.APT:
-        meta["package_type"] = "system"
-    elif package.source_pm == PackageManager.PIP:
-        meta["package_type"] = "python"
-    elif package.source_pm == PackageManager.NPM:
-        meta["package_type"] = "nodejs"
-    elif package.source_pm == PackageManager.CARGO:
-        meta["package_type"] = "rust"
-    elif package.source_pm == PackageManager.GEM:
-        meta["package_type"] = "ruby"
-    
-    # Create new package with enriched metadata
-    return NormalizedItem(
+    meta = {**package.meta, "package_type": _PM_TO_TYPE[package.source_pm]}
+    
+    # Create new package with enriched metadata; every field comes from an
+    # already validated item, so validation is skipped
+    return NormalizedItem.model_construct(
         source_pm=package.source_pm,
         source_name=package.source_name,
         version=package.version,
-        category=package.category,
+        category=category,
         meta=meta
     )
 
 
-def get_package_statistics(packages: List[NormalizedItem]) -> Dict[str, Any]:
+@dataclass(slots=True, frozen=True)
+class PackageStats:
+    """Statistics about collected packages."""
+    total: int
+    by_package_manager: Dict[str, int]
+    by_category: Dict[str, int]
+    with_versions: int
+    without_versions: int
+    
+    def __getitem__(self, key: str) -> Any:
+        """Backwards-compat access for callers expecting the old dictionary."""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+
+def get_package_statistics(packages: List[NormalizedItem]) -> PackageStats:
     """Get statistics about the collected packages.
     
     Args:
         packages: List of normalized packages
         
     Returns:
-        Dictionary with package statistics
+        Package statistics
     """
-    stats = {
-        "total": len(packages),
-        "by_package_manager": {},
-        "by_category": {},
-        "with_versions": 0,
-        "without_versions": 0,
-    }
-    
-    # Count by package manager
-    for package in packages:
-        pm = package.source_pm.value
-        stats["by_package_manager"][pm] = stats["by_package_manager"].get(pm, 0) + 1
+    by_pm: Counter = Counter()
+    by_category: Counter = Counter()
+    with_versions = 0
     
-    # Count by category
-    for package in packages:
-        category = package.category or "unknown"
-        stats["by_category"][category] = stats["by_category"].get(category, 0) + 1
-    
-    # Count version information
+    # Count package managers, categories and versions in one pass
     for package in packages:
+        by_pm[package.source_pm.value] += 1
+        by_category[package.category or "unknown"] += 1
         if package.version:
-            stats["with_versions"] += 1
-        else:
-            stats["without_versions"] += 1
-    
-    return stats
+            with_versions += 1
+    
+    return PackageStats(
+        total=len(packages),
+        by_package_manager=dict(by_pm),
+        by_category=dict(by_category),
+        with_versions=with_versions,
+        without_versions=len(packages) - with_versions,
+    )
@@ -2,7 +2,7 @@
 
 from enum import Enum
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 from pydantic import ConfigDict
 
 
@@ -39,12 +39,28 @@ class NormalizedItem(BaseModel):
     category: Optional[str] = Field(None, description="Package category/type")
     meta: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
-    # Allow population by field name or alias
-    model_config = ConfigDict(populate_by_name=True)
+    # Allow population by field name or alias; items never change once
+    # collected, so they are frozen
+    model_config = ConfigDict(frozen=True, populate_by_name=True, extra="ignore")
+
+    # Lowercased source_name, computed once per item. It is set at creation,
+    # not on first use, so equal items always compare equal.
+    _lower_name: str = PrivateAttr(default="")
+
+    def model_post_init(self, __context: Any) -> None:
+        self._lower_name = self.source_name.lower()
+
+    @property
+    def lower_name(self) -> str:
+        """Lowercased package name, shared by filtering, deduplication and categorization."""
+        return self._lower_name
 
 
 class Candidate(BaseModel):
     """Candidate mapping to target package manager."""
+    # Candidates are shared between results for duplicate package names
+    model_config = ConfigDict(frozen=True)
+    
     target_pm: str = Field(..., description="Target package manager (e.g., 'brew', 'cask')")
     target_name: str = Field(..., description="Target package name")
     kind: Optional[str] = Field(None, description="Package kind/type")
@@ -64,6 +80,8 @@ class Candidate(BaseModel):
 
 class MappingResult(BaseModel):
     """Result of mapping a normalized item."""
+    model_config = ConfigDict(frozen=True)
+    
     source: NormalizedItem = Field(..., description="Original normalized item")
     candidate: Optional[Candidate] = Field(None, description="Best candidate mapping")
     decision: Decision = Field(..., description="Final decision")
@@ -3,6 +3,8 @@
 from .brew import (
     exists_in_brew,
     exists_in_cask,
+    clear_brew_cache,
+    find_existing_packages,
     validate_brew_candidates,
     get_brew_info,
     search_brew,
@@ -10,11 +12,15 @@ from .brew import (
     get_homebrew_version,
     get_installed_brew_packages,
     get_installed_cask_packages,
+    homebrew_index_mtime,
+    refresh_installed,
 )
 
 __all__ = [
     "exists_in_brew",
     "exists_in_cask", 
+    "clear_brew_cache",
+    "find_existing_packages",
     "validate_brew_candidates",
     "get_brew_info",
     "search_brew",
@@ -22,4 +28,6 @@ __all__ = [
     "get_homebrew_version",
     "get_installed_brew_packages",
     "get_installed_cask_packages",
+    "homebrew_index_mtime",
+    "refresh_installed",
 ]
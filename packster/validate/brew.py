@@ -1,13 +1,185 @@
 """Homebrew validation utilities for Packster."""
 
+import json
 import logging
+import os
 import re
-from typing import List, Optional
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
 from .. import detect
+from ..config import FORMULAE_API_URLS, FORMULAE_INDEX_PATH
+from ..types import Candidate
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent brew subprocesses during candidate validation
+_MAX_VALIDATE_WORKERS = 16
+
+# stderr of `brew info` for names Homebrew definitely does not know
+_NOT_FOUND_ERRORS = ("No available formula", "No available cask", "No Cask with this name")
+
+# Applies to connecting and to each read, so an unreachable formulae.brew.sh
+# costs a few seconds rather than stalling validation
+_FORMULAE_API_TIMEOUT = 5  # seconds
+_FORMULAE_INDEX_LOCK = threading.Lock()
+
+# Files `brew update` rewrites when formula or cask definitions change: the
+# API downloads in Homebrew's cache, or the fetch marker of a cloned tap
+_HOMEBREW_INDEX_FILES = tuple(
+    os.path.expanduser(path)
+    for path in (
+        "~/Library/Caches/Homebrew/api/formula.jws.json",
+        "~/Library/Caches/Homebrew/api/cask.jws.json",
+        "~/.cache/Homebrew/api/formula.jws.json",
+        "~/.cache/Homebrew/api/cask.jws.json",
+        *(
+            f"{repository}/Library/Taps/homebrew/{tap}/.git/FETCH_HEAD"
+            for repository in ("/opt/homebrew", "/usr/local/Homebrew", "/home/linuxbrew/.linuxbrew/Homebrew")
+            for tap in ("homebrew-core", "homebrew-cask")
+        ),
+    )
+)
+
+
+def homebrew_index_mtime() -> float:
+    """Get the time Homebrew last updated its formula and cask definitions.
+    
+    Only stats a few well-known files, so it is cheap enough to call before
+    trusting any persisted validation result.
+    
+    Returns:
+        Newest modification time as a Unix timestamp, or 0.0 if unknown
+    """
+    newest = 0.0
+    for path in _HOMEBREW_INDEX_FILES:
+        try:
+            newest = max(newest, os.stat(path).st_mtime)
+        except OSError:
+            continue
+    return newest
+
+
+def _index_names(items: List[Dict[str, Any]]) -> Set[str]:
+    """Collect names, aliases and old names from a formulae.brew.sh index."""
+    names: Set[str] = set()
+    for item in items:
+        for key in ("name", "full_name", "token", "full_token"):
+            if isinstance(item.get(key), str):
+                names.add(item[key])
+        for key in ("aliases", "oldnames", "old_tokens"):
+            names.update(name for name in item.get(key) or () if isinstance(name, str))
+    return names
+
+
+@lru_cache(maxsize=1)
+def _load_remote_formula_index() -> Dict[str, FrozenSet[str]]:
+    """Download the formula and cask indexes, revalidating the disk cache.
+    
+    The result is memoized, failures included, so a run that cannot reach
+    formulae.brew.sh tries once and then uses whatever the disk cache holds.
+    """
+    try:
+        with open(FORMULAE_INDEX_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    if not isinstance(cached, dict):
+        cached = {}
+
+    index: Dict[str, FrozenSet[str]] = {}
+    changed = False
+    unreachable = False
+    for kind, url in FORMULAE_API_URLS.items():
+        entry = cached.get(kind)
+        if not isinstance(entry, dict):
+            entry = {}
+
+        if unreachable:
+            # Don't wait out another timeout for the next URL
+            if entry.get("names"):
+                index[kind] = frozenset(entry["names"])
+            continue
+
+        request = urllib.request.Request(url, headers={"User-Agent": "packster"})
+        if entry.get("etag") and entry.get("names"):
+            request.add_header("If-None-Match", entry["etag"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=_FORMULAE_API_TIMEOUT) as response:
+                names = _index_names(json.loads(response.read()))
+            entry = {"etag": response.headers.get("ETag"), "names": sorted(names)}
+            cached[kind] = entry
+            changed = True
+        except urllib.error.HTTPError as e:
+            # 304 Not Modified: the cached names are still current
+            if e.code != 304:
+                logger.debug(f"Could not fetch Homebrew {kind} index: {e}")
+        except OSError as e:
+            logger.debug(f"Could not fetch Homebrew {kind} index: {e}")
+            unreachable = True
+        except ValueError as e:
+            logger.debug(f"Could not fetch Homebrew {kind} index: {e}")
+
+        if entry.get("names"):
+            index[kind] = frozenset(entry["names"])
+
+    if changed:
+        try:
+            FORMULAE_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(FORMULAE_INDEX_PATH, "w", encoding="utf-8") as f:
+                json.dump(cached, f)
+        except OSError as e:
+            logger.debug(f"Could not write Homebrew index cache {FORMULAE_INDEX_PATH}: {e}")
 
+    return index
+
+
+def _remote_formula_index() -> Dict[str, FrozenSet[str]]:
+    """Get formula and cask names published on formulae.brew.sh.
+    
+    The indexes are downloaded at most once per process and cached on disk
+    with their ETags, so later runs only re-download them when Homebrew has
+    published a change. Callers consult the installed packages first, so the
+    download only happens for names that are not installed. Setting
+    PACKSTER_OFFLINE disables the lookup.
+    
+    Returns:
+        Names, aliases and old names keyed by "brew" and "cask"; kinds that
+        could not be loaded are missing
+    """
+    if os.environ.get("PACKSTER_OFFLINE"):
+        return {}
+    # Validation threads would otherwise all download the index at once
+    with _FORMULAE_INDEX_LOCK:
+        return _load_remote_formula_index()
+
+
+@lru_cache(maxsize=1)
+def _installed_brew_set() -> FrozenSet[str]:
+    """Get the locally installed formulae, listed once per process."""
+    return frozenset(get_installed_brew_packages())
+
+
+@lru_cache(maxsize=1)
+def _installed_cask_set() -> FrozenSet[str]:
+    """Get the locally installed casks, listed once per process."""
+    return frozenset(get_installed_cask_packages())
+
+
+def refresh_installed() -> None:
+    """Forget the cached installed formulae and casks, e.g. after installs."""
+    _installed_brew_set.cache_clear()
+    _installed_cask_set.cache_clear()
+    get_installed_brew_packages.cache_clear()
+    get_installed_cask_packages.cache_clear()
+
+
+@lru_cache(maxsize=4096)
 def exists_in_brew(package_name: str) -> bool:
     """Check if a package exists in Homebrew.
     
@@ -18,6 +190,14 @@ def exists_in_brew(package_name: str) -> bool:
         True if package exists in Homebrew, False otherwise
     """
     try:
+        # Installed formulae need no brew subprocess; one `brew list` covers them all
+        if package_name in _installed_brew_set():
+            return True
+        
+        # Neither do names in the published Homebrew index
+        if package_name in _remote_formula_index().get("brew", ()):
+            return True
+        
         # Try brew info first (tests expect this exact call)
         command = ["brew", "info", package_name]
         exit_code, stdout, stderr = detect.run_command_safe(command)
@@ -25,25 +205,24 @@ def exists_in_brew(package_name: str) -> bool:
         if exit_code == 0:
             return True
         
-        # If brew info fails, try brew search
-        command = ["brew", "search", package_name]
-        exit_code, stdout, stderr = detect.run_command_safe(command)
+        # A definite "not found" needs no second probe; negatives are the
+        # common case since most source packages are not in Homebrew
+        if any(error in stderr for error in _NOT_FOUND_ERRORS):
+            return False
         
-        if exit_code == 0 and stdout:
-            # Check for exact match in search results
-            lines = stdout.splitlines()
-            for line in lines:
-                line = line.strip()
-                if line == package_name:
-                    return True
+        # The human-readable form also fetches analytics and can fail on
+        # that alone; the JSON form skips it and lists only real matches
+        command = ["brew", "info", "--json=v2", "--formula", package_name]
+        exit_code, stdout, stderr = detect.run_command_safe(command)
         
-        return False
+        return exit_code == 0 and bool(json.loads(stdout).get("formulae"))
         
     except Exception as e:
         logger.debug(f"Error checking brew package {package_name}: {e}")
         return False
 
 
+@lru_cache(maxsize=4096)
 def exists_in_cask(package_name: str) -> bool:
     """Check if a package exists in Homebrew Cask.
     
@@ -54,6 +233,14 @@ def exists_in_cask(package_name: str) -> bool:
         True if package exists in Homebrew Cask, False otherwise
     """
     try:
+        # Installed casks need no brew subprocess; one `brew list --cask` covers them all
+        if package_name in _installed_cask_set():
+            return True
+        
+        # Neither do names in the published Homebrew index
+        if package_name in _remote_formula_index().get("cask", ()):
+            return True
+        
         # Try brew info --cask first
         command = ["brew", "info", "--cask", package_name]
         exit_code, stdout, stderr = detect.run_command_safe(command)
@@ -61,26 +248,91 @@ def exists_in_cask(package_name: str) -> bool:
         if exit_code == 0:
             return True
         
-        # If brew info --cask fails, try brew search --cask
-        command = ["brew", "search", "--cask", package_name]
-        exit_code, stdout, stderr = detect.run_command_safe(command)
+        # A definite "not found" needs no second probe; negatives are the
+        # common case since most source packages are not in Homebrew
+        if any(error in stderr for error in _NOT_FOUND_ERRORS):
+            return False
         
-        if exit_code == 0 and stdout:
-            # Check for exact match in search results
-            lines = stdout.splitlines()
-            for line in lines:
-                line = line.strip()
-                if line == package_name:
-                    return True
+        # The human-readable form also fetches analytics and can fail on
+        # that alone; the JSON form skips it and lists only real matches
+        command = ["brew", "info", "--json=v2", "--cask", package_name]
+        exit_code, stdout, stderr = detect.run_command_safe(command)
         
-        return False
+        return exit_code == 0 and bool(json.loads(stdout).get("casks"))
         
     except Exception as e:
         logger.debug(f"Error checking brew cask {package_name}: {e}")
         return False
 
 
-from ..types import Candidate
+# Version line of `brew --version`, for outputs that do not start with it
+_VERSION_RE = re.compile(r"^Homebrew (\d+\.\d+\.\d+)", re.MULTILINE)
+
+# Non-blank `brew search` lines that are not "==> Formulae" style headers
+_SEARCH_RESULT_RE = re.compile(r"^[ \t]*(?!==)(\S.*?)[ \t\r]*$", re.MULTILINE)
+
+# Names brew reports as unknown, in either quote style:
+#   Error: No available formula with the name "foo".
+#   Error: Cask 'foo' is unavailable: No Cask with this name exists.
+_MISSING_NAME_RE = re.compile(
+    r"""No (?:available|cask|formula)[^"'\n]*["']([^"'\n]+)["']"""
+    r"""|Cask ["']([^"'\n]+)["'] is unavailable"""
+)
+
+
+def find_existing_packages(package_names: Iterable[str], cask: bool = False) -> Optional[Set[str]]:
+    """Check many Homebrew package names with one ``brew info --json=v2`` call.
+    
+    brew only succeeds when every name resolves (aliases and old names
+    included), so unknown names reported on stderr are dropped and the
+    remaining names are queried again until brew succeeds. JSON output
+    avoids the analytics lookups of the human-readable format.
+    
+    Args:
+        package_names: Names of the packages to check
+        cask: Whether to check casks instead of formulae
+        
+    Returns:
+        The subset of names that exist, or None if brew could not answer
+    """
+    remaining = sorted(set(package_names))
+    
+    # Every retry drops at least one name, so this ends after len(remaining) retries
+    for _ in range(len(remaining) + 1):
+        if not remaining:
+            return set()
+        
+        command = ["brew", "info", "--json=v2", "--cask" if cask else "--formula", *remaining]
+        exit_code, stdout, stderr = detect.run_command_safe(command, timeout=120)
+        
+        if exit_code == 0:
+            # brew only succeeds when every requested name resolved
+            return set(remaining)
+        
+        missing = {quoted or cask_name for quoted, cask_name in _MISSING_NAME_RE.findall(stderr)}
+        found = [name for name in remaining if name not in missing]
+        if len(found) == len(remaining):
+            # Nothing we asked for was reported missing; brew failed otherwise
+            return None
+        remaining = found
+    
+    return None
+
+
+def _exists(target: Tuple[str, str]) -> bool:
+    """Check a single (target_pm, name) pair with its own brew call."""
+    target_pm, name = target
+    return exists_in_cask(name) if target_pm == "cask" else exists_in_brew(name)
+
+
+def _validate_one(cand: Candidate, known: Set[str]) -> Candidate:
+    """Validate a single candidate, halving its confidence if it does not exist."""
+    if cand.target_name in known or cand.confidence is None:
+        # Candidates are immutable, so unchanged ones are passed through as is
+        return cand
+
+    # If not valid, reduce confidence by half
+    return cand.model_copy(update={"confidence": max(0.0, cand.confidence * 0.5)})
 
 
 def validate_brew_candidates(candidates: List[Candidate]) -> List[Candidate]:
@@ -92,71 +344,96 @@ def validate_brew_candidates(candidates: List[Candidate]) -> List[Candidate]:
     Returns:
         List of (package_manager, package_name, is_valid) tuples
     """
-    validated: List[Candidate] = []
-
+    # Check every brew and cask name with one brew call per kind up front;
+    # names brew could not answer for are checked one by one below
+    names_by_pm: Dict[str, Set[str]] = {"brew": set(), "cask": set()}
     for cand in candidates:
-        is_valid = False
-        if cand.target_pm == "brew":
-            is_valid = exists_in_brew(cand.target_name)
-        elif cand.target_pm == "cask":
-            is_valid = exists_in_cask(cand.target_name)
-        else:
-            is_valid = True
-
-        # If not valid, reduce confidence by half
-        if not is_valid and cand.confidence is not None:
-            new_conf = max(0.0, cand.confidence * 0.5)
-        else:
-            new_conf = cand.confidence
-
-        validated.append(Candidate(
-            target_pm=cand.target_pm,
-            target_name=cand.target_name,
-            confidence=new_conf,
-            reason=cand.reason,
-            kind=cand.kind,
-            post_install=cand.post_install,
-        ))
-
-    return validated
-
-
-def get_brew_info(package_name: str, cask: bool = False) -> Optional[dict]:
+        if cand.target_pm in names_by_pm:
+            names_by_pm[cand.target_pm].add(cand.target_name)
+
+    existing: Dict[str, Set[str]] = {}
+    pending: List[Tuple[str, str]] = []
+    for target_pm, names in names_by_pm.items():
+        if not names:
+            continue
+        found = find_existing_packages(names, cask=target_pm == "cask")
+        if found is None:
+            pending.extend((target_pm, name) for name in sorted(names))
+            found = set()
+        existing[target_pm] = found
+
+    # Each remaining check blocks on a brew subprocess, so run them on a
+    # thread pool; duplicate candidates share a single check
+    if len(pending) > 1:
+        workers = min(len(pending), _MAX_VALIDATE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_exists, pending))
+    else:
+        results = [_exists(target) for target in pending]
+
+    for (target_pm, name), found in zip(pending, results, strict=True):
+        if found:
+            existing[target_pm].add(name)
+
+    # Candidates for other package managers pass through untouched
+    return [
+        _validate_one(cand, existing[cand.target_pm]) if cand.target_pm in existing else cand
+        for cand in candidates
+    ]
+
+
+@lru_cache(maxsize=4096)
+def get_brew_info(package_name: str, cask: bool = False) -> Optional[Mapping[str, Any]]:
     """Get detailed information about a Homebrew package.
     
+    Uses the JSON output of ``brew info``, so fields such as ``versions``,
+    ``dependencies`` and ``installed`` need no further parsing. Results are
+    cached per process, so the returned mapping is read-only.
+    
     Args:
         package_name: Name of the package
-        is_cask: Whether this is a cask package
+        cask: Whether this is a cask package
         
     Returns:
-        Dictionary with package information or None
+        Read-only formula or cask entry, or None if it does not exist
     """
     try:
-        # Tests expect: ["brew", "info", package] for formula, and ["brew", "info", "--cask", package]
-        command = ["brew", "info"] + (["--cask", package_name] if cask else [package_name])
+        command = ["brew", "info", "--json=v2", "--cask" if cask else "--formula", package_name]
         exit_code, stdout, stderr = detect.run_command_safe(command)
         
         if exit_code != 0:
             return None
         
-        # For tests, return a simple dictionary containing the raw text
-        text = stdout.strip()
-        return {package_name: text} if text else None
+        entries = json.loads(stdout).get("casks" if cask else "formulae")
+        return MappingProxyType(entries[0]) if entries else None
         
     except Exception as e:
         logger.debug(f"Error getting brew info for {package_name}: {e}")
         return None
 
 
-def search_brew(query: str) -> List[str]:
+def clear_brew_cache() -> None:
+    """Forget cached Homebrew lookups, e.g. after installing or tapping."""
+    exists_in_brew.cache_clear()
+    exists_in_cask.cache_clear()
+    get_brew_info.cache_clear()
+    _load_remote_formula_index.cache_clear()
+    search_brew.cache_clear()
+    is_homebrew_available.cache_clear()
+    refresh_installed()
+
+
+@lru_cache(maxsize=256)
+def search_brew(query: str) -> Tuple[str, ...]:
     """Search for Homebrew packages.
     
+    Results are cached per process, so they are returned as a tuple.
+    
     Args:
         query: Search query
-        is_cask: Whether to search casks
         
     Returns:
-        List of matching package names
+        Matching package names
     """
     try:
         # Tests expect: ["brew", "search", query]
@@ -164,59 +441,56 @@ def search_brew(query: str) -> List[str]:
         exit_code, stdout, stderr = detect.run_command_safe(command)
         
         if exit_code != 0 or not stdout:
-            return []
-        
-        packages = []
-        for line in stdout.splitlines():
-            line = line.strip()
-            if line and not line.startswith("=="):
-                packages.append(line)
+            return ()
         
-        return packages
+        return tuple(_SEARCH_RESULT_RE.findall(stdout))
         
     except Exception as e:
         logger.debug(f"Error searching brew packages for '{query}': {e}")
-        return []
+        return ()
 
 
-def get_installed_brew_packages() -> List[str]:
-    """Get list of installed Homebrew packages.
+@lru_cache(maxsize=1)
+def get_installed_brew_packages() -> Tuple[str, ...]:
+    """Get installed Homebrew formulae, listed once per process.
     
     Returns:
-        Dictionary with 'formulas' and 'casks' lists
+        Names of the installed formulae
     """
     # Tests expect a flat list of installed formulas via `brew list`
-    result: List[str] = []
-    
     try:
         # Get installed packages (formulas only)
         command = ["brew", "list"]
         exit_code, stdout, stderr = detect.run_command_safe(command)
         
         if exit_code == 0 and stdout:
-            result = [line.strip() for line in stdout.splitlines() if line.strip()]
+            return tuple(filter(None, map(str.strip, stdout.splitlines())))
         
     except Exception as e:
         logger.debug(f"Error getting installed brew packages: {e}")
     
-    return result
+    return ()
 
 
-def get_installed_cask_packages() -> List[str]:
-    """Get list of installed Homebrew casks."""
+@lru_cache(maxsize=1)
+def get_installed_cask_packages() -> Tuple[str, ...]:
+    """Get installed Homebrew casks, listed once per process."""
     try:
         command = ["brew", "list", "--cask"]
         exit_code, stdout, stderr = detect.run_command_safe(command)
         if exit_code == 0 and stdout:
-            return [line.strip() for line in stdout.splitlines() if line.strip()]
-        return []
+            return tuple(filter(None, map(str.strip, stdout.splitlines())))
+        return ()
     except Exception:
-        return []
+        return ()
 
 
+@lru_cache(maxsize=1)
 def is_homebrew_available() -> bool:
     """Check if Homebrew is available on the system.
     
+    The PATH lookup is done once per process; clear_brew_cache() resets it.
+    
     Returns:
         True if Homebrew is available, False otherwise
     """
@@ -234,8 +508,14 @@ def get_homebrew_version() -> Optional[str]:
         exit_code, stdout, stderr = detect.run_command_safe(command)
         
         if exit_code == 0 and stdout:
-            # Extract version from output like "Homebrew 4.1.0"
-            match = re.search(r"Homebrew (\d+\.\d+\.\d+)", stdout)
+            # Output starts with a fixed line like "Homebrew 4.1.0" (dev
+            # builds append a suffix, e.g. "Homebrew 4.1.0-23-gabc123")
+            first = stdout.split("\n", 1)[0].strip()
+            if first.startswith("Homebrew "):
+                return first[len("Homebrew "):].split("-", 1)[0] or None
+            
+            # Fall back to searching the rest, e.g. after shell profile noise
+            match = _VERSION_RE.search(stdout)
             if match:
                 return match.group(1)
         
@@ -3,7 +3,8 @@
 import pytest
 import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from packster.validate import clear_brew_cache
 from packster.types import (
     NormalizedItem,
     PackageManager,
@@ -13,14 +14,268 @@ from packster.types import (
 )
 
 
-@pytest.fixture
-def temp_dir():
-    """Provide a temporary directory for tests."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield Path(temp_dir)
+_APT_PACKAGES = (
+    "git",
+    "vim",
+    "curl",
+    "wget",
+    "htop",
+    "tree",
+    "tmux",
+    "zsh",
+    "docker.io",
+    "nodejs",
+)
+
+_PIP_PACKAGES = (
+    "requests==2.28.1",
+    "click==8.1.3",
+    "rich==13.0.0",
+    "pydantic==2.0.0",
+    "pyyaml==6.0",
+    "jinja2==3.1.0",
+)
+
+_NPM_PACKAGES = (
+    "typescript@4.9.4",
+    "eslint@8.31.0",
+    "prettier@2.8.0",
+    "jest@29.3.1",
+    "webpack@5.75.0",
+)
+
+_CARGO_PACKAGES = (
+    "fd 8.4.0:",
+    "ripgrep 13.0.0:",
+    "bat 0.20.0:",
+    "eza 0.9.0:",
+    "fzf 0.35.1:",
+)
+
+_GEM_PACKAGES = (
+    "bundler (2.4.9)",
+    "rails (7.0.4.2)",
+    "jekyll (4.3.0)",
+    "cocoapods (1.12.0)",
+    "fastlane (2.210.0)",
+)
+
+_BREW_INFO = """git: stable 2.39.2
+Git is a distributed version control system
+https://git-scm.com/
+/usr/local/Cellar/git/2.39.2 (1,525 files, 47.5MB) *
+  Poured from bottle on 2023-01-15 at 10:30:00
+From: https://github.com/Homebrew/homebrew-core/blob/HEAD/Formula/g/git.rb
+License: GPL-2.0-only
+==> Dependencies
+Build: pkg-config ✘
+Required: gettext ✘, libiconv ✘, openssl@1.1 ✘, pcre2 ✘, zlib ✘
+==> Analytics
+install: 1,234,567 (30 days), 3,456,789 (90 days), 9,876,543 (365 days)
+install-on-request: 1,234,567 (30 days), 3,456,789 (90 days), 9,876,543 (365 days)
+build-error: 0 (30 days)"""
+
+_CASK_INFO = """visual-studio-code: 1.85.1
+Visual Studio Code is a code editor
+https://code.visualstudio.com/
+/usr/local/Caskroom/visual-studio-code/1.85.1/Visual Studio Code.app (1,234 files, 567.8MB)
+From: https://github.com/Homebrew/homebrew-cask/blob/HEAD/Casks/visual-studio-code.rb
+==> Name
+Visual Studio Code
+==> Description
+Code editor
+==> Artifacts
+Visual Studio Code.app (App)
+==> Analytics
+install: 12,345 (30 days), 34,567 (90 days), 98,765 (365 days)
+install-on-request: 12,345 (30 days), 34,567 (90 days), 98,765 (365 days)
+build-error: 0 (30 days)"""
+
+_BREW_SEARCH_RESULTS = """git
+git-crypt
+git-extras
+git-flow
+git-lfs
+git-secrets
+git-town
+git-utils"""
+
+_INSTALLED_BREW_PACKAGES = """git
+vim
+curl
+wget
+htop
+tree
+tmux
+zsh"""
+
+_INSTALLED_CASK_PACKAGES = """visual-studio-code
+slack
+discord
+spotify
+vlc"""
+
+_BREWFILE_CONTENT = """# Homebrew taps
+tap "homebrew/core"
+tap "homebrew/cask"
+tap "homebrew/cask-fonts"
+
+# Homebrew packages
+brew "git"
+brew "vim"
+brew "curl"
+brew "wget"
+brew "htop"
+brew "tree"
+brew "tmux"
+brew "zsh"
+
+# Homebrew casks
+cask "visual-studio-code"
+cask "slack"
+cask "discord"
+cask "spotify"
+cask "vlc"
+"""
+
+_REQUIREMENTS_TXT_CONTENT = """requests==2.28.1
+click==8.1.3
+rich==13.0.0
+pydantic==2.0.0
+pyyaml==6.0
+jinja2==3.1.0
+"""
+
+_GLOBAL_NODE_TXT_CONTENT = """typescript@4.9.4
+eslint@8.31.0
+prettier@2.8.0
+jest@29.3.1
+webpack@5.75.0
+"""
+
+_CARGO_TXT_CONTENT = """fd
+ripgrep
+bat
+eza
+fzf
+"""
+
+_GEMS_TXT_CONTENT = """bundler
+rails
+jekyll
+cocoapods
+fastlane
+"""
+
+_BOOTSTRAP_SCRIPT_CONTENT = """#!/bin/bash
+set -e
+
+# Error handling
+set -o pipefail
+
+# Logging functions
+log_info() {
+    echo -e "\\033[32m[INFO]\\033[0m $1"
+}
+
+log_warn() {
+    echo -e "\\033[33m[WARN]\\033[0m $1"
+}
+
+log_error() {
+    echo -e "\\033[31m[ERROR]\\033[0m $1"
+}
+
+# OS detection
+if [[ "$OSTYPE" == "darwin"* ]]; then
+    OS="macos"
+else
+    log_error "This script is designed for macOS only"
+    exit 1
+fi
+
+# Check for Xcode Command Line Tools
+if ! xcode-select -p &> /dev/null; then
+    log_info "Installing Xcode Command Line Tools..."
+    xcode-select --install
+    log_warn "Please complete the Xcode Command Line Tools installation and run this script again"
+    exit 0
+fi
+
+# Install Homebrew if not present
+if ! command -v brew &> /dev/null; then
+    log_info "Installing Homebrew..."
+    /bin/bash -c "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"
+fi
+
+# Update Homebrew
+log_info "Updating Homebrew..."
+brew update
+
+# Install packages from Brewfile
+if [ -f "Brewfile" ]; then
+    log_info "Installing packages from Brewfile..."
+    brew bundle
+else
+    log_warn "Brewfile not found"
+fi
+
+# Install language-specific packages
+if [ -f "lang/requirements.txt" ]; then
+    log_info "Installing Python packages..."
+    pip3 install -r lang/requirements.txt
+fi
+
+if [ -f "lang/global-node.txt" ]; then
+    log_info "Installing Node.js packages..."
+    npm install -g $(cat lang/global-node.txt)
+fi
+
+if [ -f "lang/cargo.txt" ]; then
+    log_info "Installing Rust packages..."
+    while read -r package; do
+        if [ -n "$package" ]; then
+            cargo install "$package"
+        fi
+    done < lang/cargo.txt
+fi
+
+if [ -f "lang/gems.txt" ]; then
+    log_info "Installing Ruby gems..."
+    gem install $(cat lang/gems.txt)
+fi
+
+log_info "Migration completed successfully!"
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_brew_cache(monkeypatch):
+    """Keep cached Homebrew lookups from leaking between tests."""
+    monkeypatch.setenv("PACKSTER_OFFLINE", "1")
+    clear_brew_cache()
+    yield
+    clear_brew_cache()
+
+
+@pytest.fixture(scope="session")
+def _tmp_root():
+    """Provide one temporary directory holding every test's temp_dir."""
+    with tempfile.TemporaryDirectory() as root:
+        yield Path(root)
 
 
 @pytest.fixture
+def temp_dir(_tmp_root):
+    """Provide a temporary directory for tests.
+    
+    Each test gets a fresh subdirectory; they are all removed together when
+    the session ends.
+    """
+    return Path(tempfile.mkdtemp(dir=_tmp_root))
+
+
+@pytest.fixture(scope="session")
 def sample_normalized_items():
     """Provide sample NormalizedItem instances for testing."""
     return [
@@ -69,7 +324,7 @@ def sample_normalized_items():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_candidates():
     """Provide sample Candidate instances for testing."""
     return [
@@ -112,7 +367,7 @@ def sample_candidates():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_mapping_results(sample_normalized_items, sample_candidates):
     """Provide sample MappingResult instances for testing."""
     return [
@@ -149,7 +404,7 @@ def sample_mapping_results(sample_normalized_items, sample_candidates):
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mixed_mapping_results(sample_normalized_items, sample_candidates):
     """Provide mapping results with mixed decisions for testing."""
     return [
@@ -179,182 +434,101 @@ def mixed_mapping_results(sample_normalized_items, sample_candidates):
 @pytest.fixture
 def mock_registry():
     """Provide a mock registry for testing."""
-    registry = MagicMock()
-    registry.name = "Test Registry"
-    registry.description = "Test registry for unit tests"
-    registry.version = "1.0.0"
-    registry.mappings = {
-        "git": MagicMock(
-            target_pm="brew",
-            target_name="git",
-            confidence=0.95,
-            reason="Direct mapping"
-        ),
-        "vim": MagicMock(
-            target_pm="brew",
-            target_name="vim",
-            confidence=0.90,
-            reason="Direct mapping"
-        ),
-        "requests": MagicMock(
-            target_pm="pip",
-            target_name="requests",
-            confidence=0.95,
-            reason="Direct mapping"
-        ),
-    }
-    return registry
+    return SimpleNamespace(
+        name="Test Registry",
+        description="Test registry for unit tests",
+        version="1.0.0",
+        mappings={
+            "git": SimpleNamespace(
+                target_pm="brew",
+                target_name="git",
+                confidence=0.95,
+                reason="Direct mapping"
+            ),
+            "vim": SimpleNamespace(
+                target_pm="brew",
+                target_name="vim",
+                confidence=0.90,
+                reason="Direct mapping"
+            ),
+            "requests": SimpleNamespace(
+                target_pm="pip",
+                target_name="requests",
+                confidence=0.95,
+                reason="Direct mapping"
+            ),
+        },
+    )
 
 
 @pytest.fixture
 def mock_package_mapper():
     """Provide a mock PackageMapper for testing."""
-    mapper = MagicMock()
-    mapper.validate_candidates = False
-    mapper.auto_threshold = 0.8
-    mapper.verify_threshold = 0.6
-    return mapper
+    return SimpleNamespace(
+        validate_candidates=False,
+        auto_threshold=0.8,
+        verify_threshold=0.6,
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_apt_packages():
     """Provide sample APT package data for testing."""
-    return [
-        "git",
-        "vim",
-        "curl",
-        "wget",
-        "htop",
-        "tree",
-        "tmux",
-        "zsh",
-        "docker.io",
-        "nodejs",
-    ]
+    return _APT_PACKAGES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pip_packages():
     """Provide sample pip package data for testing."""
-    return [
-        "requests==2.28.1",
-        "click==8.1.3",
-        "rich==13.0.0",
-        "pydantic==2.0.0",
-        "pyyaml==6.0",
-        "jinja2==3.1.0",
-    ]
+    return _PIP_PACKAGES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_npm_packages():
     """Provide sample npm package data for testing."""
-    return [
-        "typescript@4.9.4",
-        "eslint@8.31.0",
-        "prettier@2.8.0",
-        "jest@29.3.1",
-        "webpack@5.75.0",
-    ]
+    return _NPM_PACKAGES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_cargo_packages():
     """Provide sample cargo package data for testing."""
-    return [
-        "fd 8.4.0:",
-        "ripgrep 13.0.0:",
-        "bat 0.20.0:",
-        "eza 0.9.0:",
-        "fzf 0.35.1:",
-    ]
+    return _CARGO_PACKAGES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gem_packages():
     """Provide sample gem package data for testing."""
-    return [
-        "bundler (2.4.9)",
-        "rails (7.0.4.2)",
-        "jekyll (4.3.0)",
-        "cocoapods (1.12.0)",
-        "fastlane (2.210.0)",
-    ]
+    return _GEM_PACKAGES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_brew_info():
     """Provide sample Homebrew info output for testing."""
-    return """git: stable 2.39.2
-Git is a distributed version control system
-https://git-scm.com/
-/usr/local/Cellar/git/2.39.2 (1,525 files, 47.5MB) *
-  Poured from bottle on 2023-01-15 at 10:30:00
-From: https://github.com/Homebrew/homebrew-core/blob/HEAD/Formula/g/git.rb
-License: GPL-2.0-only
-==> Dependencies
-Build: pkg-config ✘
-Required: gettext ✘, libiconv ✘, openssl@1.1 ✘, pcre2 ✘, zlib ✘
-==> Analytics
-install: 1,234,567 (30 days), 3,456,789 (90 days), 9,876,543 (365 days)
-install-on-request: 1,234,567 (30 days), 3,456,789 (90 days), 9,876,543 (365 days)
-build-error: 0 (30 days)"""
+    return _BREW_INFO
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_cask_info():
     """Provide sample Homebrew cask info output for testing."""
-    return """visual-studio-code: 1.85.1
-Visual Studio Code is a code editor
-https://code.visualstudio.com/
-/usr/local/Caskroom/visual-studio-code/1.85.1/Visual Studio Code.app (1,234 files, 567.8MB)
-From: https://github.com/Homebrew/homebrew-cask/blob/HEAD/Casks/visual-studio-code.rb
-==> Name
-Visual Studio Code
-==> Description
-Code editor
-==> Artifacts
-Visual Studio Code.app (App)
-==> Analytics
-install: 12,345 (30 days), 34,567 (90 days), 98,765 (365 days)
-install-on-request: 12,345 (30 days), 34,567 (90 days), 98,765 (365 days)
-build-error: 0 (30 days)"""
+    return _CASK_INFO
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_brew_search_results():
     """Provide sample Homebrew search results for testing."""
-    return """git
-git-crypt
-git-extras
-git-flow
-git-lfs
-git-secrets
-git-town
-git-utils"""
+    return _BREW_SEARCH_RESULTS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_installed_brew_packages():
     """Provide sample installed Homebrew packages for testing."""
-    return """git
-vim
-curl
-wget
-htop
-tree
-tmux
-zsh"""
+    return _INSTALLED_BREW_PACKAGES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_installed_cask_packages():
     """Provide sample installed Homebrew casks for testing."""
-    return """visual-studio-code
-slack
-discord
-spotify
-vlc"""
+    return _INSTALLED_CASK_PACKAGES
 
 
 @pytest.fixture
@@ -389,164 +563,43 @@ def mock_environment_info(mock_system_info):
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_brewfile_content():
     """Provide sample Brewfile content for testing."""
-    return """# Homebrew taps
-tap "homebrew/core"
-tap "homebrew/cask"
-tap "homebrew/cask-fonts"
+    return _BREWFILE_CONTENT
 
-# Homebrew packages
-brew "git"
-brew "vim"
-brew "curl"
-brew "wget"
-brew "htop"
-brew "tree"
-brew "tmux"
-brew "zsh"
 
-# Homebrew casks
-cask "visual-studio-code"
-cask "slack"
-cask "discord"
-cask "spotify"
-cask "vlc"
-"""
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_requirements_txt_content():
     """Provide sample requirements.txt content for testing."""
-    return """requests==2.28.1
-click==8.1.3
-rich==13.0.0
-pydantic==2.0.0
-pyyaml==6.0
-jinja2==3.1.0
-"""
+    return _REQUIREMENTS_TXT_CONTENT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_global_node_txt_content():
     """Provide sample global-node.txt content for testing."""
-    return """typescript@4.9.4
-eslint@8.31.0
-prettier@2.8.0
-jest@29.3.1
-webpack@5.75.0
-"""
+    return _GLOBAL_NODE_TXT_CONTENT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_cargo_txt_content():
     """Provide sample cargo.txt content for testing."""
-    return """fd
-ripgrep
-bat
-eza
-fzf
-"""
+    return _CARGO_TXT_CONTENT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gems_txt_content():
     """Provide sample gems.txt content for testing."""
-    return """bundler
-rails
-jekyll
-cocoapods
-fastlane
-"""
+    return _GEMS_TXT_CONTENT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_bootstrap_script_content():
     """Provide sample bootstrap.sh content for testing."""
-    return """#!/bin/bash
-set -e
-
-# Error handling
-set -o pipefail
-
-# Logging functions
-log_info() {
-    echo -e "\\033[32m[INFO]\\033[0m $1"
-}
-
-log_warn() {
-    echo -e "\\033[33m[WARN]\\033[0m $1"
-}
-
-log_error() {
-    echo -e "\\033[31m[ERROR]\\033[0m $1"
-}
-
-# OS detection
-if [[ "$OSTYPE" == "darwin"* ]]; then
-    OS="macos"
-else
-    log_error "This script is designed for macOS only"
-    exit 1
-fi
-
-# Check for Xcode Command Line Tools
-if ! xcode-select -p &> /dev/null; then
-    log_info "Installing Xcode Command Line Tools..."
-    xcode-select --install
-    log_warn "Please complete the Xcode Command Line Tools installation and run this script again"
-    exit 0
-fi
-
-# Install Homebrew if not present
-if ! command -v brew &> /dev/null; then
-    log_info "Installing Homebrew..."
-    /bin/bash -c "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"
-fi
-
-# Update Homebrew
-log_info "Updating Homebrew..."
-brew update
+    return _BOOTSTRAP_SCRIPT_CONTENT
 
-# Install packages from Brewfile
-if [ -f "Brewfile" ]; then
-    log_info "Installing packages from Brewfile..."
-    brew bundle
-else
-    log_warn "Brewfile not found"
-fi
 
-# Install language-specific packages
-if [ -f "lang/requirements.txt" ]; then
-    log_info "Installing Python packages..."
-    pip3 install -r lang/requirements.txt
-fi
-
-if [ -f "lang/global-node.txt" ]; then
-    log_info "Installing Node.js packages..."
-    npm install -g $(cat lang/global-node.txt)
-fi
-
-if [ -f "lang/cargo.txt" ]; then
-    log_info "Installing Rust packages..."
-    while read -r package; do
-        if [ -n "$package" ]; then
-            cargo install "$package"
-        fi
-    done < lang/cargo.txt
-fi
-
-if [ -f "lang/gems.txt" ]; then
-    log_info "Installing Ruby gems..."
-    gem install $(cat lang/gems.txt)
-fi
-
-log_info "Migration completed successfully!"
-"""
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_report_data():
     """Provide sample report data for testing."""
     return {
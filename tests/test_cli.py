@@ -1,18 +1,50 @@
 """Tests for the CLI module."""
 
 import tempfile
+from contextlib import ExitStack
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
+import pytest
 from typer.testing import CliRunner
 from packster.cli import app
 
+# CliRunner keeps no state between invocations, so one instance serves all tests
+_RUNNER = CliRunner()
+
+# Pipeline steps of the generate command, patched in packster.cli for every test
+_PIPELINE = (
+    "load_registry",
+    "normalize_all_packages",
+    "map_packages",
+    "write_brewfile",
+    "write_language_files",
+    "write_bootstrap_script",
+    "write_reports",
+)
+
+
+@pytest.fixture(autouse=True)
+def cli_mocks(request):
+    """Patch the generate pipeline with mocks that let it run to completion.
+    
+    Tests reach the mocks through ``self.mocks`` and only override what they
+    need, e.g. ``self.mocks["map_packages"].side_effect = Exception(...)``.
+    """
+    with ExitStack() as stack:
+        mocks = {name: stack.enter_context(patch(f"packster.cli.{name}")) for name in _PIPELINE}
+        mocks["load_registry"].return_value = SimpleNamespace(mappings={})
+        mocks["normalize_all_packages"].return_value = []
+        mocks["map_packages"].return_value = []
+        if request.instance is not None:
+            request.instance.mocks = mocks
+        yield mocks
+
 
 class TestCLIApp:
     """Test CLI application functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
+    runner = _RUNNER
     
     def test_app_creation(self):
         """Test that the CLI app is created correctly."""
@@ -31,22 +63,8 @@ class TestCLIApp:
         assert result.exit_code == 0
         assert "System Information" in result.stdout
     
-    @patch('packster.cli.load_registry')
-    @patch('packster.cli.normalize_all_packages')
-    @patch('packster.cli.map_packages')
-    @patch('packster.cli.write_brewfile')
-    @patch('packster.cli.write_language_files')
-    @patch('packster.cli.write_bootstrap_script')
-    @patch('packster.cli.write_reports')
-    def test_generate_command_success(self, mock_write_reports, mock_write_bootstrap, 
-                                    mock_write_langs, mock_write_brewfile, mock_map_packages,
-                                    mock_normalize_packages, mock_load_registry):
+    def test_generate_command_success(self):
         """Test successful generate command execution."""
-        # Mock return values
-        mock_load_registry.return_value = MagicMock()
-        mock_normalize_packages.return_value = []
-        mock_map_packages.return_value = []
-        
         with tempfile.TemporaryDirectory() as temp_dir:
             result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
             
@@ -55,20 +73,12 @@ class TestCLIApp:
             assert "Migration completed" in result.stdout
             
             # Verify all functions were called
-            mock_load_registry.assert_called_once()
-            mock_normalize_packages.assert_called_once()
-            mock_map_packages.assert_called_once()
-            mock_write_brewfile.assert_called_once()
-            mock_write_langs.assert_called_once()
-            mock_write_bootstrap.assert_called_once()
-            mock_write_reports.assert_called_once()
+            for name in _PIPELINE:
+                self.mocks[name].assert_called_once()
     
-    @patch('packster.cli.load_registry')
-    @patch('packster.cli.normalize_all_packages')
-    def test_generate_command_collection_error(self, mock_normalize_packages, mock_load_registry):
+    def test_generate_command_collection_error(self):
         """Test generate command with collection error."""
-        mock_load_registry.return_value = MagicMock()
-        mock_normalize_packages.side_effect = Exception("Collection failed")
+        self.mocks["normalize_all_packages"].side_effect = Exception("Collection failed")
         
         with tempfile.TemporaryDirectory() as temp_dir:
             result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
@@ -76,15 +86,9 @@ class TestCLIApp:
             assert result.exit_code != 0
             assert "Error" in result.stdout
     
-    @patch('packster.cli.load_registry')
-    @patch('packster.cli.normalize_all_packages')
-    @patch('packster.cli.map_packages')
-    def test_generate_command_mapping_error(self, mock_map_packages, mock_normalize_packages, 
-                                          mock_load_registry):
+    def test_generate_command_mapping_error(self):
         """Test generate command with mapping error."""
-        mock_load_registry.return_value = MagicMock()
-        mock_normalize_packages.return_value = []
-        mock_map_packages.side_effect = Exception("Mapping failed")
+        self.mocks["map_packages"].side_effect = Exception("Mapping failed")
         
         with tempfile.TemporaryDirectory() as temp_dir:
             result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
@@ -101,22 +105,10 @@ class TestCLIApp:
     
     def test_generate_command_default_output_dir(self):
         """Test generate command with default output directory."""
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.normalize_all_packages') as mock_normalize_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile, \
-             patch('packster.cli.write_language_files') as mock_write_langs, \
-             patch('packster.cli.write_bootstrap_script') as mock_write_bootstrap, \
-             patch('packster.cli.write_reports') as mock_write_reports:
-            
-            mock_load_registry.return_value = MagicMock()
-            mock_normalize_packages.return_value = []
-            mock_map_packages.return_value = []
-            
-            result = self.runner.invoke(app, ["generate"])
-            
-            assert result.exit_code == 0
-            assert "Migration completed" in result.stdout
+        result = self.runner.invoke(app, ["generate"])
+        
+        assert result.exit_code == 0
+        assert "Migration completed" in result.stdout
     
     @patch('pathlib.Path.exists')
     def test_generate_command_with_registry_path(self, mock_exists):
@@ -124,27 +116,15 @@ class TestCLIApp:
         # Mock the registry file to exist
         mock_exists.return_value = True
         
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.normalize_all_packages') as mock_normalize_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile, \
-             patch('packster.cli.write_language_files') as mock_write_langs, \
-             patch('packster.cli.write_bootstrap_script') as mock_write_bootstrap, \
-             patch('packster.cli.write_reports') as mock_write_reports:
-            
-            mock_load_registry.return_value = MagicMock()
-            mock_normalize_packages.return_value = []
-            mock_map_packages.return_value = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.runner.invoke(app, [
+                "generate",
+                "--output-dir", temp_dir,
+                "--registry", "custom-registry.yaml"
+            ])
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                result = self.runner.invoke(app, [
-                    "generate", 
-                    "--output-dir", temp_dir,
-                    "--registry", "custom-registry.yaml"
-                ])
-                
-                assert result.exit_code == 0
-                mock_load_registry.assert_called_once_with(Path("custom-registry.yaml"))
+            assert result.exit_code == 0
+            self.mocks["load_registry"].assert_called_once_with(Path("custom-registry.yaml"))
     
     @patch('pathlib.Path.exists')
     def test_generate_command_with_validate_flag(self, mock_exists):
@@ -152,123 +132,73 @@ class TestCLIApp:
         # Mock the registry file to exist
         mock_exists.return_value = True
         
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.normalize_all_packages') as mock_normalize_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile, \
-             patch('packster.cli.write_language_files') as mock_write_langs, \
-             patch('packster.cli.write_bootstrap_script') as mock_write_bootstrap, \
-             patch('packster.cli.write_reports') as mock_write_reports:
-            
-            mock_load_registry.return_value = MagicMock()
-            mock_normalize_packages.return_value = []
-            mock_map_packages.return_value = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.runner.invoke(app, [
+                "generate",
+                "--output-dir", temp_dir
+            ])
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                result = self.runner.invoke(app, [
-                    "generate", 
-                    "--output-dir", temp_dir
-                ])
-                
-                assert result.exit_code == 0
-                # The verify flag should be passed to map_packages (default is True)
-                mock_map_packages.assert_called_once()
+            assert result.exit_code == 0
+            # The verify flag should be passed to map_packages (default is True)
+            self.mocks["map_packages"].assert_called_once()
     
     def test_generate_command_with_verbose_flag(self):
         """Test generate command with verbose flag."""
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.normalize_all_packages') as mock_normalize_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile, \
-             patch('packster.cli.write_language_files') as mock_write_langs, \
-             patch('packster.cli.write_bootstrap_script') as mock_write_bootstrap, \
-             patch('packster.cli.write_reports') as mock_write_reports:
-            
-            mock_load_registry.return_value = MagicMock()
-            mock_normalize_packages.return_value = []
-            mock_map_packages.return_value = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.runner.invoke(app, [
+                "generate",
+                "--output-dir", temp_dir,
+                "--verbose"
+            ])
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                result = self.runner.invoke(app, [
-                    "generate", 
-                    "--output-dir", temp_dir,
-                    "--verbose"
-                ])
-                
-                assert result.exit_code == 0
-                assert "Migration completed" in result.stdout
+            assert result.exit_code == 0
+            assert "Migration completed" in result.stdout
 
 
 class TestCLIErrorHandling:
     """Test CLI error handling."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
+    runner = _RUNNER
     
     def test_generate_command_missing_output_dir(self):
         """Test generate command with missing output directory."""
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.normalize_all_packages') as mock_normalize_packages:
-            
-            mock_load_registry.return_value = MagicMock()
-            mock_normalize_packages.side_effect = Exception("Test error")
-            
-            result = self.runner.invoke(app, ["generate"])
-            
-            assert result.exit_code != 0
-            assert "Error" in result.stdout
+        self.mocks["normalize_all_packages"].side_effect = Exception("Test error")
+        
+        result = self.runner.invoke(app, ["generate"])
+        
+        assert result.exit_code != 0
+        assert "Error" in result.stdout
     
     def test_generate_command_permission_error(self):
         """Test generate command with permission error."""
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.normalize_all_packages') as mock_normalize_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile:
-            
-            mock_load_registry.return_value = MagicMock()
-            mock_normalize_packages.return_value = []
-            mock_map_packages.return_value = []
-            mock_write_brewfile.side_effect = PermissionError("Permission denied")
+        self.mocks["write_brewfile"].side_effect = PermissionError("Permission denied")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
-                
-                assert result.exit_code != 0
-                assert "Error" in result.stdout
+            assert result.exit_code != 0
+            assert "Error" in result.stdout
     
     def test_generate_command_invalid_registry(self):
         """Test generate command with invalid registry."""
-        with patch('packster.cli.load_registry') as mock_load_registry:
-            mock_load_registry.side_effect = Exception("Invalid registry")
+        self.mocks["load_registry"].side_effect = Exception("Invalid registry")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
-                
-                assert result.exit_code != 0
-                assert "Error" in result.stdout
+            assert result.exit_code != 0
+            assert "Error" in result.stdout
 
 
 class TestCLIOutput:
     """Test CLI output formatting."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
+    runner = _RUNNER
     
     def test_banner_display(self):
         """Test that the banner is displayed correctly."""
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.collect_all_packages') as mock_collect_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile, \
-             patch('packster.cli.write_language_files') as mock_write_langs, \
-             patch('packster.cli.write_bootstrap_script') as mock_write_bootstrap, \
-             patch('packster.cli.write_reports') as mock_write_reports:
-            
-            mock_load_registry.return_value = MagicMock()
+        with patch('packster.cli.collect_all_packages') as mock_collect_packages:
             mock_collect_packages.return_value = []
-            mock_map_packages.return_value = []
             
             with tempfile.TemporaryDirectory() as temp_dir:
                 result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
@@ -278,17 +208,8 @@ class TestCLIOutput:
     
     def test_system_info_display(self):
         """Test that system information is displayed."""
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.collect_all_packages') as mock_collect_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile, \
-             patch('packster.cli.write_language_files') as mock_write_langs, \
-             patch('packster.cli.write_bootstrap_script') as mock_write_bootstrap, \
-             patch('packster.cli.write_reports') as mock_write_reports:
-            
-            mock_load_registry.return_value = MagicMock()
+        with patch('packster.cli.collect_all_packages') as mock_collect_packages:
             mock_collect_packages.return_value = []
-            mock_map_packages.return_value = []
             
             with tempfile.TemporaryDirectory() as temp_dir:
                 result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
@@ -299,42 +220,21 @@ class TestCLIOutput:
     
     def test_progress_display(self):
         """Test that progress information is displayed."""
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.normalize_all_packages') as mock_normalize_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile, \
-             patch('packster.cli.write_language_files') as mock_write_langs, \
-             patch('packster.cli.write_bootstrap_script') as mock_write_bootstrap, \
-             patch('packster.cli.write_reports') as mock_write_reports:
-            
-            mock_load_registry.return_value = MagicMock()
-            mock_normalize_packages.return_value = []
-            mock_map_packages.return_value = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                result = self.runner.invoke(app, ["generate", "--output-dir", temp_dir])
-                
-                # The Rich progress bar doesn't show progress messages in final output
-                # but we can verify the migration completed successfully
-                assert "Migration completed" in result.stdout
+            # The Rich progress bar doesn't show progress messages in final output
+            # but we can verify the migration completed successfully
+            assert "Migration completed" in result.stdout
     
     def test_verbose_output(self):
         """Test verbose output mode."""
-        with patch('packster.cli.load_registry') as mock_load_registry, \
-             patch('packster.cli.collect_all_packages') as mock_collect_packages, \
-             patch('packster.cli.map_packages') as mock_map_packages, \
-             patch('packster.cli.write_brewfile') as mock_write_brewfile, \
-             patch('packster.cli.write_language_files') as mock_write_langs, \
-             patch('packster.cli.write_bootstrap_script') as mock_write_bootstrap, \
-             patch('packster.cli.write_reports') as mock_write_reports:
-            
-            mock_load_registry.return_value = MagicMock()
+        with patch('packster.cli.collect_all_packages') as mock_collect_packages:
             mock_collect_packages.return_value = []
-            mock_map_packages.return_value = []
             
             with tempfile.TemporaryDirectory() as temp_dir:
                 result = self.runner.invoke(app, [
-                    "generate", 
+                    "generate",
                     "--output-dir", temp_dir,
                     "--verbose"
                 ])
@@ -346,9 +246,7 @@ class TestCLIOutput:
 class TestCLIHelp:
     """Test CLI help functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
+    runner = _RUNNER
     
     def test_help_command(self):
         """Test the help command."""
@@ -36,7 +36,8 @@ class TestCLICloudIntegration:
         """Test generate command with upload using mocks."""
         # Mock successful responses
         mock_validate_token.return_value = True
-        mock_create_archive.return_value = tmp_path / "test-archive.tar.gz"
+        archive_path = tmp_path / "test-archive.tar.gz"
+        mock_create_archive.return_value = archive_path
         mock_upload.return_value = {
             "gist_id": "test123",
             "download_url": "https://gist.githubusercontent.com/test/raw/file.tar.gz?token=abc123",
@@ -59,7 +60,7 @@ class TestCLICloudIntegration:
         
         # Verify mocks are set up correctly
         assert mock_validate_token.return_value is True
-        assert mock_create_archive.return_value == tmp_path / "test-archive.tar.gz"
+        assert mock_create_archive.return_value == archive_path
         assert mock_upload.return_value["gist_id"] == "test123"
     
     def test_github_token_environment_variable(self):
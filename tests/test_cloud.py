@@ -86,17 +86,15 @@ class TestCompression:
         with pytest.raises(FileNotFoundError):
             create_migration_archive(Path("/nonexistent/directory"))
     
-    @patch('packster.cloud.compression.get_environment_info')
+    @patch('packster.cloud.compression.EnvironmentInfo')
     def test_create_metadata(self, mock_env_info, tmp_path):
         """Test metadata creation."""
         # Mock environment info
-        mock_env_info.return_value = {
-            "system": {
-                "os": "Ubuntu",
-                "architecture": "x86_64",
-                "wsl": True,
-                "python_version": "3.9.0"
-            }
+        mock_env_info.return_value.system = {
+            "os": "Ubuntu",
+            "architecture": "x86_64",
+            "wsl": True,
+            "python_version": "3.9.0"
         }
         
         # Create test directory structure
@@ -9,6 +9,7 @@ from packster.detect import (
     is_command_available,
     check_package_manager_availability,
     get_system_info,
+    get_processor_name,
     sanitize_os_string,
     is_ubuntu_or_debian,
     is_macos,
@@ -16,6 +17,7 @@ from packster.detect import (
     is_homebrew_available,
     run_command_safe,
     get_environment_info,
+    EnvironmentInfo,
 )
 
 
@@ -31,6 +33,20 @@ class TestDetectOS:
             result = detect_os()
             assert result == "ubuntu"
     
+    @patch('platform.system')
+    def test_detect_os_linux_id_like(self, mock_system):
+        """Test Linux detection falls back to ID_LIKE and maps RHEL to centos."""
+        mock_system.return_value = "Linux"
+        
+        with patch('builtins.open', mock_open(read_data='ID=linuxmint\nID_LIKE="ubuntu debian"\n')):
+            assert detect_os() == "ubuntu"
+        
+        with patch('builtins.open', mock_open(read_data='ID="rhel"\n')):
+            assert detect_os() == "centos"
+        
+        with patch('builtins.open', mock_open(read_data='ID=gentoo\n')):
+            assert detect_os() == "linux"
+    
     @patch('platform.system')
     def test_detect_os_macos(self, mock_system):
         """Test macOS detection."""
@@ -144,7 +160,7 @@ class TestSystemInfo:
     @patch('packster.detect.detect_wsl')
     @patch('platform.python_version')
     @patch('platform.platform')
-    @patch('platform.processor')
+    @patch('packster.detect.get_processor_name')
     def test_get_system_info(self, mock_processor, mock_platform, mock_python_version, 
                             mock_wsl, mock_arch, mock_os):
         """Test system information gathering."""
@@ -163,6 +179,23 @@ class TestSystemInfo:
         assert result["wsl"] == "False"
         assert result["python_version"] == "3.10.0"
 
+    
+    @patch('platform.machine')
+    def test_get_processor_name(self, mock_machine):
+        """Test CPU model is read from /proc/cpuinfo with a uname fallback."""
+        mock_machine.return_value = "arm64"
+        cpuinfo = b"processor\t: 0\nvendor_id\t: GenuineIntel\nmodel name\t: Intel(R) Core(TM) i7\n"
+        
+        get_processor_name.cache_clear()
+        try:
+            with patch('sys.platform', 'linux'), patch('builtins.open', mock_open(read_data=cpuinfo)):
+                assert get_processor_name() == "Intel(R) Core(TM) i7"
+            
+            get_processor_name.cache_clear()
+            with patch('sys.platform', 'darwin'):
+                assert get_processor_name() == "arm64"
+        finally:
+            get_processor_name.cache_clear()
 
 class TestOSHelpers:
     """Test OS helper functions."""
@@ -298,3 +331,58 @@ class TestEnvironmentInfo:
         assert "homebrew_path" in result
         assert "user" in result
         assert "path" in result
+    
+    @patch('packster.detect.get_system_info')
+    @patch('packster.detect.check_package_manager_availability')
+    @patch('packster.detect.is_homebrew_available')
+    @patch('packster.detect.get_homebrew_path')
+    def test_get_environment_info_cached(self, mock_homebrew_path,
+                                         mock_homebrew_available, mock_pm_availability,
+                                         mock_system_info, temp_dir):
+        """Test detection results are persisted and reused across calls."""
+        mock_system_info.return_value = {"os": "ubuntu"}
+        mock_pm_availability.return_value = {"apt": True}
+        mock_homebrew_available.return_value = False
+        mock_homebrew_path.return_value = None
+        
+        with patch('packster.detect.ENV_CACHE_PATH', temp_dir / "env.json"):
+            first = get_environment_info(use_cache=True)
+            assert (temp_dir / "env.json").exists()
+            
+            mock_system_info.side_effect = AssertionError("detection should be cached")
+            second = get_environment_info(use_cache=True)
+        
+        assert second["system"] == first["system"] == {"os": "ubuntu"}
+        assert second["package_managers"] == {"apt": True}
+        assert mock_system_info.call_count == 1
+    
+    @patch('packster.detect.get_system_info')
+    @patch('packster.detect.check_package_manager_availability')
+    @patch('packster.detect.is_homebrew_available', return_value=False)
+    @patch('packster.detect.get_homebrew_path', return_value=None)
+    def test_get_environment_info_cache_keyed_by_interpreter(self, mock_homebrew_path,
+                                                             mock_homebrew_available, mock_pm_availability,
+                                                             mock_system_info, temp_dir):
+        """Test persisted detection results are not reused by another interpreter."""
+        mock_system_info.return_value = {"os": "ubuntu"}
+        mock_pm_availability.return_value = {"apt": True}
+        
+        with patch('packster.detect.ENV_CACHE_PATH', temp_dir / "env.json"):
+            get_environment_info(use_cache=True)
+            with patch('packster.detect.sys.executable', "/opt/other/bin/python3"):
+                get_environment_info(use_cache=True)
+        
+        assert mock_system_info.call_count == 2
+    
+    @patch('packster.detect.get_system_info')
+    @patch('packster.detect.check_package_manager_availability')
+    def test_environment_info_is_lazy(self, mock_pm_availability, mock_system_info):
+        """Test fields are only detected when accessed."""
+        mock_system_info.return_value = {"os": "ubuntu"}
+        
+        env = EnvironmentInfo()
+        assert env.system == {"os": "ubuntu"}
+        assert env.system is env.system
+        
+        mock_system_info.assert_called_once()
+        mock_pm_availability.assert_not_called()
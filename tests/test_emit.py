@@ -165,6 +165,20 @@ class TestLanguageFilesGeneration:
             assert (lang_dir / "cargo.txt").exists()
             assert (lang_dir / "gems.txt").exists()
     
+    def test_write_language_files_existing_directory(self):
+        """Test language files generation into an existing lang directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            lang_dir = output_dir / "lang"
+            lang_dir.mkdir()
+            (lang_dir / "cargo.txt").touch()
+            
+            write_language_files([], output_dir)
+            
+            assert sorted(p.name for p in lang_dir.iterdir()) == [
+                "cargo.txt", "gems.txt", "global-node.txt", "requirements.txt"
+            ]
+    
     def test_write_language_files_mixed_decisions(self):
         """Test language files generation with mixed decisions."""
         mapping_results = [
@@ -338,6 +352,25 @@ class TestReportGeneration:
             assert "skipped" in report_data
             assert "mapping_results" in report_data
     
+    def test_write_reports_json_non_ascii(self):
+        """Test non-ASCII text is written as raw UTF-8, as with orjson."""
+        mapping_results = [
+            MappingResult(
+                source=NormalizedItem(name="café-tools", package_manager=PackageManager.APT),
+                candidate=None,
+                decision=Decision.MANUAL
+            )
+        ]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            with patch('packster.emit.report.orjson', None):
+                write_reports(mapping_results, output_dir)
+            
+            content = (output_dir / "report.json").read_bytes()
+            assert "café-tools".encode('utf-8') in content
+            assert b"\\u00e9" not in content
+    
     def test_write_reports_html_template_rendering(self):
         """Test HTML report template rendering."""
         mapping_results = [
@@ -364,6 +397,69 @@ class TestReportGeneration:
             assert "<title>Packster Migration Report</title>" in content
             assert "Auto-Mapped Packages" in content
 
+    
+    def test_write_reports_reuses_compiled_template(self):
+        """Test the HTML template is compiled once across report writes."""
+        from packster.emit.report import _load_template
+        
+        _load_template.cache_clear()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            write_reports([], Path(temp_dir) / "first")
+            write_reports([], Path(temp_dir) / "second")
+        
+        info = _load_template.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+class TestReportStatistics:
+    """Test report statistics."""
+    
+    def test_get_report_statistics_follows_changes(self, sample_mapping_results):
+        """Test statistics reflect results added after an earlier call."""
+        from packster.emit.report import get_report_statistics
+        
+        report = Report(mapped_auto=list(sample_mapping_results))
+        first = get_report_statistics(report)
+        assert first["summary"]["total_items"] == len(sample_mapping_results)
+        
+        report.skipped.append(sample_mapping_results[0])
+        second = get_report_statistics(report)
+        assert second["summary"]["skipped"] == 1
+    
+    def test_write_file_batches_and_short_writes(self):
+        """Test batched report writes complete even when writev is short."""
+        from packster.emit.report import _write_file
+        
+        chunks = [bytes([65 + i % 26]) * (i * 37 + 1) for i in range(200)]
+        real_writev = os.writev
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "report.html"
+            _write_file(output_path, iter(chunks))
+            assert output_path.read_bytes() == b"".join(chunks)
+            
+            # Simulate the kernel accepting only part of each batch
+            with patch('os.writev', side_effect=lambda fd, bufs: real_writev(fd, [bytes(bufs[0][:3])])):
+                _write_file(output_path, iter(chunks))
+            assert output_path.read_bytes() == b"".join(chunks)
+
+    def test_write_file_keeps_existing_file_on_error(self):
+        """Test a failure while producing chunks leaves the previous file intact."""
+        from packster.emit.report import _write_file
+        
+        def failing_chunks():
+            yield b"<html>"
+            raise RuntimeError("template error")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "report.html"
+            output_path.write_bytes(b"complete report")
+            
+            with pytest.raises(RuntimeError):
+                _write_file(output_path, failing_chunks())
+            
+            assert output_path.read_bytes() == b"complete report"
+            assert os.listdir(temp_dir) == ["report.html"]
 
 class TestFileValidation:
     """Test file validation functionality."""
@@ -411,6 +507,21 @@ class TestFileValidation:
             assert "requests" in content
             assert "==" in content or content.strip() == "requests"
 
+    
+    def test_validate_language_file(self):
+        """Test language file validation streams readable files."""
+        from packster.emit.langs import validate_language_file
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            valid_path = Path(temp_dir) / "requirements.txt"
+            valid_path.write_text("# comment\nrequests==2.28.1\nclick\n")
+            assert validate_language_file(valid_path, "python") is True
+            
+            invalid_path = Path(temp_dir) / "gems.txt"
+            invalid_path.write_bytes(b"bundler -v 2.4.9\n\xff\xfe\n")
+            assert validate_language_file(invalid_path, "gem") is False
+            
+            assert validate_language_file(Path(temp_dir) / "missing.txt", "npm") is False
 
 class TestErrorHandling:
     """Test error handling in emit functions."""
@@ -3,6 +3,7 @@
 import pytest
 import tempfile
 import os
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 from packster.cli import app
@@ -35,7 +36,7 @@ class TestEndToEndMigration:
                                    mock_normalize_packages, mock_load_registry):
         """Test complete migration workflow with realistic data."""
         # Mock registry
-        mock_registry = MagicMock()
+        mock_registry = SimpleNamespace()
         mock_registry.mappings = {
             "git": MagicMock(target_pm="brew", target_name="git", confidence=0.95),
             "vim": MagicMock(target_pm="brew", target_name="vim", confidence=0.90),
@@ -110,7 +111,7 @@ class TestEndToEndMigration:
                                           mock_normalize_packages, mock_load_registry):
         """Test migration with mixed mapping decisions."""
         # Mock registry
-        mock_registry = MagicMock()
+        mock_registry = SimpleNamespace()
         mock_registry.mappings = {
             "git": MagicMock(target_pm="brew", target_name="git", confidence=0.95),
             "unknown-package": MagicMock(target_pm="brew", target_name="unknown", confidence=0.3),
@@ -160,7 +161,7 @@ class TestEndToEndMigration:
                                      mock_write_langs, mock_write_brewfile, mock_map_packages,
                                      mock_normalize_packages, mock_load_registry):
         """Test migration with validation enabled."""
-        mock_load_registry.return_value = MagicMock()
+        mock_load_registry.return_value = SimpleNamespace(mappings={})
         mock_normalize_packages.return_value = []
         mock_map_packages.return_value = []
         
@@ -372,7 +373,7 @@ class TestErrorHandlingIntegration:
         with patch('packster.cli.load_registry') as mock_load_registry, \
              patch('packster.cli.normalize_all_packages') as mock_normalize_packages:
             
-            mock_load_registry.return_value = MagicMock()
+            mock_load_registry.return_value = SimpleNamespace(mappings={})
             mock_normalize_packages.side_effect = Exception("Collection failed")
             
             runner = CliRunner()
@@ -389,7 +390,7 @@ class TestErrorHandlingIntegration:
              patch('packster.cli.normalize_all_packages') as mock_normalize_packages, \
              patch('packster.cli.map_packages') as mock_map_packages:
             
-            mock_load_registry.return_value = MagicMock()
+            mock_load_registry.return_value = SimpleNamespace(mappings={})
             mock_normalize_packages.return_value = []
             mock_map_packages.side_effect = Exception("Mapping failed")
             
@@ -408,7 +409,7 @@ class TestErrorHandlingIntegration:
              patch('packster.cli.map_packages') as mock_map_packages, \
              patch('packster.cli.write_brewfile') as mock_write_brewfile:
             
-            mock_load_registry.return_value = MagicMock()
+            mock_load_registry.return_value = SimpleNamespace(mappings={})
             mock_normalize_packages.return_value = []
             mock_map_packages.return_value = []
             mock_write_brewfile.side_effect = PermissionError("Permission denied")
@@ -1,13 +1,16 @@
 """Tests for LLM-powered package migration."""
 
+import asyncio
 import json
+import anthropic
+import httpx
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
-from packster.llm.prompts import create_migration_prompt
+from packster.llm.prompts import create_migration_prompt, build_migration_batches, MIGRATION_INSTRUCTIONS
 from packster.llm.parser import parse_migration_response, generate_installation_script
-from packster.llm.claude import ClaudeMigrator
+from packster.llm.claude import ClaudeMigrator, AsyncClaudeMigrator
 
 
 class TestPrompts:
@@ -33,6 +36,44 @@ class TestPrompts:
         assert "Migrate 2 Ubuntu packages" in prompt
         assert "JSON" in prompt
 
+    
+    def test_create_migration_prompt_static_prefix(self):
+        """Test that the package list comes after all static instructions."""
+        packages = [{"source": {"source_name": "git", "source_pm": "apt"}, "decision": "manual"}]
+        
+        prompt = create_migration_prompt(packages)
+        
+        assert prompt.startswith(MIGRATION_INSTRUCTIONS)
+        assert prompt.endswith("<packages>\ngit (apt) - manual - \n</packages>")
+    
+    def test_migration_instructions_cacheable(self):
+        """Test the cached instructions exceed the 1024-token minimum for prompt caching."""
+        assert len(MIGRATION_INSTRUCTIONS) // 4 > 1024
+    
+    def test_migration_instructions_registry_hints(self):
+        """Test the registry hints agree with the default registry."""
+        from packster.config import DEFAULT_REGISTRY_PATH
+        from packster.map.registry import load_registry, find_mapping
+        
+        registry = load_registry(DEFAULT_REGISTRY_PATH)
+        hints = MIGRATION_INSTRUCTIONS.split("Registry hints:", 1)[1].splitlines()[1:]
+        
+        assert hints
+        for hint in hints:
+            source, target = hint[2:].split(" -> ")
+            target_name, target_pm = target.rstrip(")").split(" (")
+            mapping = find_mapping(registry, source)
+            assert (mapping.target_name, mapping.target_pm) == (target_name, target_pm), hint
+    
+    def test_build_migration_batches(self):
+        """Test batches are cut by token budget as well as package count."""
+        short = {"source": {"source_name": "git", "source_pm": "apt"}, "decision": "manual"}
+        long = {"source": {"source_name": "x" * 200, "source_pm": "apt"}, "decision": "manual"}
+        
+        batches = build_migration_batches([short, short, long, short, short, short], 2, 60)
+        
+        assert batches == [[short, short], [long], [short, short], [short]]
+        assert build_migration_batches([], 50, 6000) == []
 
 class TestParser:
     """Test response parsing."""
@@ -166,6 +207,97 @@ class TestClaudeMigrator:
         assert results["summary"]["installable_count"] == 1
         assert results["summary"]["unavailable_count"] == 0
     
+    @patch('packster.llm.claude.Anthropic')
+    def test_migrate_packages_caches_instructions(self, mock_anthropic):
+        """Test that instructions go in a cached system block, not the user message."""
+        mock_client = Mock()
+        mock_message = Mock()
+        mock_message.content = [Mock()]
+        mock_message.content[0].text = '{"installable_packages": [], "unavailable_packages": [], "installation_script": null}'
+        mock_client.messages.create.return_value = mock_message
+        mock_anthropic.return_value = mock_client
+        
+        migrator = ClaudeMigrator("test-api-key")
+        
+        packages = [
+            {
+                "source": {"source_name": f"pkg{i}", "source_pm": "apt"},
+                "decision": "manual"
+            }
+            for i in range(3)
+        ]
+        
+        migrator.migrate_packages(packages, batch_size=2)
+        
+        calls = mock_client.messages.create.call_args_list
+        assert len(calls) == 2
+        for call in calls:
+            system = call.kwargs["system"]
+            assert system[0]["text"] == MIGRATION_INSTRUCTIONS
+            assert system[0]["cache_control"] == {"type": "ephemeral"}
+            assert "Return JSON" not in call.kwargs["messages"][0]["content"]
+        assert "pkg2 (apt)" in calls[1].kwargs["messages"][0]["content"]
+    
+    @patch('packster.llm.claude.Anthropic')
+    def test_call_claude_streaming_fallback(self, mock_anthropic):
+        """Test that the streaming fallback joins the text deltas."""
+        events = [Mock(type="message_start")]
+        for text in ('{"installable_packages": [], ', '"unavailable_packages": [], ', '"installation_script": null}'):
+            event = Mock(type="content_block_delta")
+            event.delta.text = text
+            events.append(event)
+        mock_client = Mock()
+        mock_client.messages.create.side_effect = [Exception("Streaming is required"), iter(events)]
+        mock_anthropic.return_value = mock_client
+        
+        migrator = ClaudeMigrator("test-api-key")
+        response = migrator._call_claude("prompt")
+        
+        assert parse_migration_response(response)["installable_packages"] == []
+        assert mock_client.messages.create.call_args.kwargs["stream"] is True
+    
+    @patch('packster.llm.claude.Anthropic')
+    def test_validate_mappings_single_call(self, mock_anthropic):
+        """Test that several mappings are validated with one API call."""
+        mock_client = Mock()
+        mock_message = Mock()
+        mock_message.content = [Mock()]
+        mock_message.content[0].text = json.dumps([
+            {"valid": True, "alternative": None, "message": "Correct"},
+            {"valid": False, "alternative": "brew install --cask docker", "message": "Use the cask"},
+        ])
+        mock_client.messages.create.return_value = mock_message
+        mock_anthropic.return_value = mock_client
+        
+        migrator = ClaudeMigrator("test-api-key")
+        results = migrator.validate_mappings([
+            ("git", "brew install git"),
+            ("docker.io", "brew install docker"),
+        ])
+        
+        mock_client.messages.create.assert_called_once()
+        prompt = mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert '"package": "docker.io"' in prompt
+        assert results == [
+            {"valid": True, "message": "Correct"},
+            {"valid": False, "message": "Use the cask", "alternative": "brew install --cask docker"},
+        ]
+    
+    @patch('packster.llm.claude.Anthropic')
+    def test_validate_mapping_wrong_result_count(self, mock_anthropic):
+        """Test that a response with the wrong number of results fails validation."""
+        mock_client = Mock()
+        mock_message = Mock()
+        mock_message.content = [Mock()]
+        mock_message.content[0].text = "[]"
+        mock_client.messages.create.return_value = mock_message
+        mock_anthropic.return_value = mock_client
+        
+        result = ClaudeMigrator("test-api-key").validate_mapping("git", "brew install git")
+        
+        assert result["valid"] is False
+        assert "Validation failed" in result["message"]
+    
     @patch('packster.llm.claude.Anthropic')
     def test_migrate_packages_failure(self, mock_anthropic):
         """Test failed package migration."""
@@ -190,6 +322,114 @@ class TestClaudeMigrator:
         assert "API Error" in results["error"]
 
 
+
+class TestAsyncClaudeMigrator:
+    """Test the concurrent Claude migrator."""
+    
+    @staticmethod
+    def _response(name):
+        message = Mock()
+        message.content = [Mock()]
+        message.content[0].text = json.dumps({
+            "installable_packages": [{"original_name": name, "installation_method": "homebrew"}],
+            "unavailable_packages": [],
+            "installation_script": None
+        })
+        return message
+    
+    @patch('packster.llm.claude.AsyncAnthropic')
+    @patch('packster.llm.claude.Anthropic')
+    def test_migrate_packages_concurrent(self, mock_anthropic, mock_async_anthropic):
+        """Test that batches run concurrently and results keep batch order."""
+        async def create(**kwargs):
+            content = kwargs["messages"][0]["content"]
+            name = content.split("<packages>\n", 1)[1].split(" ", 1)[0]
+            # Earlier batches finish last
+            await asyncio.sleep(0.01 * (5 - int(name[3:])))
+            return self._response(name)
+        
+        mock_client = Mock()
+        mock_client.messages.create = AsyncMock(side_effect=create)
+        mock_async_anthropic.return_value = mock_client
+        
+        migrator = AsyncClaudeMigrator("test-api-key", max_concurrency=4)
+        packages = [
+            {"source": {"source_name": f"pkg{i}", "source_pm": "apt"}, "decision": "manual"}
+            for i in range(4)
+        ]
+        
+        results = migrator.migrate_packages(packages, batch_size=1)
+        
+        assert results["success"] is True
+        names = [pkg["original_name"] for pkg in results["parsed_response"]["installable_packages"]]
+        assert names == ["pkg0", "pkg1", "pkg2", "pkg3"]
+        assert mock_client.messages.create.await_count == 4
+    
+    @patch('packster.llm.claude.asyncio.sleep', new_callable=AsyncMock)
+    @patch('packster.llm.claude.AsyncAnthropic')
+    @patch('packster.llm.claude.Anthropic')
+    def test_migrate_packages_retries_rate_limit(self, mock_anthropic, mock_async_anthropic, mock_sleep):
+        """Test that rate-limited calls are retried with backoff."""
+        rate_limited = anthropic.RateLimitError(
+            "rate limited",
+            response=httpx.Response(429, request=httpx.Request("POST", "https://api.anthropic.com")),
+            body=None
+        )
+        mock_client = Mock()
+        mock_client.messages.create = AsyncMock(side_effect=[rate_limited, rate_limited, self._response("git")])
+        mock_async_anthropic.return_value = mock_client
+        
+        migrator = AsyncClaudeMigrator("test-api-key")
+        packages = [{"source": {"source_name": "git", "source_pm": "apt"}, "decision": "manual"}]
+        
+        results = migrator.migrate_packages(packages)
+        
+        assert results["success"] is True
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [1, 2]
+    
+    @patch('packster.llm.claude.AsyncAnthropic')
+    @patch('packster.llm.claude.Anthropic')
+    def test_migrate_packages_failure(self, mock_anthropic, mock_async_anthropic):
+        """Test that a failed batch fails the migration."""
+        mock_client = Mock()
+        mock_client.messages.create = AsyncMock(side_effect=Exception("API Error"))
+        mock_async_anthropic.return_value = mock_client
+        
+        migrator = AsyncClaudeMigrator("test-api-key")
+        packages = [{"source": {"source_name": "git", "source_pm": "apt"}, "decision": "manual"}]
+        
+        results = migrator.migrate_packages(packages)
+        
+        assert results["success"] is False
+        assert "Batch 1 failed" in results["error"]
+        assert "API Error" in results["error"]
+    
+    @patch('packster.llm.claude.AsyncAnthropic')
+    @patch('packster.llm.claude.Anthropic')
+    def test_migrate_packages_failure_stops_batches(self, mock_anthropic, mock_async_anthropic):
+        """Test that the first failed batch cancels the batches still pending."""
+        async def create(**kwargs):
+            if "pkg1 (apt)" in kwargs["messages"][0]["content"]:
+                raise Exception("API Error")
+            await asyncio.sleep(0.01)
+            return self._response("pkg")
+        
+        mock_client = Mock()
+        mock_client.messages.create = AsyncMock(side_effect=create)
+        mock_async_anthropic.return_value = mock_client
+        
+        migrator = AsyncClaudeMigrator("test-api-key", max_concurrency=2)
+        packages = [
+            {"source": {"source_name": f"pkg{i}", "source_pm": "apt"}, "decision": "manual"}
+            for i in range(6)
+        ]
+        
+        results = migrator.migrate_packages(packages, batch_size=1)
+        
+        assert results["success"] is False
+        assert "Batch 2 failed" in results["error"]
+        assert mock_client.messages.create.await_count <= 3
+
 def test_integration_with_sample_data():
     """Integration test with sample package data."""
     # Sample packages from a real report
@@ -1,5 +1,10 @@
 """Tests for the map module."""
 
+import mmap
+import time
+import pytest
+import yaml
+from pydantic import ValidationError
 from unittest.mock import patch, mock_open
 from packster.map import (
     load_registry,
@@ -10,7 +15,8 @@ from packster.map import (
     PackageMapper,
 )
 from packster.types import NormalizedItem, PackageManager, Candidate, MappingResult, Decision
-from packster.map.registry import Registry
+from packster.map.registry import Registry, save_registry, find_mapping, find_mappings_batch, get_registry_statistics, add_mapping, remove_mapping, _load_registry_cached
+from packster.map.heuristics import apply_similarity_matching
 
 class TestRegistryLoading:
     """Test registry loading functionality."""
@@ -34,8 +40,10 @@ class TestRegistryLoading:
             reason: "Direct mapping"
         """
         
+        # The mocked contents must not be served from, or left in, the cache
+        _load_registry_cached.cache_clear()
         with patch('builtins.open', mock_open(read_data=yaml_content)):
-            with patch('yaml.safe_load') as mock_yaml_load:
+            with patch('yaml.load') as mock_yaml_load:
                 mock_yaml_load.return_value = {
                     "name": "Ubuntu to Homebrew",
                     "description": "Package mappings from Ubuntu to Homebrew",
@@ -57,6 +65,97 @@ class TestRegistryLoading:
                 assert "git" in registry.mappings
                 assert registry.mappings["git"].target_pm == "brew"
                 assert registry.mappings["git"].target_name == "git"
+        _load_registry_cached.cache_clear()
+    
+    def test_registry_round_trip(self, temp_dir):
+        """Test that a saved registry loads back unchanged."""
+        registry = Registry(
+            name="Round trip",
+            aliases={"vi": "vim"},
+            mappings={"vim": RegistryMapping(source_name="vim", target_pm="brew", target_name="vim",
+                                             confidence=0.9, post_install=["vim --version"])},
+        )
+        path = temp_dir / "registry.yaml"
+        
+        save_registry(registry, path)
+        loaded = load_registry(path)
+        
+        assert loaded.name == "Round trip"
+        assert loaded.aliases == {"vi": "vim"}
+        assert loaded.mappings == registry.mappings
+    
+    def test_load_registry_validates_unusual_entries(self, temp_dir):
+        """Test well-formed entries load like validated ones and bad ones still fail."""
+        path = temp_dir / "registry.yaml"
+        path.write_text(
+            "name: Entries\n"
+            "mappings:\n"
+            "  git: {target_pm: brew, target_name: git, confidence: 1}\n"
+            "  vim: {target_pm: brew, target_name: vim, confidence: '0.7', extra: ignored}\n",
+            encoding="utf-8",
+        )
+        
+        registry = load_registry(path)
+        
+        assert registry.mappings["git"] == RegistryMapping(source_name="git", target_pm="brew",
+                                                           target_name="git", confidence=1.0)
+        assert registry.mappings["vim"].confidence == 0.7
+        assert isinstance(registry.mappings["git"].confidence, float)
+        
+        path.write_text(
+            "name: Entries\nmappings:\n  git: {target_pm: brew, target_name: git, confidence: 2}\n",
+            encoding="utf-8",
+        )
+        with pytest.raises(Exception, match="confidence"):
+            load_registry(path)
+    
+    def test_load_registry_memory_mapped(self, temp_dir):
+        """Test large registry files are parsed from a memory map."""
+        path = temp_dir / "registry.yaml"
+        path.write_text("name: Mapped\nmappings:\n  git: git\n", encoding="utf-8")
+        
+        with patch('packster.map.registry._MMAP_THRESHOLD', 0), \
+             patch('packster.map.registry.mmap.mmap', wraps=mmap.mmap) as mock_mmap:
+            registry = load_registry(path)
+        
+        mock_mmap.assert_called_once()
+        assert registry.name == "Mapped"
+        assert registry.mappings["git"].target_name == "git"
+    
+    def test_load_registry_cached_until_changed(self, temp_dir):
+        """Test that unchanged registry files are parsed once."""
+        path = temp_dir / "registry.yaml"
+        path.write_text("name: Cached\nmappings:\n  git: git\n", encoding="utf-8")
+        
+        with patch('yaml.load', wraps=yaml.load) as mock_yaml_load:
+            first = load_registry(path)
+            first.mappings.clear()
+            second = load_registry(path)
+            assert mock_yaml_load.call_count == 1
+            assert list(second.mappings) == ["git"]
+            
+            path.write_text("name: Cached\nmappings:\n  git: git\n  vim: vim\n", encoding="utf-8")
+            third = load_registry(path)
+            assert mock_yaml_load.call_count == 2
+            assert list(third.mappings) == ["git", "vim"]
+    
+    def test_load_registry_mappings_not_shared(self, temp_dir):
+        """Test that edits to a loaded mapping don't leak into later loads."""
+        path = temp_dir / "registry.yaml"
+        path.write_text(
+            "name: Cached\nmappings:\n  git:\n    target_pm: brew\n    target_name: git\n"
+            "    post_install: [git lfs install]\n",
+            encoding="utf-8",
+        )
+        
+        first = load_registry(path)
+        first.mappings["git"].target_name = "HACK"
+        first.mappings["git"].post_install.append("HACK")
+        
+        second = load_registry(path)
+        assert second.mappings["git"].target_name == "git"
+        assert second.mappings["git"].post_install == ["git lfs install"]
+        assert find_mapping(second, "git").target_name == "git"
     
     def test_load_registry_file_not_found(self):
         """Test registry loading when file doesn't exist."""
@@ -64,7 +163,96 @@ class TestRegistryLoading:
             registry = load_registry("nonexistent.yaml")
             assert registry.name == "Default Registry"
             assert len(registry.mappings) == 0
+    
+    def test_find_mapping_case_insensitive(self):
+        """Test case-insensitive lookups follow registry changes."""
+        registry = Registry(name="test")
+        add_mapping(registry, "Docker.io", "cask", "docker")
+        add_mapping(registry, "docker.IO", "brew", "docker")
+        
+        assert find_mapping(registry, "DOCKER.io").target_pm == "cask"
+        assert find_mapping(registry, "VIM") is None
+        
+        add_mapping(registry, "Vim", "brew", "vim")
+        assert find_mapping(registry, "VIM").target_name == "vim"
+        
+        remove_mapping(registry, "Docker.io")
+        assert find_mapping(registry, "DOCKER.io").target_pm == "brew"
 
+    
+    def test_find_mapping_aliases(self):
+        """Test exact names win over aliases and aliases follow registry changes."""
+        registry = Registry(name="test", aliases={"vi": "vim", "nvim": "neovim", "git": "vim"})
+        add_mapping(registry, "vim", "brew", "vim")
+        add_mapping(registry, "git", "brew", "git")
+        
+        assert find_mapping(registry, "vi").target_name == "vim"
+        assert find_mapping(registry, "git").target_name == "git"
+        assert find_mapping(registry, "nvim") is None
+        
+        add_mapping(registry, "neovim", "brew", "neovim")
+        assert find_mapping(registry, "nvim").target_name == "neovim"
+        
+        registry.aliases = {**registry.aliases, "view": "vim"}
+        assert find_mapping(registry, "view").target_name == "vim"
+    
+    def test_find_mapping_follows_replaced_entries(self):
+        """Test lookups see replaced entries and swapped mappings dicts."""
+        registry = Registry(name="test", aliases={"vi": "vim"})
+        add_mapping(registry, "vim", "brew", "vim")
+        add_mapping(registry, "Git", "brew", "git")
+        assert find_mapping(registry, "git").target_name == "git"
+        
+        add_mapping(registry, "vim", "brew", "neovim")
+        add_mapping(registry, "Git", "brew", "git-gui")
+        assert find_mapping(registry, "vim").target_name == "neovim"
+        assert find_mapping(registry, "vi").target_name == "neovim"
+        assert find_mapping(registry, "git").target_name == "git-gui"
+        
+        registry.mappings = {"Emacs": RegistryMapping(target_pm="brew", target_name="emacs")}
+        assert find_mapping(registry, "git") is None
+        assert find_mappings_batch(registry, ["emacs", "vi"])[0].target_name == "emacs"
+    
+    def test_find_mapping_after_same_size_edit(self):
+        """Test removing one mapping and adding another is seen by lookups."""
+        registry = Registry(name="test", aliases={"vi": "vim"})
+        add_mapping(registry, "vim", "brew", "vim")
+        assert find_mapping(registry, "VI") is None
+        assert find_mapping(registry, "vi").target_name == "vim"
+        
+        remove_mapping(registry, "vim")
+        add_mapping(registry, "Emacs", "brew", "emacs")
+        assert find_mapping(registry, "vi") is None
+        assert find_mapping(registry, "vim") is None
+        assert find_mappings_batch(registry, ["emacs", "vi"])[0].target_name == "emacs"
+    
+    def test_find_mappings_batch(self):
+        """Test batch lookups match find_mapping name by name."""
+        registry = Registry(name="test", aliases={"vi": "vim"})
+        add_mapping(registry, "vim", "brew", "vim")
+        add_mapping(registry, "Docker.io", "cask", "docker")
+        names = ["vim", "vi", "docker.io", "emacs"]
+        
+        result = find_mappings_batch(registry, names)
+        
+        assert result == [find_mapping(registry, name) for name in names]
+        assert [m.target_name if m else None for m in result] == ["vim", "vim", "docker", None]
+    
+    def test_get_registry_statistics(self):
+        """Test mappings are counted by target and confidence band."""
+        registry = Registry(name="test", aliases={"vi": "vim"})
+        add_mapping(registry, "vim", "brew", "vim", confidence=0.9)
+        add_mapping(registry, "docker.io", "cask", "docker", confidence=0.6)
+        add_mapping(registry, "gnome-terminal", "cask", "iterm2", confidence=0.59)
+        
+        stats = get_registry_statistics(registry)
+        
+        assert stats == {
+            "total_mappings": 3,
+            "total_aliases": 1,
+            "by_target_pm": {"brew": 1, "cask": 2},
+            "by_confidence": {"high": 1, "medium": 1, "low": 1},
+        }
 
 class TestRegistryMapping:
     """Test RegistryMapping model."""
@@ -141,6 +329,80 @@ class TestHeuristics:
         assert rule.target_name == "fd"
         assert rule.confidence == 0.8
         assert rule.reason == "Common alias"
+    
+    def test_heuristic_rule_is_frozen(self):
+        """Test that rules are immutable and hashable."""
+        rule = HeuristicRule(pattern="fd-find", target_pm="brew", target_name="fd",
+                             confidence=0.8, reason="Common alias", post_install=["fd --version"])
+        
+        assert rule.post_install == ("fd --version",)
+        assert hash(rule) == hash(rule.model_copy())
+        with pytest.raises(ValidationError):
+            rule.confidence = 0.9
+    
+    def test_apply_heuristics_memoizes_results(self):
+        """Test that repeated lookups reuse results without sharing the list."""
+        first = apply_heuristics("libssl-dev")
+        first.clear()
+        
+        assert apply_heuristics("libssl-dev")[0] == ("brew", "libssl", 0.4, "Development packages often have -dev suffix")
+    
+    def test_apply_heuristics_custom_regex_rule(self):
+        """Test that regex rules are compiled once and substitute capture groups."""
+        rule = HeuristicRule(
+            pattern="^golang-(.+)$",
+            target_pm="brew",
+            target_name="\\1",
+            confidence=0.5,
+            reason="Go packages",
+            is_regex=True
+        )
+        
+        assert rule._compiled is not None
+        assert rule._compiled.pattern == "^golang-(.+)$"
+        
+        result = apply_heuristics("golang-go", [rule])
+        
+        assert result == [("brew", "go", 0.5, "Go packages")]
+    
+    def test_apply_heuristics_collects_all_matching_rules(self):
+        """Test that every matching regex rule applies, not only the first."""
+        result = apply_heuristics("libssl-dev")
+        
+        assert ("brew", "ssl-dev", 0.3, "Library packages often have lib prefix") in result
+        assert ("brew", "libssl", 0.4, "Development packages often have -dev suffix") in result
+        assert result[0][2] == 0.4
+    
+    def test_apply_heuristics_uncombinable_patterns(self):
+        """Test rules whose patterns cannot share one alternation."""
+        rules = [
+            HeuristicRule(pattern="^(?P<name>.+)-bin$", target_pm="brew", target_name="\\g<name>",
+                          confidence=0.5, reason="Binary", is_regex=True),
+            HeuristicRule(pattern="^(?P<name>.+)-git$", target_pm="brew", target_name="\\g<name>",
+                          confidence=0.4, reason="Git build", is_regex=True),
+        ]
+        
+        assert apply_heuristics("tool-git", rules) == [("brew", "tool", 0.4, "Git build")]
+    
+    def test_apply_heuristics_backreference_rule(self):
+        """Test numbered backreferences still match after other regex rules."""
+        rules = [
+            HeuristicRule(pattern="^foo-.*", target_pm="brew", target_name="foo",
+                          confidence=0.5, reason="Foo", is_regex=True),
+            HeuristicRule(pattern="^(ab)\\1$", target_pm="brew", target_name="\\1",
+                          confidence=0.4, reason="Doubled", is_regex=True),
+        ]
+        
+        assert apply_heuristics("abab", rules) == [("brew", "ab", 0.4, "Doubled")]
+        assert apply_heuristics("foo-x", rules) == [("brew", "foo", 0.5, "Foo")]
+    
+    def test_apply_similarity_matching(self):
+        """Test similarity matching is case-insensitive and ordered by score."""
+        result = apply_similarity_matching("Ripgrep", ["curl", "ripgrepx", "RipGrep"], threshold=0.9)
+        
+        assert [name for name, _ in result] == ["RipGrep", "ripgrepx"]
+        assert result[0][1] == 1.0
+        assert abs(result[1][1] - 14 / 15) < 1e-9
 
 
 class TestPackageMapper:
@@ -259,6 +521,155 @@ class TestPackageMapper:
             assert results[0].decision == Decision.AUTO
             assert results[1].decision == Decision.MANUAL
     
+    @patch('packster.map.mapper.exists_in_brew')
+    def test_map_packages_memoizes_duplicate_names(self, mock_exists_brew):
+        """Test that duplicate package names are only resolved and validated once."""
+        mock_exists_brew.return_value = True
+        registry = Registry(name="test")
+        mapper = PackageMapper(registry, verify=True)
+        packages = [
+            NormalizedItem(source_name="gcc-12.2", source_pm=PackageManager.APT),
+            NormalizedItem(source_name="gcc-12.2", source_pm=PackageManager.APT, version="12.2.0"),
+        ]
+        
+        results = mapper.map_packages(packages)
+        
+        assert mock_exists_brew.call_count == 1
+        assert results[0].candidate.target_name == "gcc"
+        assert results[1].candidate == results[0].candidate
+        assert results[1].source.version == "12.2.0"
+    
+    @patch('packster.map.mapper.exists_in_brew')
+    def test_map_packages_persists_validation(self, mock_exists_brew, temp_dir):
+        """Test that Homebrew validation results are reused across runs."""
+        mock_exists_brew.return_value = True
+        registry = Registry(name="test")
+        packages = [NormalizedItem(source_name="gcc-12.2", source_pm=PackageManager.APT)]
+        cache_path = temp_dir / "brew.json"
+        
+        with patch('packster.map.mapper.BREW_CACHE_PATH', cache_path):
+            first = PackageMapper(registry, use_cache=True).map_packages(packages)
+            assert cache_path.exists()
+            
+            mock_exists_brew.side_effect = AssertionError("validation should be cached")
+            second = PackageMapper(registry, use_cache=True).map_packages(packages)
+            
+            # Expired entries are validated again
+            with patch('packster.map.mapper.BREW_CACHE_TTL', -1):
+                mock_exists_brew.side_effect = None
+                PackageMapper(registry, use_cache=True).map_packages(packages)
+        
+        assert second[0].candidate == first[0].candidate
+        assert mock_exists_brew.call_count == 2
+    
+    @patch('packster.map.mapper.exists_in_brew')
+    def test_map_packages_validation_invalidated_by_brew_update(self, mock_exists_brew, temp_dir):
+        """Test persisted validation results are dropped once Homebrew updates."""
+        mock_exists_brew.return_value = True
+        registry = Registry(name="test")
+        packages = [NormalizedItem(source_name="gcc-12.2", source_pm=PackageManager.APT)]
+        
+        with patch('packster.map.mapper.BREW_CACHE_PATH', temp_dir / "brew.json"):
+            PackageMapper(registry, use_cache=True).map_packages(packages)
+            
+            with patch('packster.map.mapper.homebrew_index_mtime', return_value=time.time() + 60):
+                PackageMapper(registry, use_cache=True).map_packages(packages)
+        
+        assert mock_exists_brew.call_count == 2
+    
+    @patch('packster.map.mapper.exists_in_brew')
+    @patch('packster.map.mapper.find_existing_packages')
+    def test_map_packages_bulk_prefetch(self, mock_find_existing, mock_exists_brew):
+        """Test that candidates are validated with one bulk brew call."""
+        mock_find_existing.return_value = {"gcc"}
+        registry = Registry(name="test")
+        mapper = PackageMapper(registry, verify=True)
+        packages = [
+            NormalizedItem(source_name="gcc-12.2", source_pm=PackageManager.APT),
+            NormalizedItem(source_name="libfoo-bin", source_pm=PackageManager.APT),
+        ]
+        
+        results = mapper.map_packages(packages)
+        
+        mock_find_existing.assert_called_once_with({"gcc", "libfoo", "foo-bin"}, cask=False)
+        mock_exists_brew.assert_not_called()
+        assert results[0].candidate.target_name == "gcc"
+        assert results[1].candidate is None
+    
+    @patch('packster.map.mapper.ThreadPoolExecutor')
+    @patch('packster.map.mapper.exists_in_brew', return_value=False)
+    @patch('packster.map.mapper.find_existing_packages')
+    def test_map_packages_thread_pool_only_for_brew_checks(self, mock_find_existing,
+                                                           mock_exists_brew, mock_executor):
+        """Test the thread pool only starts when names still need individual brew checks."""
+        registry = Registry(name="test")
+        packages = [
+            NormalizedItem(source_name="gcc-12.2", source_pm=PackageManager.APT),
+            NormalizedItem(source_name="libfoo-bin", source_pm=PackageManager.APT),
+        ]
+        
+        PackageMapper(registry, verify=False).map_packages(packages)
+        mock_find_existing.return_value = {"gcc"}
+        PackageMapper(registry, verify=True).map_packages(packages)
+        mock_executor.assert_not_called()
+        
+        mock_find_existing.return_value = None
+        mock_executor.return_value.__enter__.return_value.map.side_effect = map
+        PackageMapper(registry, verify=True).map_packages(packages)
+        mock_executor.assert_called_once()
+    
+    def test_map_packages_registry_lookup(self):
+        """Test that registry lookups honour exact names, aliases and case."""
+        registry = Registry(
+            name="test",
+            mappings={
+                "Docker.io": RegistryMapping(target_pm="cask", target_name="docker", confidence=0.9),
+                "vim": RegistryMapping(target_pm="brew", target_name="vim", confidence=0.9),
+            },
+            aliases={"vi": "vim", "VIM": "vim"},
+        )
+        mapper = PackageMapper(registry, verify=False)
+        packages = [
+            NormalizedItem(source_name=name, source_pm=PackageManager.APT)
+            for name in ("vim", "vi", "docker.io", "VIM")
+        ]
+        
+        results = mapper.map_packages(packages)
+        
+        assert [r.candidate.target_name for r in results] == ["vim", "vim", "docker", "vim"]
+        assert results[2].candidate.target_pm == "cask"
+    
+    @patch('packster.map.mapper.apply_common_patterns')
+    def test_confident_registry_match_skips_heuristics(self, mock_patterns):
+        """Test that a confident registry match skips the remaining steps."""
+        mock_patterns.return_value = []
+        registry = Registry(
+            name="test",
+            mappings={"git": RegistryMapping(target_pm="brew", target_name="git", confidence=0.95)},
+        )
+        packages = [NormalizedItem(source_name="git", source_pm=PackageManager.APT)]
+        
+        results = PackageMapper(registry, verify=False).map_packages(packages)
+        assert results[0].candidate.target_name == "git"
+        mock_patterns.assert_not_called()
+        
+        PackageMapper(registry, verify=False, aggressive_candidates=True).map_packages(packages)
+        mock_patterns.assert_called_once_with("git")
+    
+    @patch('packster.map.mapper.exists_in_brew')
+    def test_rejected_registry_match_falls_back(self, mock_exists_brew):
+        """Test that skipped steps still run when the registry match is invalid."""
+        mock_exists_brew.side_effect = lambda name: name == "gcc"
+        registry = Registry(
+            name="test",
+            mappings={"gcc-12.2": RegistryMapping(target_pm="brew", target_name="gcc12", confidence=0.95)},
+        )
+        packages = [NormalizedItem(source_name="gcc-12.2", source_pm=PackageManager.APT)]
+        
+        results = PackageMapper(registry, verify=True).map_packages(packages)
+        
+        assert results[0].candidate.target_name == "gcc"
+    
     def test_map_packages_empty_list(self):
         """Test mapping empty package list."""
         registry = Registry(name="test")
@@ -352,6 +763,21 @@ class TestDecisionLogic:
         # This would be tested in the actual decision logic
         assert candidate.confidence < 0.6
 
+    
+    def test_best_candidate_decides(self):
+        """Test the reported candidate is the most confident one and decides."""
+        registry = Registry(name="test", mappings={
+            "postgresql-14": RegistryMapping(target_pm="brew", target_name="postgresql@14", confidence=0.7),
+        })
+        mapper = PackageMapper(registry, verify=False)
+        
+        result = mapper.map_single_package(
+            NormalizedItem(source_name="postgresql-14", source_pm=PackageManager.APT)
+        )
+        
+        assert result.candidate.target_name == "postgresql"
+        assert result.candidate.confidence == 0.8
+        assert result.decision == Decision.VERIFY
 
 class TestCandidateValidation:
     """Test candidate validation functionality."""
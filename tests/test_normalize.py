@@ -0,0 +1,160 @@
+"""Tests for the normalize module."""
+
+import pytest
+from pydantic import ValidationError
+from unittest.mock import patch
+from packster.normalize import (
+    categorize_package,
+    deduplicate_packages,
+    enrich_package_metadata,
+    get_package_statistics,
+    normalize_all_packages,
+    PackageStats,
+    should_include_package,
+)
+from packster.types import NormalizedItem, PackageManager
+
+
+class TestNormalizeAllPackages:
+    """Test collecting from every package manager."""
+    
+    @patch('packster.normalize.shutil.which', return_value="/usr/bin/tool")
+    @patch('packster.collect.gem.collect_gem_packages')
+    @patch('packster.collect.cargo.collect_cargo_packages')
+    @patch('packster.collect.npm.collect_npm_packages')
+    @patch('packster.collect.pip_.collect_pip_packages')
+    @patch('packster.collect.apt.collect_apt_packages')
+    def test_normalize_all_packages(self, mock_apt, mock_pip, mock_npm, mock_cargo, mock_gem, mock_which):
+        """Test collector results are combined, filtered and deduplicated in order."""
+        mock_apt.return_value = [
+            NormalizedItem(source_name="git", source_pm=PackageManager.APT),
+            NormalizedItem(source_name="libssl3", source_pm=PackageManager.APT),
+            NormalizedItem(source_name="Git", source_pm=PackageManager.APT, meta={"manual": True}),
+        ]
+        mock_pip.side_effect = RuntimeError("pip is broken")
+        mock_npm.return_value = [NormalizedItem(source_name="typescript", source_pm=PackageManager.NPM)]
+        mock_cargo.return_value = []
+        mock_gem.return_value = [NormalizedItem(source_name="rails", source_pm=PackageManager.GEM)]
+        
+        result = normalize_all_packages()
+        
+        assert [p.source_name for p in result] == ["Git", "typescript", "rails"]
+    
+    @patch('packster.collect.npm.collect_npm_packages')
+    @patch('packster.collect.apt.collect_apt_packages')
+    def test_normalize_all_packages_skips_missing_tools(self, mock_apt, mock_npm):
+        """Test collectors whose command is not installed are never run."""
+        mock_npm.return_value = [NormalizedItem(source_name="typescript", source_pm=PackageManager.NPM)]
+        
+        with patch('packster.normalize.shutil.which', side_effect=lambda cmd: "/usr/bin/npm" if cmd == "npm" else None):
+            result = normalize_all_packages()
+        
+        assert [p.source_name for p in result] == ["typescript"]
+        mock_apt.assert_not_called()
+
+
+class TestNormalizedItem:
+    """Test the normalized item model."""
+    
+    def test_lower_name(self):
+        """Test the lowercased name is set however the item is created."""
+        validated = NormalizedItem(source_name="Git", source_pm=PackageManager.APT)
+        constructed = NormalizedItem.model_construct(source_name="Git", source_pm=PackageManager.APT)
+        
+        assert validated.lower_name == "git"
+        assert constructed.lower_name == "git"
+        assert validated == constructed
+
+
+class TestDeduplication:
+    """Test package deduplication."""
+    
+    def test_deduplicate_packages(self):
+        """Test duplicates keep their first position and the richest metadata."""
+        packages = [
+            NormalizedItem(source_name="git", source_pm=PackageManager.APT),
+            NormalizedItem(source_name="requests", source_pm=PackageManager.PIP),
+            NormalizedItem(source_name="Git", source_pm=PackageManager.APT, meta={"manual": True}),
+            NormalizedItem(source_name="git", source_pm=PackageManager.PIP),
+            NormalizedItem(source_name="GIT", source_pm=PackageManager.APT),
+        ]
+        
+        result = deduplicate_packages(packages)
+        
+        assert [(p.source_pm, p.source_name) for p in result] == [
+            (PackageManager.APT, "Git"),
+            (PackageManager.PIP, "requests"),
+            (PackageManager.PIP, "git"),
+        ]
+        assert result[0].meta == {"manual": True}
+
+
+class TestFiltering:
+    """Test package filtering and categorization."""
+    
+    def test_should_include_package(self):
+        """Test system, library, development and documentation packages are skipped."""
+        names = ["Bash", "libssl3", "python3-dev", "gdb-dbg", "git-doc", "ripgrep"]
+        
+        result = [
+            should_include_package(NormalizedItem(source_name=name, source_pm=PackageManager.APT))
+            for name in names
+        ]
+        
+        assert result == [False, False, False, False, False, True]
+    
+    def test_categorize_package(self):
+        """Test names are categorized case-insensitively, first category winning."""
+        names = ["Git", "jq", "nodejs", "poetry", "redis", "helm", "terraform", "cowsay"]
+        
+        result = [
+            categorize_package(NormalizedItem(source_name=name, source_pm=PackageManager.APT))
+            for name in names
+        ]
+        
+        assert result == [
+            "development", "utilities", "languages", "build_tools",
+            "databases", "containers", "cloud", "other",
+        ]
+
+
+class TestEnrichment:
+    """Test package metadata enrichment."""
+    
+    def test_enrich_package_metadata(self):
+        """Test enrichment returns a new item and leaves the frozen input alone."""
+        package = NormalizedItem(source_name="git", source_pm=PackageManager.APT, meta={"manual": True})
+        
+        enriched = enrich_package_metadata(package)
+        
+        assert enriched.category == "development"
+        assert enriched.meta == {"manual": True, "package_type": "system"}
+        assert package.category is None
+        assert package.meta == {"manual": True}
+        with pytest.raises(ValidationError):
+            package.category = "other"
+
+
+class TestStatistics:
+    """Test package statistics."""
+    
+    def test_get_package_statistics(self):
+        """Test package managers, categories and versions are counted."""
+        packages = [
+            NormalizedItem(source_name="git", source_pm=PackageManager.APT, version="2.34.1"),
+            NormalizedItem(source_name="vim", source_pm=PackageManager.APT),
+            NormalizedItem(source_name="requests", source_pm=PackageManager.PIP, version="2.31.0", category="python"),
+        ]
+        
+        stats = get_package_statistics(packages)
+        
+        assert stats == PackageStats(
+            total=3,
+            by_package_manager={"apt": 2, "pip": 1},
+            by_category={"unknown": 2, "python": 1},
+            with_versions=2,
+            without_versions=1,
+        )
+        assert stats["total"] == 3
+        with pytest.raises(KeyError):
+            stats["unknown"]
@@ -1,10 +1,15 @@
 """Tests for the validate module."""
 
+import json
+import urllib.error
+
 import pytest
-from unittest.mock import patch, mock_open
+from unittest.mock import MagicMock, patch, mock_open
 from packster.validate import (
     exists_in_brew,
     exists_in_cask,
+    clear_brew_cache,
+    find_existing_packages,
     validate_brew_candidates,
 )
 from packster.types import Candidate
@@ -13,6 +18,13 @@ from packster.types import Candidate
 class TestBrewValidation:
     """Test Homebrew validation functionality."""
     
+    @pytest.fixture(autouse=True)
+    def _nothing_installed(self):
+        """Keep the installed-package shortcut out of the brew info tests."""
+        with patch('packster.validate.brew._installed_brew_set', return_value=frozenset()), \
+                patch('packster.validate.brew._installed_cask_set', return_value=frozenset()):
+            yield
+    
     @patch('packster.detect.run_command_safe')
     def test_exists_in_brew_true(self, mock_run_safe):
         """Test successful brew package existence check."""
@@ -31,6 +43,7 @@ class TestBrewValidation:
         result = exists_in_brew("nonexistent")
         
         assert result is False
+        mock_run_safe.assert_called_once_with(["brew", "info", "nonexistent"])
     
     @patch('packster.detect.run_command_safe')
     def test_exists_in_brew_error(self, mock_run_safe):
@@ -41,6 +54,96 @@ class TestBrewValidation:
         
         assert result is False
     
+    @patch('packster.detect.run_command_safe')
+    def test_exists_in_brew_json_fallback(self, mock_run_safe):
+        """Test a failed brew info is retried in JSON form before giving up."""
+        mock_run_safe.side_effect = [
+            (1, "", "Error: Failed to download analytics"),
+            (0, '{"formulae": [{"name": "git"}], "casks": []}', ""),
+            (1, "", "Error: Failed to download analytics"),
+            (0, '{"formulae": [], "casks": []}', ""),
+        ]
+        
+        assert exists_in_brew("git") is True
+        assert mock_run_safe.call_args_list[1].args[0] == ["brew", "info", "--json=v2", "--formula", "git"]
+        assert exists_in_brew("git-crypt") is False
+    
+    @patch('packster.detect.run_command_safe')
+    def test_exists_in_brew_cached(self, mock_run_safe):
+        """Test repeated existence checks reuse the first brew call until cleared."""
+        mock_run_safe.return_value = (0, "git: stable 2.39.2", "")
+        
+        assert exists_in_brew("git") is True
+        assert exists_in_brew("git") is True
+        mock_run_safe.assert_called_once()
+        
+        clear_brew_cache()
+        assert exists_in_brew("git") is True
+        assert mock_run_safe.call_count == 2
+    
+    @patch('packster.detect.run_command_safe')
+    def test_find_existing_packages(self, mock_run_safe):
+        """Test bulk existence check retries without the names brew reports missing."""
+        mock_run_safe.side_effect = [
+            (1, "", 'Error: No available formula with the name "nope". Did you mean nop?\n'),
+            (0, '{"formulae": [], "casks": []}', ""),
+        ]
+        
+        result = find_existing_packages(["wget", "nope", "git", "git"])
+        
+        assert result == {"git", "wget"}
+        assert mock_run_safe.call_args_list[0].args[0] == [
+            "brew", "info", "--json=v2", "--formula", "git", "nope", "wget"
+        ]
+        assert mock_run_safe.call_args_list[1].args[0] == [
+            "brew", "info", "--json=v2", "--formula", "git", "wget"
+        ]
+    
+    @patch('packster.detect.run_command_safe')
+    def test_find_existing_packages_several_missing(self, mock_run_safe):
+        """Test bulk existence check keeps retrying while brew reports new missing names."""
+        mock_run_safe.side_effect = [
+            (1, "", 'Error: No available formula with the name "nope".\n'),
+            (1, "", "Error: No available formula with the name 'gone'.\n"),
+            (1, "", 'Error: No available formula with the name "nada".\n'),
+            (0, '{"formulae": [], "casks": []}', ""),
+        ]
+        
+        result = find_existing_packages(["wget", "nope", "gone", "nada", "git"])
+        
+        assert result == {"git", "wget"}
+        assert mock_run_safe.call_count == 4
+    
+    @patch('packster.detect.run_command_safe')
+    def test_find_existing_packages_cask_missing(self, mock_run_safe):
+        """Test bulk existence check understands brew's cask error message."""
+        mock_run_safe.side_effect = [
+            (1, "", "Error: Cask 'nope' is unavailable: No Cask with this name exists.\n"),
+            (0, '{"formulae": [], "casks": []}', ""),
+        ]
+        
+        result = find_existing_packages(["firefox", "nope"], cask=True)
+        
+        assert result == {"firefox"}
+        assert mock_run_safe.call_args_list[1].args[0] == [
+            "brew", "info", "--json=v2", "--cask", "firefox"
+        ]
+    
+    @patch('packster.detect.run_command_safe')
+    def test_find_existing_packages_unknown_error(self, mock_run_safe):
+        """Test bulk existence check gives up when the reported names were not requested."""
+        mock_run_safe.return_value = (1, "", 'Error: No available formula with the name "other".\n')
+        
+        assert find_existing_packages(["git"]) is None
+        assert mock_run_safe.call_count == 1
+    
+    @patch('packster.detect.run_command_safe')
+    def test_find_existing_packages_unavailable(self, mock_run_safe):
+        """Test bulk existence check when brew cannot answer."""
+        mock_run_safe.return_value = (-1, "", "Command not found: brew")
+        
+        assert find_existing_packages(["git"], cask=True) is None
+    
     @patch('packster.detect.run_command_safe')
     def test_exists_in_cask_true(self, mock_run_safe):
         """Test successful cask existence check."""
@@ -70,6 +173,91 @@ class TestBrewValidation:
         assert result is False
 
 
+class TestRemoteFormulaIndex:
+    """Test the formulae.brew.sh index lookups."""
+    
+    @staticmethod
+    def _response(body, etag):
+        response = MagicMock()
+        response.read.return_value = json.dumps(body).encode()
+        response.headers = {"ETag": etag}
+        response.__enter__.return_value = response
+        return response
+    
+    @patch('packster.validate.brew.urllib.request.urlopen')
+    def test_index_revalidates_with_etag(self, mock_urlopen, temp_dir, monkeypatch):
+        """Test the index is cached on disk and revalidated with If-None-Match."""
+        from packster.validate.brew import _remote_formula_index
+        
+        monkeypatch.delenv("PACKSTER_OFFLINE")
+        monkeypatch.setattr('packster.validate.brew.FORMULAE_INDEX_PATH', temp_dir / "formulae.json")
+        mock_urlopen.side_effect = [
+            self._response([{"name": "git", "full_name": "git", "aliases": ["git-scm"], "oldnames": []}], '"f1"'),
+            self._response([{"token": "slack", "full_token": "slack", "old_tokens": ["slack-app"]}], '"c1"'),
+        ]
+        
+        index = _remote_formula_index()
+        
+        assert index == {"brew": {"git", "git-scm"}, "cask": {"slack", "slack-app"}}
+        
+        clear_brew_cache()
+        mock_urlopen.side_effect = [
+            urllib.error.HTTPError("url", 304, "Not Modified", {}, None),
+            urllib.error.HTTPError("url", 304, "Not Modified", {}, None),
+        ]
+        
+        assert _remote_formula_index() == index
+        assert mock_urlopen.call_args_list[2].args[0].get_header("If-none-match") == '"f1"'
+    
+    @patch('packster.validate.brew.urllib.request.urlopen')
+    def test_index_unreachable_tries_once(self, mock_urlopen, temp_dir, monkeypatch):
+        """Test an unreachable server is tried once per run and the disk cache is used."""
+        from packster.validate.brew import _remote_formula_index
+        
+        monkeypatch.delenv("PACKSTER_OFFLINE")
+        index_path = temp_dir / "formulae.json"
+        index_path.write_text(json.dumps({"cask": {"etag": '"c1"', "names": ["slack"]}}), encoding="utf-8")
+        monkeypatch.setattr('packster.validate.brew.FORMULAE_INDEX_PATH', index_path)
+        mock_urlopen.side_effect = urllib.error.URLError("timed out")
+        
+        assert _remote_formula_index() == {"cask": {"slack"}}
+        assert _remote_formula_index() == {"cask": {"slack"}}
+        assert mock_urlopen.call_count == 1
+    
+    @patch('packster.validate.brew._remote_formula_index')
+    @patch('packster.validate.brew._installed_cask_set', return_value=frozenset({"slack"}))
+    @patch('packster.validate.brew._installed_brew_set', return_value=frozenset({"git"}))
+    def test_installed_names_skip_index(self, mock_brew_set, mock_cask_set, mock_index):
+        """Test installed packages are answered without loading the index."""
+        assert exists_in_brew("git") is True
+        assert exists_in_cask("slack") is True
+        mock_index.assert_not_called()
+    
+    @patch('packster.validate.brew.detect.run_command_safe')
+    @patch('packster.validate.brew._remote_formula_index')
+    @patch('packster.validate.brew._installed_cask_set', return_value=frozenset())
+    @patch('packster.validate.brew._installed_brew_set', return_value=frozenset())
+    def test_exists_in_brew_uses_index(self, mock_brew_set, mock_cask_set, mock_index, mock_run_safe):
+        """Test indexed names skip the brew subprocess."""
+        mock_index.return_value = {"brew": frozenset({"git"}), "cask": frozenset({"slack"})}
+        mock_run_safe.return_value = (1, "", "")
+        
+        assert exists_in_brew("git") is True
+        assert exists_in_cask("slack") is True
+        mock_run_safe.assert_not_called()
+        
+        assert exists_in_brew("not-indexed") is False
+        mock_run_safe.assert_called()
+    
+    def test_index_disabled_offline(self):
+        """Test PACKSTER_OFFLINE skips the download entirely."""
+        from packster.validate.brew import _remote_formula_index
+        
+        with patch('packster.validate.brew.urllib.request.urlopen') as mock_urlopen:
+            assert _remote_formula_index() == {}
+        mock_urlopen.assert_not_called()
+
+
 class TestCandidateValidation:
     """Test candidate validation functionality."""
     
@@ -129,7 +317,7 @@ class TestCandidateValidation:
     @patch('packster.validate.brew.exists_in_cask')
     def test_validate_brew_candidates_mixed(self, mock_exists_cask, mock_exists_brew):
         """Test candidate validation with mixed results."""
-        mock_exists_brew.side_effect = [True, False]
+        mock_exists_brew.side_effect = lambda name: name == "git"
         mock_exists_cask.return_value = False
         
         candidates = [
@@ -153,6 +341,47 @@ class TestCandidateValidation:
         assert result[0].confidence == 0.95  # Unchanged
         assert result[1].confidence < 0.90  # Reduced
     
+    @patch('packster.validate.brew.exists_in_brew')
+    @patch('packster.detect.run_command_safe')
+    def test_validate_brew_candidates_batched(self, mock_run_safe, mock_exists_brew):
+        """Test brew and cask names are checked with one brew call per kind."""
+        mock_run_safe.side_effect = [
+            (1, "", 'Error: No available formula with the name "nope".\n'),
+            (0, "{}", ""),
+            (0, "{}", ""),
+        ]
+        candidates = [
+            Candidate(target_pm="brew", target_name="git", confidence=0.9),
+            Candidate(target_pm="brew", target_name="nope", confidence=0.8),
+            Candidate(target_pm="cask", target_name="slack", confidence=0.6),
+            Candidate(target_pm="pip", target_name="black", confidence=0.5),
+        ]
+        
+        result = validate_brew_candidates(candidates)
+        
+        assert [c.confidence for c in result] == [0.9, 0.4, 0.6, 0.5]
+        assert result[0] is candidates[0]
+        assert result[3] is candidates[3]
+        assert mock_run_safe.call_count == 3
+        assert mock_run_safe.call_args_list[2].args[0] == ["brew", "info", "--json=v2", "--cask", "slack"]
+        mock_exists_brew.assert_not_called()
+    
+    @patch('packster.validate.brew.find_existing_packages', return_value=None)
+    @patch('packster.validate.brew.exists_in_brew')
+    def test_validate_brew_candidates_parallel_keeps_order(self, mock_exists_brew, mock_find):
+        """Test fallback checks keep input order and run once per distinct name."""
+        mock_exists_brew.side_effect = lambda name: int(name[3:]) % 2 == 0
+        candidates = [
+            Candidate(target_pm="brew", target_name=f"pkg{i % 40}", confidence=0.8)
+            for i in range(80)
+        ]
+        
+        result = validate_brew_candidates(candidates)
+        
+        assert [c.target_name for c in result] == [c.target_name for c in candidates]
+        assert [c.confidence for c in result] == [0.8 if i % 2 == 0 else 0.4 for i in range(80)]
+        assert mock_exists_brew.call_count == 40
+    
     def test_validate_brew_candidates_empty(self):
         """Test candidate validation with empty list."""
         result = validate_brew_candidates([])
@@ -167,7 +396,7 @@ class TestBrewInfo:
         """Test successful brew info retrieval."""
         mock_run_safe.return_value = (
             0,
-            "git: stable 2.39.2\nGit is a distributed version control system",
+            '{"formulae": [{"name": "git", "versions": {"stable": "2.39.2"}}], "casks": []}',
             ""
         )
         
@@ -176,9 +405,9 @@ class TestBrewInfo:
         result = get_brew_info("git")
         
         assert result is not None
-        assert "git" in result
-        assert "stable" in result["git"]
-        mock_run_safe.assert_called_once_with(["brew", "info", "git"])
+        assert result["name"] == "git"
+        assert result["versions"]["stable"] == "2.39.2"
+        mock_run_safe.assert_called_once_with(["brew", "info", "--json=v2", "--formula", "git"])
     
     @patch('packster.detect.run_command_safe')
     def test_get_brew_info_failure(self, mock_run_safe):
@@ -196,7 +425,7 @@ class TestBrewInfo:
         """Test successful cask info retrieval."""
         mock_run_safe.return_value = (
             0,
-            "visual-studio-code: 1.85.1\nVisual Studio Code is a code editor",
+            '{"formulae": [], "casks": [{"token": "visual-studio-code", "version": "1.85.1"}]}',
             ""
         )
         
@@ -205,8 +434,22 @@ class TestBrewInfo:
         result = get_brew_info("visual-studio-code", cask=True)
         
         assert result is not None
-        assert "visual-studio-code" in result
-        mock_run_safe.assert_called_once_with(["brew", "info", "--cask", "visual-studio-code"])
+        assert result["token"] == "visual-studio-code"
+        mock_run_safe.assert_called_once_with(["brew", "info", "--json=v2", "--cask", "visual-studio-code"])
+    
+    @patch('packster.detect.run_command_safe')
+    def test_get_brew_info_read_only(self, mock_run_safe):
+        """Test cached brew info cannot be modified by callers."""
+        mock_run_safe.return_value = (0, '{"formulae": [{"name": "git"}], "casks": []}', "")
+        
+        from packster.validate.brew import get_brew_info
+        
+        result = get_brew_info("git")
+        
+        with pytest.raises(TypeError):
+            result["name"] = "changed"
+        assert get_brew_info("git") is result
+        mock_run_safe.assert_called_once()
 
 
 class TestBrewSearch:
@@ -239,7 +482,7 @@ class TestBrewSearch:
         
         result = search_brew("nonexistent")
         
-        assert result == []
+        assert result == ()
     
     @patch('packster.detect.run_command_safe')
     def test_search_brew_error(self, mock_run_safe):
@@ -250,7 +493,16 @@ class TestBrewSearch:
         
         result = search_brew("git")
         
-        assert result == []
+        assert result == ()
+    
+    @patch('packster.detect.run_command_safe')
+    def test_search_brew_skips_headers(self, mock_run_safe):
+        """Test section headers and blank lines are dropped from search results."""
+        mock_run_safe.return_value = (0, "==> Formulae\ngit\n  git-lfs  \n\n==> Casks\ngithub\n", "")
+        
+        from packster.validate.brew import search_brew
+        
+        assert search_brew("git") == ("git", "git-lfs", "github")
 
 
 class TestBrewAvailability:
@@ -279,6 +531,21 @@ class TestBrewAvailability:
         
         assert result is False
     
+    @patch('packster.detect.is_command_available')
+    def test_is_homebrew_available_cached(self, mock_is_available):
+        """Test the PATH lookup runs once per process until the cache is cleared."""
+        mock_is_available.return_value = True
+        
+        from packster.validate.brew import is_homebrew_available, clear_brew_cache
+        
+        assert is_homebrew_available() is True
+        assert is_homebrew_available() is True
+        mock_is_available.assert_called_once_with("brew")
+        
+        clear_brew_cache()
+        is_homebrew_available()
+        assert mock_is_available.call_count == 2
+    
     @patch('packster.detect.run_command_safe')
     def test_get_homebrew_version_success(self, mock_run_safe):
         """Test successful Homebrew version retrieval."""
@@ -301,11 +568,47 @@ class TestBrewAvailability:
         result = get_homebrew_version()
         
         assert result is None
+    
+    @patch('packster.detect.run_command_safe')
+    def test_get_homebrew_version_dev_build(self, mock_run_safe):
+        """Test the git suffix of development builds is dropped."""
+        mock_run_safe.return_value = (0, "Homebrew 4.1.0-23-gabc123\nHomebrew/homebrew-core (git revision 1)\n", "")
+        
+        from packster.validate.brew import get_homebrew_version
+        
+        assert get_homebrew_version() == "4.1.0"
+    
+    @patch('packster.detect.run_command_safe')
+    def test_get_homebrew_version_leading_noise(self, mock_run_safe):
+        """Test the version line is found when other output precedes it."""
+        mock_run_safe.return_value = (0, "Welcome back!\nHomebrew 4.2.1\n", "")
+        
+        from packster.validate.brew import get_homebrew_version
+        
+        assert get_homebrew_version() == "4.2.1"
 
 
 class TestBrewInstalled:
     """Test Homebrew installed packages checking."""
     
+    @patch('packster.detect.run_command_safe')
+    def test_exists_uses_installed_packages(self, mock_run_safe):
+        """Test installed packages are found with one brew list call per kind."""
+        from packster.validate.brew import refresh_installed
+        
+        mock_run_safe.side_effect = [(0, "git\nvim\n", ""), (0, "slack\n", "")]
+        
+        assert exists_in_brew("git") is True
+        assert exists_in_brew("vim") is True
+        assert exists_in_cask("slack") is True
+        assert [c.args[0] for c in mock_run_safe.call_args_list] == [["brew", "list"], ["brew", "list", "--cask"]]
+        
+        refresh_installed()
+        mock_run_safe.side_effect = [(0, "", ""), (1, "", "Error: No available formula or cask")]
+        
+        assert exists_in_brew("curl") is False
+        assert mock_run_safe.call_args_list[2].args[0] == ["brew", "list"]
+    
     @patch('packster.detect.run_command_safe')
     def test_get_installed_brew_packages_success(self, mock_run_safe):
         """Test successful installed brew packages retrieval."""
@@ -334,7 +637,7 @@ class TestBrewInstalled:
         
         result = get_installed_brew_packages()
         
-        assert result == []
+        assert result == ()
     
     @patch('packster.detect.run_command_safe')
     def test_get_installed_cask_packages_success(self, mock_run_safe):
@@ -363,7 +666,7 @@ class TestBrewInstalled:
         
         result = get_installed_cask_packages()
         
-        assert result == []
+        assert result == ()
 
 
 class TestValidationIntegration:
@@ -383,7 +686,7 @@ class TestValidationIntegration:
         ]
         
         # Mock the calls to return True for first two, False for third
-        mock_exists_brew.side_effect = [True, False]
+        mock_exists_brew.side_effect = lambda name: name == "git"
         mock_exists_cask.return_value = True
         
         result = validate_brew_candidates(candidates)